@@ -1,10 +1,20 @@
-import json
+import asyncio
+from contextlib import nullcontext
+from dataclasses import dataclass
 
+from pdf2text.common.chunking import chunk_blocks
 from pdf2text.hosting import container
 from pdf2text.models.driver import Drivers
 from pdf2text.protocols.i_azure_openai_service import IAzureOpenAIService
 
-openai_svc = container[IAzureOpenAIService]
+Document = str | list[str]
+"""A document's text, or its text blocks (paragraphs and rendered tables)."""
+
+DRIVERS_CHUNK_TOKENS = 8000
+"""The token budget of each document chunk sent to get_drivers."""
+
+MAX_CONCURRENCY = 4
+"""The default maximum number of in-flight LLM calls."""
 
 # using LLM to get the list of drivers and their cars - response in JSON format
 # using LLM to identify the fastest driver - response in plain text
@@ -30,7 +40,16 @@ Provide the response in the following JSON format:
 """  # noqa: E501
 
 
-async def get_drivers(text: str) -> None:
+def to_blocks(document: Document) -> list[str]:
+    return document if isinstance(document, list) else document.splitlines()
+
+
+def to_text(document: Document) -> str:
+    return "\n".join(document) if isinstance(document, list) else document
+
+
+async def get_drivers_in_chunk(text: str) -> Drivers:
+    openai_svc = container[IAzureOpenAIService]
     response = await openai_svc.chat_completion_with_format(
         messages=[
             {
@@ -46,26 +65,84 @@ async def get_drivers(text: str) -> None:
             },
         ],
         response_format=Drivers,
+        temperature=0,
     )
-    drivers = Drivers.model_validate_json(response[0].content)  # type: ignore
-    print(json.dumps(drivers.model_dump(), indent=2))
+    return Drivers.model_validate_json(response[0].content)  # type: ignore
+
 
+async def get_drivers(
+    document: Document,
+    max_tokens: int = DRIVERS_CHUNK_TOKENS,
+    semaphore: asyncio.Semaphore | None = None,
+) -> Drivers:
+    """
+    Extract the drivers of a document, map-reduce style: the document is split
+    into chunks on block boundaries, each chunk is sent to the LLM
+    concurrently and the drivers found in every chunk are merged.
 
-async def who_is_fastest(text: str) -> None:
+    :param document: The document text or text blocks.
+    :param max_tokens: The token budget of a chunk.
+    :param semaphore: Limits the in-flight LLM calls, shared with the other
+        prompts by run_tasks; by default MAX_CONCURRENCY calls.
+    :return: The merged drivers.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def run(chunk: str) -> Drivers:
+        async with semaphore:
+            return await get_drivers_in_chunk(chunk)
+
+    chunks = chunk_blocks(to_blocks(document), max_tokens)
+    return Drivers.merge(await asyncio.gather(*[run(chunk) for chunk in chunks]))
+
+
+async def who_is_fastest(
+    document: Document, semaphore: asyncio.Semaphore | None = None
+) -> str | None:
+    text = to_text(document)
     openai_svc = container[IAzureOpenAIService]
-    response = await openai_svc.chat_completion(
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a helpful assistant that identifies the fastest driver "
-                    "from the provided text."
-                ),
-            },
-            {
-                "role": "user",
-                "content": text,
-            },
-        ],
-    )
-    print(response[0].content)
+    async with semaphore or nullcontext():
+        response = await openai_svc.chat_completion(
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You are a helpful assistant that identifies the fastest "
+                        "driver from the provided text."
+                    ),
+                },
+                {
+                    "role": "user",
+                    "content": text,
+                },
+            ],
+            temperature=0,
+        )
+    return response[0].content
+
+
+@dataclass
+class TaskResults:
+    drivers: Drivers
+    fastest: str | None
+
+
+async def run_tasks(
+    document: Document, max_concurrency: int = MAX_CONCURRENCY
+) -> TaskResults:
+    """
+    Run the extraction prompts over the same document concurrently.
+
+    :param document: The document text or text blocks.
+    :param max_concurrency: The maximum number of in-flight LLM calls, across
+        the prompts and the chunks of get_drivers.
+    :return: The result of each prompt.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with asyncio.TaskGroup() as tg:
+        drivers = tg.create_task(get_drivers(document, semaphore=semaphore))
+        fastest = tg.create_task(who_is_fastest(document, semaphore=semaphore))
+
+    return TaskResults(drivers=drivers.result(), fastest=fastest.result())
@@ -0,0 +1,204 @@
+"""
+Drives AzureFormRecognizer and AzureOpenAIService against the mock servers
+and reports the throughput and latency percentiles.
+
+    python -m benchmarks.load_test openai --requests 500 --concurrency 50
+    python -m benchmarks.load_test form-recognizer --throttle-rate 0.1
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from tabulate import tabulate
+
+from benchmarks.mock_servers import (
+    MockFormRecognizer,
+    MockOpenAI,
+    MockServer,
+    add_config_arguments,
+    config_from_arguments,
+    serve,
+)
+from benchmarks.run import sample_pdf
+from pdf2text.services.azure_form_recognizer import (
+    AzureFormRecognizer,
+    AzureFormRecognizerEnv,
+)
+from pdf2text.services.azure_openai_service import (
+    AzureOpenAIService,
+    AzureOpenAIServiceEnv,
+)
+from pdf2text.services.openai_content_evaluator import OpenAIContentEvaluator
+
+
+@dataclass
+class LoadReport:
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: int) -> float:
+        """
+        :param p: The percentile, between 1 and 99.
+        :return: The latency of successful calls at the percentile in seconds.
+        """
+        if not self.latencies:
+            return 0.0
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[p - 1]
+
+
+async def run_load(
+    call: Callable[[], Awaitable[object]], requests: int, concurrency: int
+) -> LoadReport:
+    """
+    Make a number of calls with at most `concurrency` in flight, timing each.
+
+    :param call: Makes one call.
+    :param requests: The number of calls.
+    :param concurrency: The number of concurrent workers.
+    :return: The latencies of the successful calls and the failed calls by
+        exception type.
+    """
+    report = LoadReport()
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                await call()
+            except Exception as e:
+                report.errors[type(e).__name__] += 1
+            else:
+                report.latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+async def load_form_recognizer(
+    server: MockFormRecognizer, requests: int, concurrency: int
+) -> LoadReport:
+    async with serve(server.app()) as url:
+        service = AzureFormRecognizer(
+            env=AzureFormRecognizerEnv(
+                azure_form_recognizer_endpoint=url,
+                azure_form_recognizer_api_key="mock",
+                azure_form_recognizer_pooled=True,
+            ),
+            logger=logging.getLogger("load_test"),
+        )
+        try:
+            return await run_load(
+                lambda: service.analyze_document(sample_pdf), requests, concurrency
+            )
+        finally:
+            await service.aclose()
+
+
+async def load_openai(
+    server: MockOpenAI,
+    requests: int,
+    concurrency: int,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+) -> LoadReport:
+    async with serve(server.app()) as url:
+        logger = logging.getLogger("load_test")
+        service = AzureOpenAIService(
+            env=AzureOpenAIServiceEnv(
+                azure_openai_endpoint=url,
+                azure_openai_api_key="mock",
+                azure_openai_api_version="2024-10-21",
+                azure_openai_deployed_model_name="mock",
+                azure_openai_requests_per_minute=requests_per_minute,
+                azure_openai_tokens_per_minute=tokens_per_minute,
+            ),
+            content_safety_eval=OpenAIContentEvaluator(logger=logger),
+            logger=logger,
+        )
+        try:
+            return await run_load(
+                lambda: service.chat_completion(
+                    [{"role": "user", "content": "Who is the fastest driver?"}]
+                ),
+                requests,
+                concurrency,
+            )
+        finally:
+            await service.aclose()
+
+
+def print_report(report: LoadReport, server: MockServer) -> None:
+    print(
+        tabulate(
+            [
+                ["requests ok", len(report.latencies)],
+                *[[f"failed ({name})", count] for name, count in report.errors.items()],
+                ["server requests", server.stats.requests],
+                ["server 429s", server.stats.throttled],
+                ["server content filtered", server.stats.filtered],
+                ["elapsed s", f"{report.elapsed:.2f}"],
+                ["throughput req/s", f"{report.throughput:.1f}"],
+                *[
+                    [f"p{p} ms", f"{report.percentile(p) * 1000:.1f}"]
+                    for p in (50, 95, 99)
+                ],
+            ],
+            tablefmt="simple",
+        )
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Load tests the services against the mock servers."
+    )
+    parser.add_argument("target", choices=["form-recognizer", "openai"])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests-per-minute", type=int, default=None)
+    parser.add_argument("--tokens-per-minute", type=int, default=None)
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # the services log every retry, which would drown the report
+    logging.basicConfig(level=logging.ERROR)
+    config = config_from_arguments(args)
+
+    if args.target == "form-recognizer":
+        server = MockFormRecognizer(config)
+        report = asyncio.run(
+            load_form_recognizer(server, args.requests, args.concurrency)
+        )
+    else:
+        server = MockOpenAI(config)
+        report = asyncio.run(
+            load_openai(
+                server,
+                args.requests,
+                args.concurrency,
+                args.requests_per_minute,
+                args.tokens_per_minute,
+            )
+        )
+
+    print_report(report, server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures the memory held by the tables of format_table, as the compact
+TableCells and as their TableData export, on tables of 10 000 cells and more.
+
+    python -m benchmarks.memory
+"""
+
+import gc
+import sys
+import tracemalloc
+from typing import Callable
+
+from tabulate import tabulate
+
+from benchmarks.synthetic import make_analyze_result
+from pdf2text.common.form_recognizer_parse import format_table
+
+# rows, columns
+SHAPES = [(1000, 10), (2500, 20)]
+
+
+def allocated(build: Callable[[], object]) -> tuple[int, int]:
+    """
+    Measure the memory allocated by a call.
+
+    :param build: The call, whose result is kept until measured.
+    :return: The bytes still held by the result and the peak bytes allocated
+        while building it.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def measure(rows: int, columns: int) -> dict[str, tuple[int, int]]:
+    """
+    :param rows: The number of rows of the table.
+    :param columns: The number of columns of the table.
+    :return: The held and peak bytes of the table as TableCells and as
+        TableData. The cell contents belong to the analysis result and are
+        not counted.
+    """
+    result = make_analyze_result(
+        pages=1, paragraphs_per_page=0, tables_per_page=1, rows=rows, columns=columns
+    )
+    tbl = (result.tables or [])[0]
+    tbl_cells = format_table(tbl)
+    return {
+        "TableCells": allocated(lambda: format_table(tbl)),
+        "TableData": allocated(tbl_cells.to_model),
+    }
+
+
+def main() -> int:
+    rows = []
+    for shape in SHAPES:
+        sizes = measure(*shape)
+        cells, model = sizes["TableCells"], sizes["TableData"]
+        rows.append(
+            [
+                f"{shape[0] * shape[1]:,}",
+                f"{cells[0] / 1024:.0f}",
+                f"{cells[1] / 1024:.0f}",
+                f"{model[0] / 1024:.0f}",
+                f"{model[1] / 1024:.0f}",
+                f"{model[0] / cells[0]:.1f}x",
+            ]
+        )
+
+    print(
+        tabulate(
+            rows,
+            headers=[
+                "cells",
+                "TableCells KiB",
+                "peak KiB",
+                "TableData KiB",
+                "peak KiB",
+                "ratio",
+            ],
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
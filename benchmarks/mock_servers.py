@@ -0,0 +1,427 @@
+"""
+Local stand-ins for the Form Recognizer and Azure OpenAI endpoints, for load
+testing the service classes without calling the paid services.
+
+    python -m benchmarks.mock_servers --latency 0.2 --throttle-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from aiohttp import web
+
+from benchmarks.synthetic import make_analyze_result
+from pdf2text.common.pages import parse_page_ranges
+
+SAFE = {"filtered": False, "severity": "safe"}
+CATEGORIES = ["hate", "self_harm", "sexual", "violence"]
+
+
+@dataclass
+class MockConfig:
+    """
+    Behaviour shared by the mock servers.
+
+    :param latency: The seconds added to every response.
+    :param jitter: The maximum random seconds added on top of the latency.
+    :param throttle_rate: The fraction of requests answered with a 429.
+    :param retry_after: The Retry-After of throttled responses in seconds.
+    :param content_filter_rate: The fraction of chat completions flagged by
+        the content filter.
+    :param polls: The number of polls answered "running" before an analysis
+        succeeds.
+    :param poll_interval: The Retry-After of running analyses in seconds.
+    :param pages: The number of pages of the analyzed documents.
+    :param reply: The content of the chat completions.
+    :param seed: The seed of the random throttling and filtering.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 0.01
+    content_filter_rate: float = 0.0
+    polls: int = 1
+    poll_interval: float = 0.01
+    pages: int = 2
+    reply: str = "This is a mock completion."
+    seed: int | None = None
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    throttled: int = 0
+    filtered: int = 0
+
+
+def to_wire(value: Any) -> Any:
+    """
+    Convert the dictionary of an AnalyzeResult to the camelCase payload of the
+    REST API, where polygons are flat lists of coordinates.
+    """
+    if isinstance(value, list):
+        return [to_wire(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    wire: dict[str, Any] = {}
+    for key, item in value.items():
+        if item is None:
+            continue
+        if key == "polygon":
+            item = [coord for point in item for coord in (point["x"], point["y"])]
+        head, *rest = key.split("_")
+        wire[head + "".join(part.title() for part in rest)] = to_wire(item)
+    return wire
+
+
+@dataclass
+class MockServer:
+    config: MockConfig = field(default_factory=MockConfig)
+    stats: MockStats = field(default_factory=MockStats)
+
+    def __post_init__(self) -> None:
+        self.random = random.Random(self.config.seed)
+
+    async def delay(self) -> None:
+        seconds = self.config.latency + self.random.uniform(0, self.config.jitter)
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def throttle(self) -> web.Response | None:
+        self.stats.requests += 1
+        if self.random.random() >= self.config.throttle_rate:
+            return None
+
+        self.stats.throttled += 1
+        retry_after = self.config.retry_after
+        return web.json_response(
+            {
+                "error": {
+                    "code": "429",
+                    "message": "Rate limit is exceeded. Try again later.",
+                }
+            },
+            status=429,
+            headers={
+                "retry-after-ms": str(max(1, int(retry_after * 1000))),
+                "Retry-After": str(max(1, round(retry_after))),
+            },
+        )
+
+
+@dataclass
+class MockFormRecognizer(MockServer):
+    """
+    Emulates the analyze operation of the Form Recognizer REST API: the POST
+    answers 202 with an Operation-Location that is polled until the analysis
+    has succeeded.
+    """
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.operations: dict[str, tuple[int, tuple[int, ...]]] = {}
+        self.analyze_results: dict[tuple[int, ...], dict[str, Any]] = {}
+
+    def analyze_result(self, pages: tuple[int, ...]) -> dict[str, Any]:
+        # as the service does, only the requested pages are analyzed, keeping
+        # their page numbers, and span offsets start from 0
+        if pages not in self.analyze_results:
+            result = make_analyze_result(page_numbers=pages)
+            self.analyze_results[pages] = to_wire(result.to_dict())
+        return self.analyze_results[pages]
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=500 * 1024 * 1024)
+        app.router.add_post(
+            "/formrecognizer/documentModels/{model_id}:analyze", self.analyze
+        )
+        app.router.add_get(
+            "/formrecognizer/documentModels/{model_id}/analyzeResults/{result_id}",
+            self.poll,
+        )
+        return app
+
+    def poll_headers(self) -> dict[str, str]:
+        return {"retry-after-ms": str(max(1, int(self.config.poll_interval * 1000)))}
+
+    async def analyze(self, request: web.Request) -> web.Response:
+        await request.read()
+        await self.delay()
+        if (response := self.throttle()) is not None:
+            return response
+
+        pages = tuple(range(1, self.config.pages + 1))
+        if "pages" in request.query:
+            requested = parse_page_ranges(request.query["pages"])
+            pages = tuple(n for n in requested if n <= self.config.pages)
+
+        result_id = str(uuid.uuid4())
+        self.operations[result_id] = (self.config.polls, pages)
+        location = request.url.with_path(
+            f"{request.path.removesuffix(':analyze')}/analyzeResults/{result_id}"
+        )
+        return web.Response(
+            status=202,
+            headers={"Operation-Location": str(location), **self.poll_headers()},
+        )
+
+    async def poll(self, request: web.Request) -> web.Response:
+        await self.delay()
+        result_id = request.match_info["result_id"]
+        if result_id not in self.operations:
+            return web.json_response(
+                {"error": {"code": "NotFound", "message": "Resource not found."}},
+                status=404,
+            )
+
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        polls, pages = self.operations[result_id]
+        if polls > 0:
+            self.operations[result_id] = (polls - 1, pages)
+            return web.json_response(
+                {
+                    "status": "running",
+                    "createdDateTime": now,
+                    "lastUpdatedDateTime": now,
+                },
+                headers=self.poll_headers(),
+            )
+
+        del self.operations[result_id]
+        return web.json_response(
+            {
+                "status": "succeeded",
+                "createdDateTime": now,
+                "lastUpdatedDateTime": now,
+                "analyzeResult": self.analyze_result(pages),
+            }
+        )
+
+
+@dataclass
+class MockOpenAI(MockServer):
+    """
+    Emulates the Azure OpenAI chat completions endpoint, streamed or not,
+    with the content filter annotations of the Azure service.
+    """
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(
+            "/openai/deployments/{deployment}/chat/completions", self.chat_completions
+        )
+        return app
+
+    def filter_results(self, filtered: bool) -> dict[str, Any]:
+        results = {category: dict(SAFE) for category in CATEGORIES}
+        if filtered:
+            results["violence"] = {"filtered": True, "severity": "high"}
+        return results
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        await self.delay()
+        if (response := self.throttle()) is not None:
+            return response
+
+        filtered = self.random.random() < self.config.content_filter_rate
+        if filtered:
+            self.stats.filtered += 1
+
+        prompt_tokens = sum(
+            len(str(m.get("content", ""))) // 4 + 1 for m in body.get("messages", [])
+        )
+        completion_tokens = len(self.config.reply) // 4 + 1
+        n = body.get("n") or 1
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens * n,
+            "total_tokens": prompt_tokens + completion_tokens * n,
+        }
+        completion = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "created": int(time.time()),
+            "model": request.match_info["deployment"],
+            "prompt_filter_results": [
+                {
+                    "prompt_index": 0,
+                    "content_filter_results": self.filter_results(False),
+                }
+            ],
+        }
+        finish_reason = "content_filter" if filtered else "stop"
+
+        if body.get("stream"):
+            return await self.stream(
+                request, completion, finish_reason, filtered, usage
+            )
+
+        return web.json_response(
+            {
+                **completion,
+                "object": "chat.completion",
+                "choices": [
+                    {
+                        "index": i,
+                        "message": {
+                            "role": "assistant",
+                            "content": None if filtered else self.config.reply,
+                        },
+                        "finish_reason": finish_reason,
+                        "content_filter_results": self.filter_results(filtered),
+                    }
+                    for i in range(n)
+                ],
+                "usage": usage,
+            }
+        )
+
+    async def stream(
+        self,
+        request: web.Request,
+        completion: dict[str, Any],
+        finish_reason: str,
+        filtered: bool,
+        usage: dict[str, int],
+    ) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(data: dict[str, Any] | str) -> None:
+            payload = data if isinstance(data, str) else json.dumps(data)
+            await response.write(f"data: {payload}\n\n".encode("utf-8"))
+
+        chunk = {**completion, "object": "chat.completion.chunk"}
+        # Azure sends the prompt annotations first, in a chunk without choices
+        await send({**chunk, "choices": []})
+        chunk.pop("prompt_filter_results")
+
+        words = [] if filtered else self.config.reply.split(" ")
+        for i, word in enumerate(words):
+            content = word if i == 0 else f" {word}"
+            await send(
+                {
+                    **chunk,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "delta": {"content": content},
+                            "finish_reason": None,
+                            "content_filter_results": self.filter_results(False),
+                        }
+                    ],
+                }
+            )
+        await send(
+            {
+                **chunk,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {},
+                        "finish_reason": finish_reason,
+                        "content_filter_results": self.filter_results(filtered),
+                    }
+                ],
+            }
+        )
+        await send({**chunk, "choices": [], "usage": usage})
+        await send("[DONE]")
+        await response.write_eof()
+        return response
+
+
+@asynccontextmanager
+async def serve(
+    app: web.Application, host: str = "127.0.0.1", port: int = 0
+) -> AsyncIterator[str]:
+    """
+    Serve an application in the running event loop.
+
+    :param app: The application.
+    :param host: The host to bind.
+    :param port: The port to bind, 0 picks a free port.
+    :return: The base URL of the server.
+    """
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        yield f"http://{host}:{port}"
+    finally:
+        await runner.cleanup()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = MockConfig()
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--jitter", type=float, default=defaults.jitter)
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate)
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after)
+    parser.add_argument(
+        "--content-filter-rate", type=float, default=defaults.content_filter_rate
+    )
+    parser.add_argument("--polls", type=int, default=defaults.polls)
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_arguments(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        content_filter_rate=args.content_filter_rate,
+        polls=args.polls,
+        pages=args.pages,
+        seed=args.seed,
+    )
+
+
+async def run_servers(config: MockConfig, fr_port: int, openai_port: int) -> None:
+    async with (
+        serve(MockFormRecognizer(config).app(), port=fr_port) as fr_url,
+        serve(MockOpenAI(config).app(), port=openai_port) as openai_url,
+    ):
+        print(f"AZURE_FORM_RECOGNIZER_ENDPOINT={fr_url}")
+        print("AZURE_FORM_RECOGNIZER_API_KEY=mock")
+        print(f"AZURE_OPENAI_ENDPOINT={openai_url}")
+        print("AZURE_OPENAI_API_KEY=mock")
+        await asyncio.Event().wait()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Serves mock Form Recognizer and Azure OpenAI endpoints."
+    )
+    parser.add_argument("--form-recognizer-port", type=int, default=8001)
+    parser.add_argument("--openai-port", type=int, default=8002)
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(
+            run_servers(
+                config_from_arguments(args),
+                args.form_recognizer_port,
+                args.openai_port,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
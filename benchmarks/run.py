@@ -0,0 +1,190 @@
+"""
+Times the parse/render pipeline and compares the results with the stored
+baselines.
+
+    python -m benchmarks.run                 # compare with baselines.json
+    python -m benchmarks.run --save          # record new baselines
+    python -m benchmarks.run -k parse        # only run matching benchmarks
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from tabulate import tabulate
+
+from benchmarks.synthetic import make_analyze_result
+from pdf2text.common.form_recognizer_parse import (
+    TABLE_FORMATS,
+    TableIndex,
+    format_table,
+    in_table,
+    parse,
+    table_spans,
+)
+from pdf2text.common.pdfplumber_extract import extract_text
+
+current_folder = Path(__file__).parent
+baselines_path = current_folder / "baselines.json"
+sample_pdf = current_folder.parent / "test_data" / "ast_sci_data_tables_sample.pdf"
+
+# pages, paragraphs per page, tables per page, rows, columns
+SIZES = {
+    "small": (2, 10, 1, 5, 4),
+    "medium": (20, 30, 2, 20, 6),
+    "large": (100, 50, 3, 50, 8),
+}
+FORMATS = TABLE_FORMATS
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[], object]
+    repeat: int = 5
+
+
+def collect() -> list[Benchmark]:
+    benchmarks: list[Benchmark] = []
+
+    for size, shape in SIZES.items():
+        result = make_analyze_result(*shape)
+        tables = result.tables or []
+        index = TableIndex.build([table_spans(tbl) for tbl in tables])
+        lookups = [
+            (p.bounding_regions[0].page_number, p.spans[0].offset)
+            for p in result.paragraphs or []
+            if p.bounding_regions and p.spans
+        ]
+
+        benchmarks.append(
+            Benchmark(
+                f"format_table[{size}]",
+                lambda tables=tables: [format_table(tbl) for tbl in tables],
+            )
+        )
+        benchmarks.append(
+            Benchmark(
+                f"in_table[{size}]",
+                lambda index=index, lookups=lookups: [
+                    in_table(page_num, offset, index) for page_num, offset in lookups
+                ],
+            )
+        )
+        for fmt in FORMATS:
+            benchmarks.append(
+                Benchmark(
+                    f"parse[{size}-{fmt}]",
+                    lambda result=result, fmt=fmt: parse(result, fmt),
+                )
+            )
+
+    # a single table of 10 000 cells for the renderers
+    result = make_analyze_result(
+        pages=1, paragraphs_per_page=0, tables_per_page=1, rows=1000, columns=10
+    )
+    tbl_data = format_table((result.tables or [])[0])
+    for fmt in FORMATS:
+        benchmarks.append(
+            Benchmark(
+                f"format_output[{fmt}]",
+                lambda fmt=fmt: tbl_data.format_output(fmt),
+            )
+        )
+
+    benchmarks.append(
+        Benchmark(
+            "pdfplumber[serial]",
+            lambda: extract_text(sample_pdf, max_workers=1),
+            repeat=3,
+        )
+    )
+    benchmarks.append(
+        Benchmark("pdfplumber[parallel]", lambda: extract_text(sample_pdf), repeat=3)
+    )
+    return benchmarks
+
+
+def measure(benchmark: Benchmark) -> float:
+    """
+    Time a benchmark, looping it enough times for the timer resolution not to
+    matter.
+
+    :param benchmark: The benchmark.
+    :return: The fastest time of one call in seconds, over the repeats.
+    """
+    timer = timeit.Timer(benchmark.func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=benchmark.repeat, number=number)) / number
+
+
+def load_baselines() -> dict[str, float]:
+    if not baselines_path.exists():
+        return {}
+    return json.loads(baselines_path.read_text())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Times the parse/render pipeline against the baselines."
+    )
+    parser.add_argument("-k", "--filter", default="", help="substring to match")
+    parser.add_argument(
+        "--save", action="store_true", help="store the timings as the baselines"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        # sub-millisecond benchmarks vary by up to ~40% between runs of an
+        # unchanged tree on the same machine
+        default=0.5,
+        help="allowed slowdown relative to the baseline, 0.5 is 50%%",
+    )
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    timings: dict[str, float] = {}
+    rows = []
+    regressions = []
+    for benchmark in collect():
+        if args.filter not in benchmark.name:
+            continue
+
+        seconds = measure(benchmark)
+        timings[benchmark.name] = seconds
+
+        baseline = baselines.get(benchmark.name)
+        ratio = seconds / baseline if baseline else None
+        if ratio is not None and ratio > 1 + args.tolerance:
+            regressions.append(benchmark.name)
+        rows.append(
+            [
+                benchmark.name,
+                f"{seconds * 1000:.3f}",
+                f"{baseline * 1000:.3f}" if baseline else "-",
+                f"{ratio:.2f}x" if ratio is not None else "-",
+            ]
+        )
+
+    print(tabulate(rows, headers=["benchmark", "ms", "baseline ms", "ratio"]))
+
+    if args.save:
+        baselines.update(timings)
+        baselines_path.write_text(
+            json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"\nsaved {len(timings)} baselines to {baselines_path.name}")
+        return 0
+
+    if regressions:
+        print(f"\nregressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
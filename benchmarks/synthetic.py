@@ -0,0 +1,110 @@
+from typing import Sequence
+
+from azure.ai.formrecognizer import AnalyzeResult
+
+PARAGRAPH = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+
+
+def region(page_num: int) -> list[dict]:
+    return [
+        {
+            "page_number": page_num,
+            "polygon": [
+                {"x": 1.0, "y": 1.0},
+                {"x": 2.0, "y": 1.0},
+                {"x": 2.0, "y": 1.5},
+                {"x": 1.0, "y": 1.5},
+            ],
+        }
+    ]
+
+
+def make_analyze_result(
+    pages: int = 10,
+    paragraphs_per_page: int = 20,
+    tables_per_page: int = 1,
+    rows: int = 10,
+    columns: int = 5,
+    page_numbers: Sequence[int] | None = None,
+) -> AnalyzeResult:
+    """
+    Build an AnalyzeResult with the shape of a Form Recognizer response. Each
+    page holds its paragraphs followed by its tables; every table cell also
+    appears as a paragraph, as the service reports them.
+
+    :param pages: The number of pages.
+    :param paragraphs_per_page: The number of plain paragraphs per page.
+    :param tables_per_page: The number of tables per page.
+    :param rows: The number of content rows per table, excluding the header.
+    :param columns: The number of columns per table.
+    :param page_numbers: The page numbers, as in a page-range analysis,
+        defaults to 1 to `pages`.
+    :return: The synthetic analysis result.
+    """
+    paragraphs: list[dict] = []
+    tables: list[dict] = []
+    offset = 0
+
+    def add_paragraph(page_num: int, content: str, role: str | None = None) -> dict:
+        nonlocal offset
+        paragraph = {
+            "role": role,
+            "content": content,
+            "bounding_regions": region(page_num),
+            "spans": [{"offset": offset, "length": len(content)}],
+        }
+        paragraphs.append(paragraph)
+        offset += len(content) + 1
+        return paragraph
+
+    for page_num in page_numbers or range(1, pages + 1):
+        for i in range(paragraphs_per_page):
+            add_paragraph(page_num, f"{PARAGRAPH} ({page_num}.{i})")
+
+        for t in range(tables_per_page):
+            cells = []
+            for row in range(rows + 1):
+                for col in range(columns):
+                    header = row == 0
+                    content = f"H{col}" if header else f"R{row}C{col}-{t}"
+                    paragraph = add_paragraph(page_num, content)
+                    cells.append(
+                        {
+                            "kind": "columnHeader" if header else "content",
+                            "row_index": row,
+                            "column_index": col,
+                            "row_span": 1,
+                            "column_span": 1,
+                            "content": content,
+                            "bounding_regions": paragraph["bounding_regions"],
+                            "spans": paragraph["spans"],
+                        }
+                    )
+
+            tables.append(
+                {
+                    "row_count": rows + 1,
+                    "column_count": columns,
+                    "cells": cells,
+                    "bounding_regions": region(page_num),
+                    "spans": [
+                        {
+                            "offset": cells[0]["spans"][0]["offset"],
+                            "length": offset - cells[0]["spans"][0]["offset"],
+                        }
+                    ],
+                }
+            )
+
+        add_paragraph(page_num, str(page_num), role="pageNumber")
+
+    return AnalyzeResult.from_dict(
+        {
+            "api_version": "2023-07-31",
+            "model_id": "prebuilt-document",
+            "content": "\n".join(p["content"] for p in paragraphs),
+            "pages": [],
+            "paragraphs": paragraphs,
+            "tables": tables,
+        }
+    )
@@ -0,0 +1,84 @@
+"""
+Reports the tokens of the tables of analysis results rendered in each table
+format, to pick the cheapest format for a model.
+
+    python -m benchmarks.tokens                             # synthetic tables
+    python -m benchmarks.tokens analysis.json --model gpt-4o
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+from typing import Callable
+
+from azure.ai.formrecognizer import AnalyzeResult
+from tabulate import tabulate
+
+from benchmarks.run import SIZES
+from benchmarks.synthetic import make_analyze_result
+from pdf2text.common.chunking import estimate_tokens
+from pdf2text.common.form_recognizer_parse import table_token_counts
+
+
+def token_counter(model: str | None) -> Callable[[str], int]:
+    """
+    :param model: The OpenAI model whose tokenizer counts the tokens, which
+        needs tiktoken, or None to estimate them with estimate_tokens.
+    :return: The function counting the tokens of a text.
+    """
+    if model is None:
+        return estimate_tokens
+
+    tiktoken = importlib.import_module("tiktoken")
+    encoding = tiktoken.encoding_for_model(model)
+    return lambda text: len(encoding.encode(text))
+
+
+def load_results(paths: list[Path]) -> dict[str, AnalyzeResult]:
+    """
+    :param paths: The analysis results saved as JSON, as AnalyzeResult.to_dict
+        returns them.
+    :return: The results by name, synthetic ones when no path is given.
+    """
+    if not paths:
+        return {
+            f"synthetic-{size}": make_analyze_result(*shape)
+            for size, shape in SIZES.items()
+            if size != "large"
+        }
+    return {
+        path.name: AnalyzeResult.from_dict(json.loads(path.read_text()))
+        for path in paths
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Counts the tokens of the tables in each table format."
+    )
+    parser.add_argument("results", nargs="*", type=Path, help="analysis JSON")
+    parser.add_argument(
+        "--model", default=None, help="count with the tokenizer of the model"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        count_tokens = token_counter(args.model)
+    except ModuleNotFoundError:
+        parser.error("--model needs tiktoken, pip install tiktoken")
+
+    rows = []
+    for name, result in load_results(args.results).items():
+        counts = table_token_counts(result, count_tokens)
+        for tbl_format, tokens in sorted(counts.items(), key=lambda item: item[1]):
+            ratio = tokens / counts["grid"] if counts["grid"] else 0.0
+            rows.append([name, tbl_format, tokens, f"{ratio:.2f}x"])
+
+    print(tabulate(rows, headers=["result", "format", "tokens", "vs grid"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
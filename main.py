@@ -1,10 +1,11 @@
 import asyncio
 from pathlib import Path
 
-from agent import get_drivers, who_is_fastest
+from agent import run_tasks
 from pdf2text.common.form_recognizer_parse import parse
-from pdf2text.hosting import container
+from pdf2text.hosting import aclose, container
 from pdf2text.protocols.i_azure_form_recognizer import IAzureFormRecognizer
+from pdf2text.protocols.i_metrics import IMetrics
 
 current_path = Path(__file__).parent
 sample = current_path / "test_data" / "ast_sci_data_tables_sample.pdf"
@@ -15,13 +16,20 @@ sample = current_path / "test_data" / "ast_sci_data_tables_sample.pdf"
 
 async def main() -> None:
     svc = container[IAzureFormRecognizer]
-    result = await svc.analyze_document(sample)
-    text = "\n".join(parse(result, tbl_format="grid"))
-    if result:
-        print(text)
-
-    await get_drivers(text)
-    await who_is_fastest(text)
+    metrics = container[IMetrics]
+    try:
+        with metrics.document(sample):
+            result = await svc.analyze_document(sample)
+            with metrics.timer("parse"):
+                blocks = parse(result, tbl_format="markdown")
+            if result:
+                print("\n".join(blocks))
+
+            results = await run_tasks(blocks)
+        print(results.drivers.model_dump_json(indent=2))
+        print(results.fastest)
+    finally:
+        await aclose()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 import asyncio
 from pathlib import Path
 
-import pdfplumber
-
-from agent import get_drivers, who_is_fastest
+from agent import run_tasks
+from pdf2text.common.pdfplumber_extract import extract_text
+from pdf2text.hosting import aclose, container
+from pdf2text.protocols.i_metrics import IMetrics
 
 current_path = Path(__file__).parent
 sample = current_path / "test_data" / "ast_sci_data_tables_sample.pdf"
@@ -12,20 +13,23 @@ sample = current_path / "test_data" / "ast_sci_data_tables_sample.pdf"
 # call LLM functions to get drivers and identify fastest driver
 
 
-def extract_text_pdfplumber():
-    text = ""
-    with pdfplumber.open(sample) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text(layout=True) or ""
-    return text
+def extract_text_pdfplumber() -> str:
+    return extract_text(sample)
 
 
 async def main() -> None:
-    text = extract_text_pdfplumber()
+    metrics = container[IMetrics]
+    with metrics.document(sample), metrics.timer("extract"):
+        text = extract_text_pdfplumber()
     print(text)
 
-    await get_drivers(text)
-    await who_is_fastest(text)
+    try:
+        with metrics.document(sample):
+            results = await run_tasks(text)
+        print(results.drivers.model_dump_json(indent=2))
+        print(results.fastest)
+    finally:
+        await aclose()
 
 
 if __name__ == "__main__":
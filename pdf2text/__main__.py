@@ -0,0 +1,5 @@
+import sys
+
+from pdf2text.cli import main
+
+sys.exit(main())
@@ -0,0 +1,194 @@
+"""The pdf2text command line: batch text extraction of PDF files.
+
+    pdf2text docs/ "scans/**/*.pdf" --output-dir out --backend pdfplumber
+
+Outputs are written as each file completes, and every file is checkpointed
+in a manifest in the output directory, so rerunning the same command after
+a crash only processes the files not done yet.
+"""
+
+import argparse
+import asyncio
+import glob
+import io
+import logging
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Literal
+
+from pdf2text.common.batch import (
+    MANIFEST_NAME,
+    BatchSummary,
+    Manifest,
+    discover,
+    run_batch,
+)
+from pdf2text.hosting import aclose, container
+from pdf2text.protocols.i_azure_form_recognizer import IAzureFormRecognizer
+from pdf2text.protocols.i_metrics import IMetrics
+
+if TYPE_CHECKING:
+    from pdf2text.common.form_recognizer_parse import TableFormat
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pdf2text", description="Extract the text of PDF files."
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="directories, globs or files to extract"
+    )
+    parser.add_argument("-o", "--output-dir", type=Path, default=Path("output"))
+    parser.add_argument(
+        "--backend",
+        choices=["form-recognizer", "pdfplumber", "hybrid"],
+        default="form-recognizer",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="files processed concurrently"
+    )
+    parser.add_argument(
+        "--table-format",
+        choices=["csv", "json", "grid", "markdown", "tsv"],
+        default="markdown",
+        help="the format of tables, except with the pdfplumber backend",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["text", "jsonl"],
+        default="text",
+        help="jsonl writes the typed blocks of each file as JSON lines, "
+        "with the form-recognizer backend only",
+    )
+    parser.add_argument(
+        "--pattern", default="*.pdf", help="file name pattern in directories"
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help=f"checkpoint manifest, defaults to OUTPUT_DIR/{MANIFEST_NAME}",
+    )
+    args = parser.parse_args(argv)
+
+    for item in args.inputs:
+        if not glob.has_magic(item) and not Path(item).exists():
+            parser.error(f"No such file or directory: {item}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.output_format == "jsonl" and args.backend != "form-recognizer":
+        parser.error("--output-format jsonl requires the form-recognizer backend")
+
+    return args
+
+
+def form_recognizer_extractor(
+    tbl_format: "TableFormat",
+    metrics: IMetrics,
+    output_format: Literal["text", "jsonl"] = "text",
+) -> Callable[[Path], Awaitable[str]]:
+    from pdf2text.common.form_recognizer_parse import iter_blocks, parse
+    from pdf2text.common.jsonl import write_jsonl
+
+    svc = container[IAzureFormRecognizer]
+
+    async def extract(path: Path) -> str:
+        with metrics.document(path):
+            result = await svc.analyze_document(path)
+            with metrics.timer("parse"):
+                if output_format == "jsonl":
+                    buffer = io.BytesIO()
+                    write_jsonl(iter_blocks(result, tbl_format), buffer)
+                    return buffer.getvalue().decode("utf-8")
+                return "\n".join(parse(result, tbl_format))
+
+    return extract
+
+
+def hybrid_extractor(
+    tbl_format: "TableFormat",
+) -> Callable[[Path], Awaitable[str]]:
+    from pdf2text.services.hybrid_extractor import HybridExtractor
+
+    extractor = container[HybridExtractor]
+
+    async def extract(path: Path) -> str:
+        return "\n".join(await extractor.extract(path, tbl_format))
+
+    return extract
+
+
+def pdfplumber_extractor(
+    executor: Executor, metrics: IMetrics
+) -> Callable[[Path], Awaitable[str]]:
+    from pdf2text.common.pdfplumber_extract import extract_text
+
+    async def extract(path: Path) -> str:
+        # pdfplumber is CPU bound, each file is extracted in a worker process
+        with metrics.document(path), metrics.timer("extract"):
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, partial(extract_text, path, max_workers=1)
+            )
+
+    return extract
+
+
+def manifest_options(args: argparse.Namespace) -> dict[str, str]:
+    """
+    :param args: The parsed arguments.
+    :return: The options that change the outputs, a file done with other
+        options is processed again.
+    """
+    options = {"backend": args.backend, "output_format": args.output_format}
+    if args.backend != "pdfplumber":
+        # pdfplumber renders its tables as text, whatever the table format
+        options["table_format"] = args.table_format
+    return options
+
+
+async def run(args: argparse.Namespace) -> BatchSummary:
+    logger = container[logging.Logger]
+    metrics = container[IMetrics]
+    manifest = Manifest(
+        args.manifest or args.output_dir / MANIFEST_NAME, manifest_options(args)
+    )
+    executor: Executor | None = None
+
+    try:
+        if args.backend == "pdfplumber":
+            executor = ProcessPoolExecutor(max_workers=args.workers)
+            extract = pdfplumber_extractor(executor, metrics)
+        elif args.backend == "hybrid":
+            extract = hybrid_extractor(args.table_format)
+        else:
+            extract = form_recognizer_extractor(
+                args.table_format, metrics, args.output_format
+            )
+
+        return await run_batch(
+            discover(args.inputs, args.pattern),
+            extract,
+            args.output_dir,
+            manifest,
+            logger,
+            args.workers,
+            ".jsonl" if args.output_format == "jsonl" else ".txt",
+        )
+    finally:
+        manifest.close()
+        if executor is not None:
+            executor.shutdown()
+        await aclose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    summary = asyncio.run(run(args))
+    print(f"done: {summary.done}, skipped: {summary.skipped}, failed: {summary.failed}")
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
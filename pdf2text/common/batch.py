@@ -0,0 +1,272 @@
+import asyncio
+import glob
+import os
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from itertools import takewhile
+from logging import Logger
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Iterator
+
+from pydantic import ValidationError
+
+from pdf2text.models.manifest_entry import ManifestEntry
+
+MANIFEST_NAME = ".pdf2text-manifest.jsonl"
+"""The checkpoint manifest file name, in the output directory."""
+
+
+def expand(item: str, pattern: str) -> tuple[Path, Iterator[Path]]:
+    """
+    :param item: A directory, glob or file.
+    :param pattern: The file name pattern searched for in directories.
+    :return: The root the outputs of the files are relative to, and a lazy
+        iterator of the files.
+    """
+    if glob.has_magic(item):
+        fixed = list(takewhile(lambda p: not glob.has_magic(p), Path(item).parts))
+        root = Path(*fixed) if fixed else Path(".")
+        matches = (Path(p) for p in glob.iglob(item, recursive=True))
+        return root, (p for p in matches if p.is_file())
+    if Path(item).is_dir():
+        return Path(item), walk_files(Path(item), pattern)
+    if Path(item).is_file():
+        return Path(item).parent, iter([Path(item)])
+    raise FileNotFoundError(f"No such file or directory: {item}")
+
+
+def walk_files(root: Path, pattern: str) -> Iterator[Path]:
+    # walked directory by directory in name order, never listed up front
+    pattern = pattern.casefold()
+    for dirpath, dirnames, filenames in root.walk():
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = dirpath / name
+            if fnmatchcase(name.casefold(), pattern) and path.is_file():
+                yield path
+
+
+def output_key(relative: Path) -> str:
+    # outputs only differing in their suffix or case would still collide
+    return str(relative.with_suffix("")).casefold()
+
+
+def unique_output(relative: Path, root: Path, taken: set[str]) -> Path:
+    """
+    Make the output path of a file unique across the inputs: a path already
+    taken by another input is prefixed with the name of the file's input
+    root, and numbered if that is taken too.
+
+    :param relative: The path of the file relative to its input root.
+    :param root: The input root.
+    :param taken: The keys of the output paths taken so far, updated.
+    :return: The output path, relative to the output directory.
+    """
+    output = relative
+    if output_key(output) in taken:
+        prefixed = output = root.resolve().name / relative
+        n = 2
+        while output_key(output) in taken:
+            output = prefixed.with_stem(f"{prefixed.stem}-{n}")
+            n += 1
+
+    taken.add(output_key(output))
+    return output
+
+
+def discover(
+    inputs: Iterable[str], pattern: str = "*.pdf"
+) -> Iterator[tuple[Path, Path]]:
+    """
+    Find the files to process, lazily: directories are walked and globs
+    expanded as the iterator is consumed. A directory is searched recursively
+    for files matching the pattern, a glob (`**` included) is expanded and a
+    file is taken as is. Files reached by several inputs are yielded once.
+
+    :param inputs: Directories, globs or files.
+    :param pattern: The file name pattern searched for in directories.
+    :return: An iterator of (file, output path) pairs. The output path, where
+        the output is written under the output directory, is the path of the
+        file relative to its input, made unique by unique_output when inputs
+        have files at the same relative path.
+    """
+    seen: set[Path] = set()
+    taken: set[str] = set()
+    for item in inputs:
+        root, matches = expand(item, pattern)
+        for path in matches:
+            key = path.resolve()
+            if key not in seen:
+                seen.add(key)
+                yield path, unique_output(path.relative_to(root), root, taken)
+
+
+@dataclass
+class Manifest:
+    """
+    Append-only JSON lines checkpoint of the files processed by a batch. A
+    file is only skipped on resume when it was done with the same options
+    (backend, output and table format) and has not changed size or
+    modification time since. A line torn by a crash is ignored.
+    """
+
+    path: Path
+    options: dict[str, str] = field(default_factory=dict)
+    entries: dict[str, ManifestEntry] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = ManifestEntry.model_validate_json(line)
+                    except ValidationError:
+                        continue
+                    self.entries[entry.path] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def key(path: Path) -> str:
+        return str(path.resolve())
+
+    def is_done(self, path: Path, stat: os.stat_result) -> bool:
+        entry = self.entries.get(self.key(path))
+        return (
+            entry is not None
+            and entry.status == "done"
+            and entry.size == stat.st_size
+            and entry.mtime_ns == stat.st_mtime_ns
+            and entry.options == self.options
+        )
+
+    def record(
+        self,
+        path: Path,
+        stat: os.stat_result | None,
+        output: Path | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        entry = ManifestEntry(
+            path=self.key(path),
+            size=stat.st_size if stat else None,
+            mtime_ns=stat.st_mtime_ns if stat else None,
+            status="failed" if error else "done",
+            output=str(output) if output else None,
+            error=f"{type(error).__name__}: {error}" if error else None,
+            options=self.options,
+        )
+        self.entries[entry.path] = entry
+        # flushed per file, so a crashed run loses at most the files in flight
+        self._file.write(entry.model_dump_json() + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class BatchSummary:
+    done: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def write_output(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+async def run_batch(
+    files: Iterable[tuple[Path, Path]],
+    extract: Callable[[Path], Awaitable[str]],
+    output_dir: Path,
+    manifest: Manifest,
+    logger: Logger,
+    workers: int = 4,
+    suffix: str = ".txt",
+) -> BatchSummary:
+    """
+    Extract the text of files with a pool of async workers, writing each
+    output as soon as it is extracted and checkpointing it in the manifest.
+    Files done in a previous run are skipped; failed files are retried.
+
+    :param files: The (file, relative output path) pairs, as from discover.
+    :param extract: Extracts the text of a file.
+    :param output_dir: The directory the outputs are written to.
+    :param manifest: The checkpoint manifest.
+    :param logger: The logger.
+    :param workers: The number of files processed concurrently.
+    :param suffix: The suffix of the output files.
+    :return: The number of files done, skipped and failed.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    summary = BatchSummary()
+    # bounded, so that discovery does not run ahead of the workers
+    queue: asyncio.Queue[tuple[Path, Path, os.stat_result] | None] = asyncio.Queue(
+        maxsize=workers * 2
+    )
+
+    iterator = iter(files)
+
+    def next_file() -> tuple[Path, Path, os.stat_result | OSError] | None:
+        # discovery walks the file system, it is run in a worker thread
+        for path, relative in iterator:
+            try:
+                return path, relative, path.stat()
+            except OSError as e:
+                return path, relative, e
+        return None
+
+    async def produce() -> None:
+        while True:
+            try:
+                item = await asyncio.to_thread(next_file)
+            except Exception as e:
+                # the file iterator cannot be resumed once it raised
+                logger.error(f"Error discovering files: {e}")
+                summary.failed += 1
+                break
+            if item is None:
+                break
+
+            path, relative, stat = item
+            if isinstance(stat, OSError):
+                logger.warning(f"Error reading {path}: {stat}")
+                manifest.record(path, None, error=stat)
+                summary.failed += 1
+            elif manifest.is_done(path, stat):
+                summary.skipped += 1
+            else:
+                await queue.put((path, relative, stat))
+
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work() -> None:
+        while (item := await queue.get()) is not None:
+            path, relative, stat = item
+            output = output_dir / relative.with_suffix(suffix)
+            try:
+                text = await extract(path)
+                await asyncio.to_thread(write_output, output, text)
+            except Exception as e:
+                logger.warning(f"Error extracting {path}: {e}")
+                manifest.record(path, stat, error=e)
+                summary.failed += 1
+            else:
+                manifest.record(path, stat, output=output)
+                summary.done += 1
+                logger.info(f"Extracted {path} to {output}")
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(produce())
+        for _ in range(workers):
+            tg.create_task(work())
+
+    return summary
@@ -0,0 +1,52 @@
+import math
+from typing import Callable, Iterable
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text, assuming ~4 characters per token
+    as for the GPT tokenizers on English text.
+
+    :param text: The text.
+    :return: The estimated number of tokens.
+    """
+    return math.ceil(len(text) / 4)
+
+
+def chunk_blocks(
+    blocks: Iterable[str],
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> list[str]:
+    """
+    Group text blocks (paragraphs and rendered tables, as produced by parse)
+    into chunks that fit a token budget. Blocks are never split, so a block
+    larger than the budget becomes a chunk of its own.
+
+    :param blocks: The text blocks, in document order.
+    :param max_tokens: The token budget of a chunk.
+    :param count_tokens: The function counting the tokens of a text.
+    :return: The chunks, each the newline-joined text of its blocks.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for block in blocks:
+        # + 1 for the newline joining the block to the chunk
+        tokens = count_tokens(block) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current = []
+            current_tokens = 0
+
+        current.append(block)
+        current_tokens += tokens
+
+    if current:
+        chunks.append("\n".join(current))
+
+    return chunks
@@ -1,121 +1,664 @@
+import csv
+import io
 import json
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import Literal
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Sequence,
+    get_args,
+)
 
-import pandas as pd
-from azure.ai.formrecognizer import AnalyzeResult, DocumentTable
+from azure.ai.formrecognizer import (
+    AnalyzeResult,
+    BoundingRegion,
+    DocumentParagraph,
+    DocumentTable,
+)
 from pydantic import BaseModel, Field
 from tabulate import tabulate
 
+from pdf2text.common.chunking import estimate_tokens
+from pdf2text.models.block import Block
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 current_folder = Path(__file__).parent
 document_path = current_folder.parent.parent / "x.json"
 
 
-class TableData(BaseModel):
-    headers: list[str] = Field(default_factory=list)
-    rows: list[list[str]]
-    span_offsets: dict[int, list[int]]
-    added: bool = False
+TableFormat = Literal["csv", "json", "grid", "markdown", "tsv"]
+TABLE_FORMATS: tuple[TableFormat, ...] = get_args(TableFormat)
+
+
+def markdown_cell(text: str | None) -> str:
+    return (text or "").replace("|", "\\|").replace("\n", " ")
+
+
+def tsv_cell(text: str | None) -> str:
+    return (text or "").replace("\t", " ").replace("\n", " ")
+
+
+class TableView(ABC):
+    """
+    The rendering of a table, shared by the compact TableCells built by
+    format_table and the TableData model, which implement the abstract
+    methods.
+    """
+
+    __slots__ = ()
+
+    if TYPE_CHECKING:
+        headers: list[str]
+
+    @abstractmethod
+    def pages(self) -> Iterable[int]:
+        """
+        :return: The numbers of the pages the table is on.
+        """
+
+    @abstractmethod
+    def page_range(self, page_num: int) -> tuple[int, int]:
+        """
+        Get the [start, end) offset range the table covers on a page.
+
+        :param page_num: The page number.
+        :return: The start (inclusive) and end (exclusive) offsets.
+        """
 
-    def format_output(self, tbl_format: Literal["csv", "json", "grid"]) -> str:
+    @abstractmethod
+    def padded_rows(self, fill: str | None) -> list[list[str | None]]:
+        """
+        Drop the trailing empty row and pad short rows to the header width,
+        rejecting rows wider than the headers as pandas.DataFrame does.
+
+        :param fill: The value used for missing cells.
+        :return: The rows, each as wide as the headers.
+        """
+
+    def format_output(self, tbl_format: TableFormat) -> str:
         if tbl_format == "csv":
             return self.to_csv()
         elif tbl_format == "grid":
             return self.to_grid()
+        elif tbl_format == "markdown":
+            return self.to_markdown()
+        elif tbl_format == "tsv":
+            return self.to_tsv()
         else:
             return self.to_json()
 
-    def to_csv(self) -> str:
-        if not self.rows[-1]:
-            self.rows.pop()
+    def records(self) -> list[dict[str, str | None]]:
+        rows = self.padded_rows(None)
+        if not self.headers:
+            # a table without columns has no records, whatever its row count
+            return []
+        return [dict(zip(self.headers, row)) for row in rows]
 
-        df = pd.DataFrame(self.rows, columns=self.headers)  # type: ignore
-        return f"\n{df.to_csv(index=False)}\n"
+    def to_dataframe(self) -> "pd.DataFrame":
+        import pandas as pd
 
-    def to_json(self) -> str:
-        if not self.rows[-1]:
-            self.rows.pop()
+        return pd.DataFrame(self.padded_rows(None), columns=self.headers)  # type: ignore
+
+    def to_csv(self) -> str:
+        rows = self.padded_rows("")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(self.headers)
+        writer.writerows(rows)
+        return f"\n{buffer.getvalue()}\n"
 
-        df = pd.DataFrame(self.rows, columns=self.headers)  # type: ignore
-        data = df.to_dict(orient="records")
-        return f"\n{json.dumps(data)}\n"
+    def to_json(self) -> str:
+        return f"\n{json.dumps(self.records())}\n"
 
     def to_grid(self) -> str:
-        if not self.rows[-1]:
+        result = tabulate(self.records(), headers="keys", tablefmt="grid")
+        return f"\n{result}\n"
+
+    def to_markdown(self) -> str:
+        # unpadded, as the padding of aligned columns costs tokens
+        rows = self.padded_rows("")
+        if not self.headers:
+            return "\n\n"
+        lines = [
+            f"| {' | '.join(map(markdown_cell, row))} |"
+            for row in [self.headers, ["---"] * len(self.headers), *rows]
+        ]
+        return "\n{}\n".format("\n".join(lines))
+
+    def to_tsv(self) -> str:
+        rows = self.padded_rows("")
+        lines = ["\t".join(map(tsv_cell, row)) for row in [self.headers, *rows]]
+        return "\n{}\n\n".format("\n".join(lines))
+
+
+class TableData(TableView, BaseModel):
+    headers: list[str] = Field(default_factory=list)
+    rows: list[list[str]]
+    span_offsets: dict[int, list[int]]
+    span_ranges: dict[int, tuple[int, int]] = Field(default_factory=dict)
+    added: bool = False
+
+    def pages(self) -> Iterable[int]:
+        return self.span_offsets.keys()
+
+    def page_range(self, page_num: int) -> tuple[int, int]:
+        if page_num in self.span_ranges:
+            return self.span_ranges[page_num]
+
+        offsets = self.span_offsets[page_num]
+        return min(offsets), max(offsets) + 1
+
+    def padded_rows(self, fill: str | None) -> list[list[str | None]]:
+        if self.rows and not self.rows[-1]:
             self.rows.pop()
 
-        df = pd.DataFrame(self.rows, columns=self.headers)  # type: ignore
-        data = df.to_dict(orient="records")
-        result = tabulate(data, headers="keys", tablefmt="grid")
-        return f"\n{result}\n"
+        width = len(self.headers)
+        if self.rows:
+            data_width = max(len(row) for row in self.rows)
+            if data_width != width:
+                raise ValueError(
+                    f"{width} columns passed, passed data had {data_width} columns"
+                )
+
+        return [row + [fill] * (width - len(row)) for row in self.rows]
+
+
+@dataclass(slots=True, eq=False)
+class TableCells(TableView):
+    """
+    Compact store of a table, filled by format_table without per-row lists or
+    pydantic validation: the (interned) cell contents row after row in one
+    flat list with the end of each row in an array, and the page and offset
+    of the first span of each cell in two flat arrays. to_model exports it as
+    a TableData.
+    """
+
+    headers: list[str] = field(default_factory=list)
+    cells: list[str] = field(default_factory=list)
+    row_ends: array[int] = field(default_factory=lambda: array("I"))
+    span_pages: array[int] = field(default_factory=lambda: array("I"))
+    span_starts: array[int] = field(default_factory=lambda: array("I"))
+    span_ranges: dict[int, tuple[int, int]] = field(default_factory=dict)
+    added: bool = False
+
+    def row_bounds(self) -> Iterator[tuple[int, int]]:
+        start = 0
+        for end in self.row_ends:
+            yield start, end
+            start = end
+
+    @property
+    def rows(self) -> list[list[str]]:
+        return [self.cells[start:end] for start, end in self.row_bounds()]
+
+    @property
+    def span_offsets(self) -> dict[int, list[int]]:
+        span_offsets: dict[int, list[int]] = {}
+        for pg_num, offset in zip(self.span_pages, self.span_starts):
+            span_offsets.setdefault(pg_num, []).append(offset)
+        return span_offsets
+
+    def pages(self) -> Iterable[int]:
+        return self.span_ranges.keys()
 
+    def page_range(self, page_num: int) -> tuple[int, int]:
+        return self.span_ranges[page_num]
 
-def format_table(tbl: DocumentTable) -> TableData:
+    def padded_rows(self, fill: str | None) -> list[list[str | None]]:
+        bounds = list(self.row_bounds())
+        if bounds and bounds[-1][0] == bounds[-1][1]:
+            bounds.pop()
+
+        width = len(self.headers)
+        if bounds:
+            data_width = max(end - start for start, end in bounds)
+            if data_width != width:
+                raise ValueError(
+                    f"{width} columns passed, passed data had {data_width} columns"
+                )
+
+        return [
+            [*self.cells[start:end], *[fill] * (width - end + start)]
+            for start, end in bounds
+        ]
+
+    def clear(self) -> None:
+        """Release the cells, keeping the spans the table is looked up by."""
+        self.headers = []
+        self.cells = []
+        self.row_ends = array("I")
+
+    def to_model(self) -> TableData:
+        return TableData(
+            headers=list(self.headers),
+            rows=self.rows,
+            span_offsets=self.span_offsets,
+            span_ranges=dict(self.span_ranges),
+            added=self.added,
+        )
+
+
+def table_spans(tbl: DocumentTable, *continuations: DocumentTable) -> TableCells:
+    """
+    Collect the per-page span offsets and offset ranges of a table, leaving
+    its rows empty until fill_rows is called.
+
+    :param tbl: The table from the analysis result.
+    :param continuations: The tables continuing it on the next pages, see
+        group_continued_tables.
+    :return: A TableCells without headers or rows.
+    """
     if not tbl.bounding_regions:
         raise ValueError("Table has no bounding regions")
 
-    span_offsets: dict[int, list[int]] = {}
-    for cell in tbl.cells:
-        if cell.spans and cell.bounding_regions:
-            pg_num = cell.bounding_regions[0].page_number
-            if pg_num not in span_offsets:
-                span_offsets[pg_num] = []
-            span_offsets[pg_num].append(cell.spans[0].offset)
-
-    tbl_data = TableData(
-        rows=[[] for _ in range(tbl.row_count)],
-        span_offsets=span_offsets,
-    )
+    tbl_data = TableCells()
+    span_ranges = tbl_data.span_ranges
+    for cell in chain(tbl.cells, *(part.cells for part in continuations)):
+        spans = cell.spans
+        regions = cell.bounding_regions
+        if spans and regions:
+            pg_num = regions[0].page_number
+            start = spans[0].offset
+            if len(spans) == 1:
+                end = start + spans[0].length
+            else:
+                end = max(span.offset + span.length for span in spans)
+            tbl_data.span_pages.append(pg_num)
+            tbl_data.span_starts.append(start)
+
+            current = span_ranges.get(pg_num)
+            if current is None:
+                span_ranges[pg_num] = (start, end)
+            elif start < current[0] or end > current[1]:
+                span_ranges[pg_num] = (min(start, current[0]), max(end, current[1]))
+
+    return tbl_data
+
+
+HEADER_KINDS = ("columnHeader", "stubHead")
+HEADER_SEPARATOR = " / "
+
 
+def header_names(grid: list[str], columns: int, header_rows: int) -> list[str]:
+    """
+    Name each column after the header cells above it, joining the distinct
+    texts of a multi-row header from top to bottom, e.g. "Revenue / 2023".
+
+    :param grid: The cells of the table, row after row.
+    :param columns: The number of columns.
+    :param header_rows: The number of header rows at the top of the grid.
+    :return: The column names.
+    """
+    headers = []
+    for col in range(columns):
+        parts: list[str] = []
+        for row in range(header_rows):
+            text = grid[row * columns + col]
+            if text and (not parts or parts[-1] != text):
+                parts.append(text)
+        headers.append(HEADER_SEPARATOR.join(parts))
+    return headers
+
+
+def table_grid(tbl: DocumentTable) -> tuple[list[str] | None, list[str]]:
+    """
+    Lay the cells of a table out in a dense grid in one pass over its cells,
+    by their row and column indices, copying a merged cell into every
+    position it spans. The leading rows of column headers become the
+    headers, and row headers stay in their columns.
+
+    :param tbl: The table from the analysis result.
+    :return: The headers, None when the table has no header cells, and the
+        cells of the other rows, row after row.
+    """
+    columns = tbl.column_count
+    rows = tbl.row_count
+    grid = [""] * (rows * columns)
+    header_end = 0
+    first_data_row = rows
     for cell in tbl.cells:
-        if cell.kind == "columnHeader":
-            tbl_data.headers.append(cell.content)
-        elif cell.kind == "content":
-            row_idx = cell.row_index - 1
-            tbl_data.rows[row_idx].append(cell.content)
+        row = cell.row_index
+        col = cell.column_index
+        row_span = cell.row_span or 1
+        column_span = cell.column_span or 1
+        if cell.kind in HEADER_KINDS:
+            header_end = max(header_end, row + row_span)
+        elif row < first_data_row:
+            first_data_row = row
+
+        if row + row_span > rows:
+            grid.extend([""] * ((row + row_span - rows) * columns))
+            rows = row + row_span
+
+        if row_span == 1 and column_span == 1:
+            if col < columns:
+                grid[row * columns + col] = sys.intern(cell.content)
+            continue
+
+        width = min(col + column_span, columns) - col
+        if width > 0:
+            spanned = [sys.intern(cell.content)] * width
+            for r in range(row, row + row_span):
+                grid[r * columns + col : r * columns + col + width] = spanned
+
+    # column headers repeated further down, e.g. on the next page of a table
+    # split across pages, are left as rows
+    header_rows = min(header_end, first_data_row)
+    headers = header_names(grid, columns, header_rows) if header_rows else None
+    del grid[: header_rows * columns]
+    return headers, grid
+
 
+def fill_rows(
+    tbl_data: TableCells, tbl: DocumentTable, *continuations: DocumentTable
+) -> TableCells:
+    """
+    Fill the headers and rows of a table from its grid, see table_grid, then
+    append the rows of its continuations, whose repeated headers are
+    dropped. A table without header cells takes its first row as headers.
+
+    :param tbl_data: The table spans from table_spans.
+    :param tbl: The table from the analysis result.
+    :param continuations: The tables continuing it on the next pages.
+    :return: The table, filled.
+    """
+    columns = tbl.column_count
+    headers, grid = table_grid(tbl)
+    if headers is None:
+        headers = grid[:columns]
+        del grid[:columns]
+    for part in continuations:
+        grid.extend(table_grid(part)[1])
+
+    tbl_data.headers = headers
+    tbl_data.cells = grid
+    tbl_data.row_ends = array("I", range(columns, len(grid) + 1, columns or 1))
     return tbl_data
 
 
-def in_table(
-    page_num: int, span_offset: int, tables: list[TableData]
-) -> TableData | None:
-    for tbl in tables:
-        if page_num in tbl.span_offsets:
-            offsets = tbl.span_offsets[page_num]
-            if span_offset in offsets:
-                return tbl
+PAGE_FURNITURE = ("pageHeader", "pageFooter", "pageNumber")
 
-    return None
 
+def header_key(tbl: DocumentTable) -> tuple[tuple[int, int, str], ...]:
+    return tuple(
+        (cell.row_index, cell.column_index, cell.content)
+        for cell in tbl.cells
+        if cell.kind in HEADER_KINDS
+    )
 
-def parse(
-    result: AnalyzeResult, tbl_format: Literal["csv", "json", "grid"] = "csv"
-) -> list[str]:
-    results: list[str] = []
-    table_data = []
 
-    paragraphs = result.paragraphs
-    tables = result.tables
-    if tables:
-        for tbl in tables:
-            table_data.append(format_table(tbl))
+def page_bounds(tbl: DocumentTable) -> tuple[int, int]:
+    pages = [region.page_number for region in tbl.bounding_regions or []]
+    return (min(pages), max(pages)) if pages else (0, 0)
 
-    if paragraphs:
-        for p in paragraphs:
+
+def offset_bounds(tbl: DocumentTable) -> tuple[int, int] | None:
+    if not tbl.spans:
+        return None
+    return (
+        min(span.offset for span in tbl.spans),
+        max(span.offset + span.length for span in tbl.spans),
+    )
+
+
+def group_continued_tables(
+    tables: list[DocumentTable], paragraphs: list[DocumentParagraph] | None = None
+) -> list[list[DocumentTable]]:
+    """
+    Group the tables split across page breaks, in one pass over the tables
+    sorted by page. A table continues the previous one when it starts on the
+    page after the one the previous table ends on, has as many columns,
+    either repeats its headers or has none, and no paragraph other than page
+    headers, footers and numbers lies between the two.
+
+    :param tables: The tables of the analysis result.
+    :param paragraphs: The paragraphs of the analysis result.
+    :return: The groups of tables, each a table followed by its
+        continuations, in page order.
+    """
+    body = sorted(
+        p.spans[0].offset
+        for p in paragraphs or []
+        if p.spans and p.role not in PAGE_FURNITURE
+    )
+
+    def adjacent(previous: DocumentTable, tbl: DocumentTable) -> bool:
+        before, after = offset_bounds(previous), offset_bounds(tbl)
+        if before is None or after is None:
+            return True
+        pos = bisect_left(body, before[1])
+        return pos == len(body) or body[pos] >= after[0]
+
+    groups: list[list[DocumentTable]] = []
+    for tbl in sorted(tables, key=lambda tbl: page_bounds(tbl)[0]):
+        if groups:
+            previous = groups[-1][-1]
             if (
-                p.bounding_regions
-                and p.spans
-                and p.role not in ["pageNumber", "pageFooter"]
+                page_bounds(tbl)[0] == page_bounds(previous)[1] + 1
+                and tbl.column_count == previous.column_count
+                and adjacent(previous, tbl)
+                and header_key(tbl) in ((), header_key(groups[-1][0]))
             ):
-                tbl = in_table(
-                    p.bounding_regions[0].page_number, p.spans[0].offset, table_data
-                )
-                if tbl:
-                    if not tbl.added:
-                        results.append(tbl.format_output(tbl_format))
-                        tbl.added = True
-                else:
-                    results.append(p.content)
-
-    return results
+                groups[-1].append(tbl)
+                continue
+
+        groups.append([tbl])
+    return groups
+
+
+def format_table(tbl: DocumentTable, *continuations: DocumentTable) -> TableCells:
+    return fill_rows(table_spans(tbl, *continuations), tbl, *continuations)
+
+
+@dataclass
+class TableIndex:
+    """
+    Per-page index of table offset ranges, sorted by start offset so that a
+    paragraph can be resolved to its table with a binary search.
+    """
+
+    pages: dict[int, list[tuple[int, int, TableView]]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, tables: Sequence[TableView]) -> "TableIndex":
+        index = cls()
+        for tbl in tables:
+            for page_num in tbl.pages():
+                start, end = tbl.page_range(page_num)
+                index.pages.setdefault(page_num, []).append((start, end, tbl))
+
+        for entries in index.pages.values():
+            entries.sort(key=lambda e: e[0])
+        return index
+
+    def lookup(self, page_num: int, span_offset: int) -> TableView | None:
+        entries = self.pages.get(page_num)
+        if not entries:
+            return None
+
+        pos = bisect_right(entries, span_offset, key=lambda e: e[0]) - 1
+        if pos >= 0:
+            _, end, tbl = entries[pos]
+            if span_offset < end:
+                return tbl
+
+        return None
+
+
+def in_table(
+    page_num: int, span_offset: int, tables: TableIndex | Sequence[TableView]
+) -> TableView | None:
+    if not isinstance(tables, TableIndex):
+        tables = TableIndex.build(tables)
+
+    return tables.lookup(page_num, span_offset)
+
+
+HEADING_ROLES = ("title", "sectionHeading")
+
+
+def iter_elements(
+    result: AnalyzeResult,
+) -> Iterator[tuple[DocumentParagraph, tuple[TableCells, list[DocumentTable]] | None]]:
+    """
+    Walk the body paragraphs of an analysis result in document order, page
+    numbers and footers excluded. A paragraph outside tables is yielded with
+    None; the first paragraph reached of a table, or of a table split across
+    page breaks, is yielded with the table filled and its parts, and the
+    table's other paragraphs are skipped. A table's rows are only built when
+    it is reached and released once the walk resumes, so at most one table is
+    materialized at a time.
+
+    :param result: The analysis result.
+    :return: An iterator of (paragraph, table) pairs.
+    """
+    groups = group_continued_tables(result.tables or [], result.paragraphs)
+    table_data = [table_spans(*group) for group in groups]
+    sources = {
+        id(tbl_data): (tbl_data, group) for tbl_data, group in zip(table_data, groups)
+    }
+    index = TableIndex.build(table_data)
+
+    for p in result.paragraphs or []:
+        if (
+            p.bounding_regions
+            and p.spans
+            and p.role not in ["pageNumber", "pageFooter"]
+        ):
+            page_num = p.bounding_regions[0].page_number
+            found = in_table(page_num, p.spans[0].offset, index)
+            if found:
+                tbl_data, group = sources[id(found)]
+                if not tbl_data.added:
+                    fill_rows(tbl_data, *group)
+                    yield p, (tbl_data, group)
+                    tbl_data.added = True
+                    tbl_data.clear()
+            else:
+                yield p, None
+
+
+def iter_page_blocks(
+    result: AnalyzeResult, tbl_format: TableFormat = "csv"
+) -> Iterator[tuple[int, str]]:
+    """
+    Yield the text blocks of an analysis result in document order, with the
+    number of the page each starts on, see iter_elements. A table split
+    across page breaks is rendered once, as a single table.
+
+    :param result: The analysis result.
+    :param tbl_format: The format to render tables in.
+    :return: An iterator of (page number, block) pairs, the blocks being
+        paragraph contents and rendered tables.
+    """
+    for p, table in iter_elements(result):
+        page_num = p.bounding_regions[0].page_number  # type: ignore
+        if table:
+            yield page_num, table[0].format_output(tbl_format)
+        else:
+            yield page_num, p.content
+
+
+def bounding_box(
+    regions: list[BoundingRegion] | None,
+) -> tuple[float, float, float, float] | None:
+    """
+    :param regions: The bounding regions of an element.
+    :return: The (left, top, right, bottom) box of the polygon of its first
+        region, in the unit of the page (inches for PDF), or None.
+    """
+    if not regions or not regions[0].polygon:
+        return None
+    xs = [point.x for point in regions[0].polygon]
+    ys = [point.y for point in regions[0].polygon]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def iter_blocks(
+    result: AnalyzeResult, tbl_format: TableFormat = "csv"
+) -> Iterator[Block]:
+    """
+    Yield the typed blocks of an analysis result in document order, keeping
+    the page, span offset, role and bounding box of each paragraph, heading
+    and table, for indexing without re-parsing the rendered text. Tables
+    carry their headers and rows besides their rendering.
+
+    :param result: The analysis result.
+    :param tbl_format: The format to render tables in.
+    :return: An iterator of blocks.
+    """
+    for p, table in iter_elements(result):
+        if table is None:
+            spans = p.spans
+            # the blocks are built from the analysis result, without validation
+            yield Block.model_construct(
+                kind="heading" if p.role in HEADING_ROLES else "paragraph",
+                page=p.bounding_regions[0].page_number,  # type: ignore
+                offset=spans[0].offset,
+                length=spans[-1].offset + spans[-1].length - spans[0].offset,
+                content=p.content,
+                role=p.role,
+                bbox=bounding_box(p.bounding_regions),
+            )
+        else:
+            tbl_data, group = table
+            start = min(start for start, _ in tbl_data.span_ranges.values())
+            end = max(end for _, end in tbl_data.span_ranges.values())
+            yield Block.model_construct(
+                kind="table",
+                page=page_bounds(group[0])[0],
+                offset=start,
+                length=end - start,
+                content=tbl_data.format_output(tbl_format),
+                bbox=bounding_box(group[0].bounding_regions),
+                headers=list(tbl_data.headers),
+                rows=tbl_data.rows,
+            )
+
+
+def table_token_counts(
+    result: AnalyzeResult, count_tokens: Callable[[str], int] = estimate_tokens
+) -> dict[TableFormat, int]:
+    """
+    Count the tokens of the tables of an analysis result rendered in each
+    table format, to pick the cheapest format for a model.
+
+    :param result: The analysis result.
+    :param count_tokens: The function counting the tokens of a text, e.g.
+        the encode of the model's tokenizer.
+    :return: The total number of tokens of the tables, by format.
+    """
+    counts = dict.fromkeys(TABLE_FORMATS, 0)
+    for group in group_continued_tables(result.tables or [], result.paragraphs):
+        tbl_data = format_table(*group)
+        for tbl_format in TABLE_FORMATS:
+            counts[tbl_format] += count_tokens(tbl_data.format_output(tbl_format))
+    return counts
+
+
+def iter_parse(result: AnalyzeResult, tbl_format: TableFormat = "csv") -> Iterator[str]:
+    """
+    Yield the text blocks of an analysis result in document order, see
+    iter_page_blocks.
+
+    :param result: The analysis result.
+    :param tbl_format: The format to render tables in.
+    :return: An iterator of paragraph contents and rendered tables.
+    """
+    for _, block in iter_page_blocks(result, tbl_format):
+        yield block
+
+
+def parse(result: AnalyzeResult, tbl_format: TableFormat = "csv") -> list[str]:
+    return list(iter_parse(result, tbl_format))
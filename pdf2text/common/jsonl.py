@@ -0,0 +1,38 @@
+from typing import IO, Iterable
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(model: BaseModel) -> bytes:
+    """
+    Serialize a model whose fields are JSON types (str, numbers, None, and
+    lists, tuples and dicts of them) to a line of JSON. With orjson
+    installed, its fields are serialized directly, several times faster than
+    with pydantic.
+
+    :param model: The model.
+    :return: The JSON, without a trailing newline.
+    """
+    if orjson is not None:
+        return orjson.dumps(vars(model))
+    return model.model_dump_json().encode("utf-8")
+
+
+def write_jsonl(models: Iterable[BaseModel], file: IO[bytes]) -> int:
+    """
+    Write models as JSON lines, as they are produced.
+
+    :param models: The models, see dumps.
+    :param file: The binary file to write to.
+    :return: The number of lines written.
+    """
+    count = 0
+    for model in models:
+        file.write(dumps(model) + b"\n")
+        count += 1
+    return count
@@ -0,0 +1,41 @@
+from typing import Iterable
+
+
+def format_page_ranges(pages: Iterable[int]) -> str:
+    """
+    Format page numbers as the `pages` parameter of Form Recognizer.
+
+    :param pages: The 1-based page numbers, in any order.
+    :return: The pages as comma-separated ranges, e.g. "1-3,5".
+    """
+    ranges: list[tuple[int, int]] = []
+    for page in sorted(set(pages)):
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+
+    return ",".join(
+        str(start) if start == end else f"{start}-{end}" for start, end in ranges
+    )
+
+
+def parse_page_ranges(pages: str) -> list[int]:
+    """
+    Parse the `pages` parameter of Form Recognizer.
+
+    :param pages: Comma-separated 1-based pages and ranges, e.g. "1-3,5".
+    :return: The page numbers, sorted and without duplicates.
+    """
+    numbers: set[int] = set()
+    for part in pages.split(","):
+        start, _, end = part.strip().partition("-")
+        try:
+            first = int(start)
+            last = int(end) if end else first
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part.strip()}") from None
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range: {part.strip()}")
+        numbers.update(range(first, last + 1))
+    return sorted(numbers)
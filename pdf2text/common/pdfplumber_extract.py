@@ -0,0 +1,194 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pdfplumber
+from pdfplumber.page import Page
+
+from pdf2text.common.form_recognizer_parse import TableData, TableFormat
+
+MAX_UNMAPPED_RATIO = 0.05
+"""The fraction of glyphs without text above which a text layer is unusable."""
+
+PAGE_NUMBER = re.compile(r"^\s*(page\s*)?\d+(\s*(of|/)\s*\d+)?\s*$", re.IGNORECASE)
+
+
+def page_count(path: str | Path) -> int:
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(
+    path: str | Path, start: int, end: int, layout: bool = True
+) -> list[str]:
+    """
+    Extract the text of pages [start, end) of a PDF. Runs in a worker process,
+    so the file is opened independently of any other range.
+
+    :param path: The file path to the PDF.
+    :param start: The zero-based index of the first page.
+    :param end: The zero-based index one past the last page.
+    :param layout: Whether to preserve the page layout.
+    :return: The text of each page, in page order.
+    """
+    with pdfplumber.open(path, pages=list(range(start + 1, end + 1))) as pdf:
+        return [page.extract_text(layout=layout) or "" for page in pdf.pages]
+
+
+def extract_text(
+    path: str | Path,
+    max_workers: int | None = None,
+    chunk_size: int = 16,
+    layout: bool = True,
+) -> str:
+    """
+    Extract the text of a PDF with pdfplumber, splitting the pages into
+    chunks that are extracted in parallel worker processes.
+
+    :param path: The file path to the PDF.
+    :param max_workers: The number of worker processes, defaults to the CPU
+        count. 1 extracts serially in the current process.
+    :param chunk_size: The number of pages extracted per worker task.
+    :param layout: Whether to preserve the page layout.
+    :return: The text of all pages, in page order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    num_pages = page_count(path)
+    ranges = [
+        (start, min(start + chunk_size, num_pages))
+        for start in range(0, num_pages, chunk_size)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(ranges))
+
+    if workers <= 1:
+        pages = [extract_page_range(path, s, e, layout) for s, e in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pages = list(
+                executor.map(
+                    extract_page_range,
+                    [path] * len(ranges),
+                    [s for s, _ in ranges],
+                    [e for _, e in ranges],
+                    [layout] * len(ranges),
+                )
+            )
+
+    return "".join(text for chunk in pages for text in chunk)
+
+
+def needs_analysis(page: Page, min_chars: int, max_image_ratio: float) -> bool:
+    """
+    Whether a page lacks a usable text layer: too few characters, mostly
+    covered by images (a scan, possibly with a poor OCR layer), or with many
+    glyphs that do not map to text.
+
+    :param page: The page.
+    :param min_chars: The number of characters a page with text has at least.
+    :param max_image_ratio: The fraction of the page images may cover.
+    :return: True when the page should be analyzed by Form Recognizer.
+    """
+    if len(page.chars) < min_chars:
+        return True
+
+    image_area = sum(
+        max(0, img["x1"] - img["x0"]) * max(0, img["bottom"] - img["top"])
+        for img in page.images
+    )
+    if image_area > max_image_ratio * page.width * page.height:
+        return True
+
+    unmapped = sum(
+        char["text"].startswith("(cid:") or char["text"] == "\ufffd"
+        for char in page.chars
+    )
+    return unmapped > MAX_UNMAPPED_RATIO * len(page.chars)
+
+
+def inside(obj: dict[str, Any], bbox: tuple[float, float, float, float]) -> bool:
+    x0, top, x1, bottom = bbox
+    return (
+        obj["x0"] >= x0
+        and obj["x1"] <= x1
+        and obj["top"] >= top
+        and obj["bottom"] <= bottom
+    )
+
+
+def page_blocks(page: Page, tbl_format: TableFormat = "csv") -> list[str] | None:
+    """
+    Extract the blocks of a page in the format of form_recognizer_parse.parse:
+    paragraphs, and tables rendered in the table format, in reading order.
+    Lines are grouped into paragraphs on vertical gaps and page numbers are
+    dropped.
+
+    :param page: The page.
+    :param tbl_format: The format to render tables in.
+    :return: The blocks, or None when a table has merged cells, which only
+        Form Recognizer lays out correctly.
+    """
+    positioned: list[tuple[float, str]] = []
+
+    tables = page.find_tables()
+    for table in tables:
+        rows = table.extract()
+        if not rows or any(cell is None for row in rows for cell in row):
+            return None
+
+        cells = [[(cell or "").replace("\n", " ") for cell in row] for row in rows]
+        tbl_data = TableData(headers=cells[0], rows=cells[1:], span_offsets={})
+        positioned.append((table.bbox[1], tbl_data.format_output(tbl_format)))
+
+    bboxes = [table.bbox for table in tables]
+    text_page = page.filter(
+        lambda obj: (
+            obj.get("object_type") != "char"
+            or not any(inside(obj, bbox) for bbox in bboxes)
+        )
+    )
+
+    paragraph: list[dict[str, Any]] = []
+    for line in [*text_page.extract_text_lines(), None]:
+        if paragraph and (
+            line is None
+            # a gap of more than half a line height starts a paragraph
+            or line["top"] - paragraph[-1]["bottom"]
+            > 0.5 * (paragraph[-1]["bottom"] - paragraph[-1]["top"])
+        ):
+            content = " ".join(item["text"].strip() for item in paragraph)
+            if not PAGE_NUMBER.match(content):
+                positioned.append((paragraph[0]["top"], content))
+            paragraph = []
+        if line is not None:
+            paragraph.append(line)
+
+    return [block for _, block in sorted(positioned, key=lambda item: item[0])]
+
+
+def extract_page_blocks(
+    path: str | Path,
+    tbl_format: TableFormat = "csv",
+    min_chars: int = 200,
+    max_image_ratio: float = 0.5,
+) -> dict[int, list[str] | None]:
+    """
+    Extract the blocks of the pages of a PDF that have a clean text layer.
+
+    :param path: The file path to the PDF.
+    :param tbl_format: The format to render tables in.
+    :param min_chars: The number of characters a page with text has at least.
+    :param max_image_ratio: The fraction of the page images may cover.
+    :return: The blocks by 1-based page number, None for the pages that need
+        Form Recognizer.
+    """
+    with pdfplumber.open(path) as pdf:
+        return {
+            page.page_number: None
+            if needs_analysis(page, min_chars, max_image_ratio)
+            else page_blocks(page, tbl_format)
+            for page in pdf.pages
+        }
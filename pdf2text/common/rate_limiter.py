@@ -0,0 +1,101 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+
+@dataclass
+class TokenBucket:
+    """
+    A bucket refilled continuously at `per_minute` units per minute, holding
+    at most one minute's worth. The level may go negative when actual usage
+    turns out higher than what was reserved.
+    """
+
+    per_minute: float
+    level: float = field(init=False)
+    updated: float | None = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.level = self.per_minute
+        self.updated = None
+
+    def refill(self, now: float) -> None:
+        if self.updated is not None:
+            elapsed = now - self.updated
+            self.level = min(
+                self.per_minute, self.level + elapsed * self.per_minute / 60
+            )
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        # a request larger than the bucket only waits for a full bucket
+        amount = min(amount, self.per_minute)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60 / self.per_minute
+
+
+@dataclass
+class RateLimiter:
+    """
+    Client-side limiter for requests per minute and tokens per minute. Callers
+    reserve their estimated tokens with acquire, then report actual usage with
+    record. When the service throttles, pause holds every caller back until
+    the Retry-After delay has passed.
+    """
+
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+
+    def __post_init__(self) -> None:
+        self.requests = (
+            TokenBucket(self.requests_per_minute) if self.requests_per_minute else None
+        )
+        self.tokens = (
+            TokenBucket(self.tokens_per_minute) if self.tokens_per_minute else None
+        )
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def wait_time(self, tokens: int) -> float:
+        now = self.clock()
+        wait = max(0.0, self.paused_until - now)
+        if self.requests is not None:
+            self.requests.refill(now)
+            wait = max(wait, self.requests.wait_time(1))
+        if self.tokens is not None:
+            self.tokens.refill(now)
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until a request of the estimated size fits both budgets, then
+        reserve it.
+
+        :param tokens: The estimated number of tokens of the request.
+        """
+        async with self._lock:
+            while (wait := self.wait_time(tokens)) > 0:
+                await self.sleep(wait)
+
+            if self.requests is not None:
+                self.requests.level -= 1
+            if self.tokens is not None:
+                self.tokens.level -= tokens
+
+    def record(self, reserved: int, used: int) -> None:
+        """
+        Correct a reservation with the actual token usage of the request.
+
+        :param reserved: The number of tokens reserved by acquire.
+        :param used: The number of tokens actually used.
+        """
+        if self.tokens is not None:
+            self.tokens.level += reserved - used
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
@@ -0,0 +1,78 @@
+from typing import Any
+
+from azure.ai.formrecognizer import AnalyzeResult
+
+MERGED_LISTS = [
+    "pages",
+    "paragraphs",
+    "tables",
+    "key_value_pairs",
+    "styles",
+    "languages",
+    "documents",
+]
+"""The lists of an AnalyzeResult concatenated when stitching."""
+
+
+def rebase(value: Any, offset: int, page_map: dict[int, int]) -> Any:
+    """
+    Shift the span offsets and renumber the pages of (part of) the dictionary
+    of an AnalyzeResult, in place.
+
+    :param value: The dictionary, or any value within it.
+    :param offset: The amount added to every span offset.
+    :param page_map: The new page number of each page number to change.
+    :return: The value.
+    """
+    if isinstance(value, list):
+        for item in value:
+            rebase(item, offset, page_map)
+    elif isinstance(value, dict):
+        if "offset" in value and "length" in value:
+            value["offset"] += offset
+        if "page_number" in value:
+            value["page_number"] = page_map.get(
+                value["page_number"], value["page_number"]
+            )
+        for item in value.values():
+            if isinstance(item, (list, dict)):
+                rebase(item, offset, page_map)
+    return value
+
+
+def stitch_results(shards: list[tuple[list[int], AnalyzeResult]]) -> AnalyzeResult:
+    """
+    Merge the results of analyzing page ranges of one document into the
+    result of analyzing them at once: contents are joined with a newline,
+    span offsets shifted accordingly and lists concatenated in page order.
+    A shard whose pages are numbered from 1 rather than by their page in the
+    document is renumbered.
+
+    :param shards: The page numbers requested and the result, of each shard.
+    :return: The stitched result.
+    """
+    shards = sorted(shards, key=lambda shard: shard[0][0])
+    merged: dict[str, Any] = {}
+    content: list[str] = []
+    offset = 0
+
+    for pages, result in shards:
+        data = result.to_dict()
+        numbers = sorted(page["page_number"] for page in data.get("pages") or [])
+        page_map = {}
+        if numbers != pages[: len(numbers)]:
+            page_map = dict(zip(numbers, pages))
+        rebase(data, offset, page_map)
+
+        if not merged:
+            merged = {k: v for k, v in data.items() if k not in MERGED_LISTS}
+        for key in MERGED_LISTS:
+            if data.get(key) is not None:
+                merged.setdefault(key, []).extend(data[key])
+
+        text = data.get("content") or ""
+        content.append(text)
+        offset += len(text) + 1
+
+    merged["content"] = "\n".join(content)
+    return AnalyzeResult.from_dict(merged)
@@ -3,48 +3,95 @@ Utilizes the Lagom library for dependency injection, see more at:
 
 - https://lagom-di.readthedocs.io/en/latest/
 - https://github.com/meadsteve/lagom
+
+Importing this module is kept cheap: the .env file is loaded, and services
+and their SDKs are imported, only when a dependency is first resolved.
 """
 
 import logging
 import os
+from functools import cache
+from typing import Awaitable, Callable
 
-from dotenv import load_dotenv
 from lagom import Container, dependency_definition
 
 from pdf2text.common.log_utils import set_log_level
 from pdf2text.protocols.i_azure_form_recognizer import IAzureFormRecognizer
 from pdf2text.protocols.i_azure_openai_service import IAzureOpenAIService
+from pdf2text.protocols.i_metrics import IMetrics
 from pdf2text.protocols.i_openai_content_evaluator import IOpenAIContentEvaluator
 
-load_dotenv(dotenv_path=".env")
+
+@cache
+def load_env() -> None:
+    """Load the .env file into the environment, once."""
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=".env")
 
 
 container = Container()
 """The top level DI container for our application."""
 
+_async_resources: list[Callable[[], Awaitable[None]]] = []
+"""aclose hooks of the singletons resolved so far, in resolution order."""
+
+
+async def aclose() -> None:
+    """Close the long-lived clients owned by the resolved singletons."""
+    while _async_resources:
+        await _async_resources.pop()()
+
 
 # Register our dependencies ------------------------------------------------------------
 
 
 @dependency_definition(container, singleton=True)
 def logger() -> logging.Logger:
+    load_env()
     log_level = os.getenv("LOG_LEVEL", "ERROR")
     if log_level not in ["ERROR", "WARNING", "INFO", "DEBUG"]:
         log_level = "ERROR"
     return set_log_level(log_level)  # type: ignore
 
 
+@dependency_definition(container, singleton=True)
+def metrics() -> IMetrics:
+    load_env()
+    from pdf2text.services.metrics import Metrics, MetricsEnv, create_sinks
+
+    svc = Metrics(sinks=create_sinks(container[MetricsEnv]))
+    _async_resources.append(svc.aclose)
+    return svc
+
+
 @dependency_definition(container, singleton=True)
 def azure_form_recognizer() -> IAzureFormRecognizer:
+    load_env()
     from pdf2text.services.azure_form_recognizer import (
         AzureFormRecognizer,
     )
+    from pdf2text.services.cached_form_recognizer import (
+        CachedAzureFormRecognizer,
+        CachedAzureFormRecognizerEnv,
+    )
+
+    # resolved once: the cache wraps this instance rather than building its own
+    inner = container[AzureFormRecognizer]
+    cache_env = container[CachedAzureFormRecognizerEnv]
+    svc: IAzureFormRecognizer = inner
+    if cache_env.azure_form_recognizer_cache_dir:
+        svc = CachedAzureFormRecognizer(
+            inner=inner, env=cache_env, logger=container[logging.Logger]
+        )
 
-    return container[AzureFormRecognizer]
+    _async_resources.append(svc.aclose)
+    return svc
 
 
 @dependency_definition(container, singleton=True)
 def openai_content_evaluator() -> IOpenAIContentEvaluator:
+    load_env()
     from pdf2text.services.openai_content_evaluator import (
         OpenAIContentEvaluator,
     )
@@ -54,6 +101,21 @@ def openai_content_evaluator() -> IOpenAIContentEvaluator:
 
 @dependency_definition(container, singleton=True)
 def azure_openai_service() -> IAzureOpenAIService:
+    load_env()
     from pdf2text.services.azure_openai_service import AzureOpenAIService
+    from pdf2text.services.cached_openai_service import (
+        CachedAzureOpenAIService,
+        CachedAzureOpenAIServiceEnv,
+    )
 
-    return container[AzureOpenAIService]
+    # resolved once: the cache wraps this instance rather than building its own
+    inner = container[AzureOpenAIService]
+    cache_env = container[CachedAzureOpenAIServiceEnv]
+    svc: IAzureOpenAIService = inner
+    if cache_env.azure_openai_cache_enabled:
+        svc = CachedAzureOpenAIService(
+            inner=inner, env=cache_env, logger=container[logging.Logger]
+        )
+
+    _async_resources.append(svc.aclose)
+    return svc
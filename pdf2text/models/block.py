@@ -0,0 +1,15 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class Block(BaseModel):
+    kind: Literal["paragraph", "heading", "table"]
+    page: int
+    offset: int
+    length: int
+    content: str
+    role: str | None = None
+    bbox: tuple[float, float, float, float] | None = None
+    headers: list[str] | None = None
+    rows: list[list[str]] | None = None
@@ -0,0 +1,14 @@
+from azure.ai.formrecognizer import AnalyzeResult
+from pydantic import BaseModel, ConfigDict
+
+
+class DocumentAnalysis(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    path: str
+    result: AnalyzeResult | None = None
+    error: Exception | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
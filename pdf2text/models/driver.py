@@ -13,3 +13,31 @@ class Driver(BaseModel):
 
 class Drivers(BaseModel):
     drivers: list[Driver]
+
+    @classmethod
+    def merge(cls, items: list["Drivers"]) -> "Drivers":
+        """
+        Merge the drivers extracted from several chunks of a document. Drivers
+        are matched by name and cars by model and engine, ignoring case and
+        surrounding whitespace; the first spelling seen is kept.
+
+        :param items: The drivers extracted from each chunk, in document order.
+        :return: The merged drivers.
+        """
+        merged: dict[str, Driver] = {}
+        seen_cars: dict[str, set[tuple[str, str]]] = {}
+
+        for item in items:
+            for driver in item.drivers:
+                key = driver.name.strip().lower()
+                if key not in merged:
+                    merged[key] = Driver(name=driver.name, cars=[])
+                    seen_cars[key] = set()
+
+                for car in driver.cars:
+                    car_key = (car.model.strip().lower(), car.engine.strip().lower())
+                    if car_key not in seen_cars[key]:
+                        seen_cars[key].add(car_key)
+                        merged[key].cars.append(car)
+
+        return cls(drivers=list(merged.values()))
@@ -10,3 +10,9 @@ class LLMResponse(BaseModel):
 
     def token_usages(self) -> int:
         return 0 if self.usages is None else sum(*[list(self.usages.values())])
+
+
+class LLMResponseDelta(BaseModel):
+    content: str | None
+    finish_reason: str | None = None
+    usages: dict[str, Any] | None = None
@@ -0,0 +1,14 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ManifestEntry(BaseModel):
+    path: str
+    # None when the file could not be read
+    size: int | None
+    mtime_ns: int | None
+    status: Literal["done", "failed"]
+    output: str | None = None
+    error: str | None = None
+    options: dict[str, str] = Field(default_factory=dict)
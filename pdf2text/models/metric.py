@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+
+
+class Metric(BaseModel):
+    name: str
+    value: float
+    labels: dict[str, str] = Field(default_factory=dict)
+    timestamp: float
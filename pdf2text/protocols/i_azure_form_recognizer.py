@@ -1,15 +1,57 @@
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Protocol
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Protocol
+
+if TYPE_CHECKING:
+    from azure.ai.formrecognizer import AnalyzeResult
 
-from azure.ai.formrecognizer import AnalyzeResult
+    from pdf2text.models.document_analysis import DocumentAnalysis
 
 
 class IAzureFormRecognizer(Protocol):
-    async def analyze_document(self, path: str | Path) -> AnalyzeResult:
+    async def analyze_document(
+        self, path: str | Path, pages: str | None = None
+    ) -> AnalyzeResult:
         """
         Analyze a document using Azure Form Recognizer.
 
         :param path: The file path to the document to be analyzed.
+        :param pages: The 1-based page numbers to analyze, e.g. "1-3,5", all
+            pages if None. Page numbers in the result are those of the file.
         :return: An AnalyzeResult object containing the analysis results.
         """
         ...
+
+    async def analyze_documents(
+        self, paths: Iterable[str | Path], max_concurrency: int = 4
+    ) -> list[DocumentAnalysis]:
+        """
+        Analyze a batch of documents concurrently over a shared client.
+
+        :param paths: The file paths to the documents to be analyzed.
+        :param max_concurrency: The maximum number of in-flight analyze requests.
+        :return: One DocumentAnalysis per path, in input order. A failed
+            document carries its error instead of aborting the batch.
+        """
+        ...
+
+    def iter_analyze_documents(
+        self, paths: Iterable[str | Path], max_concurrency: int = 4
+    ) -> AsyncIterator[DocumentAnalysis]:
+        """
+        Analyze a batch of documents concurrently, yielding each result as it
+        completes.
+
+        :param paths: The file paths to the documents to be analyzed.
+        :param max_concurrency: The maximum number of in-flight analyze requests.
+        :return: An async iterator of DocumentAnalysis in completion order.
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """
+        Release the long-lived client, credential and session held in pooled
+        mode. This is a no-op when the service is not pooled.
+        """
+        ...
@@ -1,9 +1,12 @@
-from typing import Any, Protocol
+from __future__ import annotations
 
-from openai import AsyncAzureOpenAI
-from openai.types.chat import ChatCompletionMessageParam
+from typing import TYPE_CHECKING, Any, AsyncIterator, Protocol
 
-from pdf2text.models.llm_response import LLMResponse
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI
+    from openai.types.chat import ChatCompletionMessageParam
+
+    from pdf2text.models.llm_response import LLMResponse, LLMResponseDelta
 
 
 class IAzureOpenAIService(Protocol):
@@ -15,6 +18,12 @@ class IAzureOpenAIService(Protocol):
         """
         ...
 
+    async def aclose(self) -> None:
+        """
+        Close the underlying client and its connection pool.
+        """
+        ...
+
     def get_deployed_model_name(self) -> str:
         """
         Get the name of the deployed model.
@@ -56,3 +65,19 @@ class IAzureOpenAIService(Protocol):
         :return: The parsed response.
         """
         ...
+
+    def chat_completion_stream(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float = 1.0,
+    ) -> AsyncIterator[LLMResponseDelta]:
+        """
+        Perform a streamed chat completion, checking content safety as the
+        filter annotations arrive.
+
+        :param messages: The messages to send in the chat completion.
+        :param temperature: The temperature for the completion.
+        :return: An async iterator of content deltas, ending with a delta
+            without content that carries the finish reason and token usages.
+        """
+        ...
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from pdf2text.models.metric import Metric
+
+
+class IMetricsSink(Protocol):
+    def emit(self, metric: Metric) -> None:
+        """
+        Receive a recorded metric.
+
+        :param metric: The metric.
+        """
+        ...
+
+    def close(self) -> None:
+        """
+        Flush and release the resources held by the sink.
+        """
+        ...
+
+
+class IMetrics(Protocol):
+    def record(self, name: str, value: float, **labels: str) -> None:
+        """
+        Record a metric, labelled with the current document if any.
+
+        :param name: The metric name, ending with its unit, e.g.
+            `stage_duration_seconds`.
+        :param value: The value.
+        :param labels: Labels describing the measurement.
+        """
+        ...
+
+    def timer(self, stage: str, **labels: str) -> AbstractContextManager[None]:
+        """
+        Time the enclosed block as `stage_duration_seconds`, labelled with the
+        stage and whether the block raised.
+
+        :param stage: The pipeline stage, e.g. `parse`.
+        :param labels: Additional labels.
+        :return: A context manager timing its block.
+        """
+        ...
+
+    def record_usage(self, usages: dict[str, Any], **labels: str) -> None:
+        """
+        Record the token counts of an LLM response as `llm_tokens`, one metric
+        per kind of token.
+
+        :param usages: The usages of an LLMResponse.
+        :param labels: Labels describing the call.
+        """
+        ...
+
+    def document(self, path: str | Path) -> AbstractContextManager[None]:
+        """
+        Label the metrics recorded in the enclosed block, including those of
+        tasks started in it, with the document they were recorded for.
+
+        :param path: The document path.
+        :return: A context manager scoping the label.
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """
+        Flush and close the sinks.
+        """
+        ...
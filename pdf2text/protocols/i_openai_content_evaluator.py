@@ -1,6 +1,9 @@
-from typing import Literal, Protocol
+from __future__ import annotations
 
-from openai.types.chat import ChatCompletion
+from typing import TYPE_CHECKING, Literal, Protocol
+
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletion, ChatCompletionChunk
 
 
 class ContentSafeException(Exception):
@@ -21,3 +24,18 @@ class IOpenAIContentEvaluator(Protocol):
         :raises ContentSafeException: If the content safety check fails.
         """
         ...
+
+    def content_safety_check_chunk(
+        self,
+        chunk: ChatCompletionChunk,
+        threshold: Literal["low", "medium", "high"] = "high",
+    ) -> None:
+        """
+        Perform a content safety check on the filter annotations of a streamed
+        ChatCompletionChunk.
+
+        :param chunk: The ChatCompletionChunk to check.
+        :param threshold: The severity threshold for filtering content.
+        :raises ContentSafeException: If the content safety check fails.
+        """
+        ...
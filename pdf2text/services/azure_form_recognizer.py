@@ -1,30 +1,89 @@
+import asyncio
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from logging import Logger
 from pathlib import Path
-from typing import AsyncIterator
+from typing import AsyncIterator, Iterable
 
+import aiohttp
 from azure.ai.formrecognizer import AnalyzeResult
 from azure.ai.formrecognizer.aio import DocumentAnalysisClient
+from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.identity.aio import DefaultAzureCredential
 from lagom.environment import Env
 
+from pdf2text.common.pages import format_page_ranges, parse_page_ranges
+from pdf2text.common.pdfplumber_extract import page_count
+from pdf2text.common.stitch import stitch_results
+from pdf2text.models.document_analysis import DocumentAnalysis
 from pdf2text.protocols.i_azure_form_recognizer import IAzureFormRecognizer
+from pdf2text.protocols.i_metrics import IMetrics
+from pdf2text.services.metrics import Metrics
+
+Credential = AzureKeyCredential | DefaultAzureCredential
 
 
 class AzureFormRecognizerEnv(Env):
     azure_form_recognizer_endpoint: str
+    azure_form_recognizer_api_key: str | None = None
+    azure_form_recognizer_model_id: str = "prebuilt-document"
+    azure_form_recognizer_pooled: bool = False
+    azure_form_recognizer_shard_pages: int | None = None
+    azure_form_recognizer_shard_concurrency: int = 4
 
 
 @dataclass
 class AzureFormRecognizer(IAzureFormRecognizer):
     env: AzureFormRecognizerEnv
     logger: Logger
+    metrics: IMetrics = field(default_factory=Metrics)
+
+    def __post_init__(self) -> None:
+        # pooled mode: one client, credential (with its token cache) and aiohttp
+        # session shared by every request until aclose() is called.
+        self._pooled_client: DocumentAnalysisClient | None = None
+        self._pooled_credential: Credential | None = None
+        self._pooled_session: aiohttp.ClientSession | None = None
+        self._pool_lock = asyncio.Lock()
+
+    def get_credential(self) -> Credential:
+        if self.env.azure_form_recognizer_api_key:
+            return AzureKeyCredential(self.env.azure_form_recognizer_api_key)
+        return DefaultAzureCredential()
+
+    async def close_credential(self, credential: Credential) -> None:
+        # key credentials hold no resources
+        if isinstance(credential, AzureKeyCredential):
+            return
+
+        try:
+            await credential.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing credential: {e}")
+
+    async def get_pooled_client(self) -> DocumentAnalysisClient:
+        async with self._pool_lock:
+            if self._pooled_client is None:
+                self._pooled_session = aiohttp.ClientSession()
+                self._pooled_credential = self.get_credential()
+                self._pooled_client = DocumentAnalysisClient(
+                    self.env.azure_form_recognizer_endpoint,
+                    credential=self._pooled_credential,  # type: ignore
+                    transport=AioHttpTransport(
+                        session=self._pooled_session, session_owner=False
+                    ),
+                )
+            return self._pooled_client
 
     @asynccontextmanager
     async def get_client(self) -> AsyncIterator[DocumentAnalysisClient]:
+        if self.env.azure_form_recognizer_pooled:
+            yield await self.get_pooled_client()
+            return
+
         client: DocumentAnalysisClient | None = None
-        credential = DefaultAzureCredential()
+        credential = self.get_credential()
 
         try:
             client = DocumentAnalysisClient(
@@ -39,17 +98,146 @@ class AzureFormRecognizer(IAzureFormRecognizer):
                 except Exception as e:
                     self.logger.warning(f"Error closing client: {e}")
 
+            await self.close_credential(credential)
+
+    async def aclose(self) -> None:
+        async with self._pool_lock:
+            client = self._pooled_client
+            credential = self._pooled_credential
+            session = self._pooled_session
+            self._pooled_client = None
+            self._pooled_credential = None
+            self._pooled_session = None
+
+        if client is not None:
+            try:
+                await client.close()  # type: ignore
+            except Exception as e:
+                self.logger.warning(f"Error closing client: {e}")
+
+        if credential is not None:
+            await self.close_credential(credential)
+
+        if session is not None:
             try:
-                await credential.close()
+                await session.close()
             except Exception as e:
-                self.logger.warning(f"Error closing credential: {e}")
+                self.logger.warning(f"Error closing session: {e}")
+
+    def shards(self, path: str | Path, pages: str | None) -> list[list[int]] | None:
+        """
+        Split the pages to analyze into shards of at most
+        AZURE_FORM_RECOGNIZER_SHARD_PAGES pages.
+
+        :param path: The file path to the document.
+        :param pages: The pages to analyze, all pages if None.
+        :return: The page numbers of each shard, or None when the document is
+            analyzed in a single request.
+        """
+        size = self.env.azure_form_recognizer_shard_pages
+        if not size:
+            return None
+
+        if pages:
+            numbers = parse_page_ranges(pages)
+        elif Path(path).suffix.lower() == ".pdf":
+            numbers = list(range(1, page_count(path) + 1))
+        else:
+            return None
+
+        if len(numbers) <= size:
+            return None
+        return [numbers[i : i + size] for i in range(0, len(numbers), size)]
 
-    async def analyze_document(self, path: str | Path) -> AnalyzeResult:
+    async def analyze_pages(
+        self, client: DocumentAnalysisClient, document: bytes, pages: str | None
+    ) -> AnalyzeResult:
+        with self.metrics.timer("analyze_submit"):
+            poller = await client.begin_analyze_document(
+                model_id=self.env.azure_form_recognizer_model_id,
+                document=document,
+                pages=pages,
+            )
+
+        with self.metrics.timer("poll_wait"):
+            return await poller.result()
+
+    async def analyze_with_client(
+        self, client: DocumentAnalysisClient, path: str | Path, pages: str | None = None
+    ) -> AnalyzeResult:
+        with self.metrics.document(path):
+            # the transport closes a file body once sent, so a retried request
+            # (e.g. after a 429) must be given the bytes to send again
+            with self.metrics.timer("file_read"), open(path, "rb") as f:
+                document = f.read()
+
+            shards = await asyncio.to_thread(self.shards, path, pages)
+            if shards is None:
+                return await self.analyze_pages(client, document, pages)
+
+            # page-range jobs of a large document run concurrently, each
+            # uploading the document and analyzing only its pages
+            self.logger.debug(f"analyzing {path} in {len(shards)} shards")
+            semaphore = asyncio.Semaphore(
+                self.env.azure_form_recognizer_shard_concurrency
+            )
+
+            async def analyze_shard(
+                numbers: list[int],
+            ) -> tuple[list[int], AnalyzeResult]:
+                async with semaphore:
+                    shard_pages = format_page_ranges(numbers)
+                    return numbers, await self.analyze_pages(
+                        client, document, shard_pages
+                    )
+
+            results = await asyncio.gather(*[analyze_shard(n) for n in shards])
+            with self.metrics.timer("stitch"):
+                return stitch_results(list(results))
+
+    async def analyze_document(
+        self, path: str | Path, pages: str | None = None
+    ) -> AnalyzeResult:
         async with self.get_client() as client:
-            with open(path, "rb") as f:
-                # The service call is asynchronous
-                poller = await client.begin_analyze_document(
-                    model_id="prebuilt-document", document=f
-                )
+            return await self.analyze_with_client(client, path, pages)
 
-                return await poller.result()
+    async def analyze_guarded(
+        self,
+        client: DocumentAnalysisClient,
+        path: str | Path,
+        semaphore: asyncio.Semaphore,
+    ) -> DocumentAnalysis:
+        # throttled (429) responses are retried by the client's retry policy,
+        # which honors Retry-After; the semaphore caps in-flight requests.
+        async with semaphore:
+            try:
+                result = await self.analyze_with_client(client, path)
+                return DocumentAnalysis(path=str(path), result=result)
+            except Exception as e:
+                self.logger.warning(f"Error analyzing document {path}: {e}")
+                return DocumentAnalysis(path=str(path), error=e)
+
+    async def analyze_documents(
+        self, paths: Iterable[str | Path], max_concurrency: int = 4
+    ) -> list[DocumentAnalysis]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with self.get_client() as client:
+            return await asyncio.gather(
+                *[self.analyze_guarded(client, path, semaphore) for path in paths]
+            )
+
+    async def iter_analyze_documents(
+        self, paths: Iterable[str | Path], max_concurrency: int = 4
+    ) -> AsyncIterator[DocumentAnalysis]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with self.get_client() as client:
+            tasks = [
+                asyncio.create_task(self.analyze_guarded(client, path, semaphore))
+                for path in paths
+            ]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
@@ -1,20 +1,34 @@
-from dataclasses import dataclass
+import asyncio
+import random
+from dataclasses import dataclass, field
 from logging import Logger
-from typing import Any, Callable
+from typing import Any, AsyncIterator, Awaitable, Callable
 
+import httpx
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from lagom.environment import Env
-from openai import AsyncAzureOpenAI
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncAzureOpenAI,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    RateLimitError,
+)
 from openai.types.chat import (
     ChatCompletion,
     ChatCompletionMessageParam,
 )
 
-from pdf2text.models.llm_response import LLMResponse
+from pdf2text.common.chunking import estimate_tokens
+from pdf2text.common.rate_limiter import RateLimiter
+from pdf2text.models.llm_response import LLMResponse, LLMResponseDelta
 from pdf2text.protocols.i_azure_openai_service import (
     IAzureOpenAIService,
 )
+from pdf2text.protocols.i_metrics import IMetrics
 from pdf2text.protocols.i_openai_content_evaluator import IOpenAIContentEvaluator
+from pdf2text.services.metrics import Metrics
 
 
 class AzureOpenAIServiceEnv(Env):
@@ -22,6 +36,14 @@ class AzureOpenAIServiceEnv(Env):
     azure_openai_api_key: str | None = None
     azure_openai_api_version: str
     azure_openai_deployed_model_name: str
+    azure_openai_max_connections: int = 100
+    azure_openai_max_keepalive_connections: int = 20
+    azure_openai_keepalive_expiry: float = 30.0
+    azure_openai_requests_per_minute: int | None = None
+    azure_openai_tokens_per_minute: int | None = None
+    azure_openai_max_retries: int = 5
+    azure_openai_backoff_base: float = 1.0
+    azure_openai_backoff_max: float = 60.0
 
 
 @dataclass
@@ -33,27 +55,55 @@ class AzureOpenAIService(IAzureOpenAIService):
     env: AzureOpenAIServiceEnv
     content_safety_eval: IOpenAIContentEvaluator
     logger: Logger
+    metrics: IMetrics = field(default_factory=Metrics)
 
     def __post_init__(self) -> None:
+        self._token_provider: Callable[[], str] | None = None
+        # one client (and httpx connection pool) for the lifetime of the service
         self.client = self.get_client()
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=self.env.azure_openai_requests_per_minute,
+            tokens_per_minute=self.env.azure_openai_tokens_per_minute,
+        )
 
     def get_openai_auth_key(self) -> dict[str, str | Callable[[], str]]:
         if self.env.azure_openai_api_key:
             return {"api_key": self.env.azure_openai_api_key}
 
-        token_provider = get_bearer_token_provider(
-            DefaultAzureCredential(), "https://cognitiveservices.azure.com/.default"
-        )
+        if self._token_provider is None:
+            # the provider caches the token and only refreshes it near expiry
+            self._token_provider = get_bearer_token_provider(
+                DefaultAzureCredential(),
+                "https://cognitiveservices.azure.com/.default",
+            )
 
-        return {"azure_ad_token_provider": token_provider}
+        return {"azure_ad_token_provider": self._token_provider}
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        return DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.env.azure_openai_max_connections,
+                max_keepalive_connections=self.env.azure_openai_max_keepalive_connections,
+                keepalive_expiry=self.env.azure_openai_keepalive_expiry,
+            )
+        )
 
     def get_client(self) -> AsyncAzureOpenAI:
         return AsyncAzureOpenAI(
             azure_endpoint=self.env.azure_openai_endpoint,
             api_version=self.env.azure_openai_api_version,
+            http_client=self.get_http_client(),
+            # retries are handled by request, in step with the rate limiter
+            max_retries=0,
             **self.get_openai_auth_key(),  # type: ignore
         )
 
+    async def aclose(self) -> None:
+        try:
+            await self.client.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing client: {e}")
+
     def get_deployed_model_name(self) -> str:
         return self.env.azure_openai_deployed_model_name
 
@@ -79,6 +129,80 @@ class AzureOpenAIService(IAzureOpenAIService):
             )
         return results
 
+    def retry_delay(self, error: Exception, attempt: int) -> float:
+        if isinstance(error, APIStatusError):
+            headers = error.response.headers
+            try:
+                if "retry-after-ms" in headers:
+                    return float(headers["retry-after-ms"]) / 1000
+                if "retry-after" in headers:
+                    return float(headers["retry-after"])
+            except ValueError:
+                pass
+
+        # exponential backoff with full jitter
+        cap = min(
+            self.env.azure_openai_backoff_max,
+            self.env.azure_openai_backoff_base * 2**attempt,
+        )
+        return random.uniform(0, cap)
+
+    def estimate_request_tokens(
+        self, messages: list[ChatCompletionMessageParam]
+    ) -> int:
+        tokens = 0
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str):
+                tokens += estimate_tokens(content)
+        return tokens
+
+    async def call_with_retry[T](
+        self, name: str, reserved: int, create: Callable[[], Awaitable[T]]
+    ) -> T:
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(reserved)
+            try:
+                return await create()
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                self.rate_limiter.record(reserved, 0)
+                if attempt >= self.env.azure_openai_max_retries:
+                    raise
+
+                self.metrics.record("llm_retries", 1, call=name, error=type(e).__name__)
+                delay = self.retry_delay(e, attempt)
+                if isinstance(e, RateLimitError):
+                    # hold back every caller, not only this one
+                    self.rate_limiter.pause(delay)
+                self.logger.warning(
+                    f"[RETRY] {name} {type(e).__name__}, retrying in {delay:.2f}s"
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+            except Exception:
+                self.rate_limiter.record(reserved, 0)
+                raise
+
+    async def request(
+        self,
+        name: str,
+        messages: list[ChatCompletionMessageParam],
+        create: Callable[[], Awaitable[ChatCompletion]],
+        num_generations: int,
+    ) -> list[LLMResponse]:
+        reserved = self.estimate_request_tokens(messages)
+        with self.metrics.timer("llm_call", call=name):
+            response = await self.call_with_retry(name, reserved, create)
+
+        try:
+            return self.collection_results(response, num_generations)
+        finally:
+            # the tokens are used even when the content safety check fails
+            usages = response.usage.model_dump() if response.usage else {}
+            self.metrics.record_usage(usages, call=name)
+            self.rate_limiter.record(reserved, usages.get("total_tokens", reserved))
+
     async def chat_completion(
         self,
         messages: list[ChatCompletionMessageParam],
@@ -87,16 +211,20 @@ class AzureOpenAIService(IAzureOpenAIService):
     ) -> list[LLMResponse]:
         self.logger.debug("[BEGIN] chat_completion")
 
-        self.client = self.get_client()
-        response = await self.client.chat.completions.create(
-            model=self.env.azure_openai_deployed_model_name,
-            messages=messages,
-            temperature=temperature,
-            n=num_generations,
+        results = await self.request(
+            "chat_completion",
+            messages,
+            lambda: self.client.chat.completions.create(
+                model=self.env.azure_openai_deployed_model_name,
+                messages=messages,
+                temperature=temperature,
+                n=num_generations,
+            ),
+            num_generations,
         )
 
         self.logger.debug("[COMPLETED] chat_completion")
-        return self.collection_results(response, num_generations)
+        return results
 
     async def chat_completion_with_format(
         self,
@@ -107,14 +235,68 @@ class AzureOpenAIService(IAzureOpenAIService):
     ) -> list[LLMResponse]:
         self.logger.debug("[BEGIN] chat_completion_with_format")
 
-        self.client = self.get_client()
-        responses = await self.client.chat.completions.parse(
-            model=self.env.azure_openai_deployed_model_name,
-            messages=messages,
-            response_format=response_format,
-            temperature=temperature,
-            n=num_generations,
+        results = await self.request(
+            "chat_completion_with_format",
+            messages,
+            lambda: self.client.chat.completions.parse(
+                model=self.env.azure_openai_deployed_model_name,
+                messages=messages,
+                response_format=response_format,
+                temperature=temperature,
+                n=num_generations,
+            ),
+            num_generations,
         )
 
         self.logger.debug("[COMPLETED] chat_completion_with_format")
-        return self.collection_results(responses, num_generations)
+        return results
+
+    async def chat_completion_stream(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float = 1.0,
+    ) -> AsyncIterator[LLMResponseDelta]:
+        self.logger.debug("[BEGIN] chat_completion_stream")
+
+        reserved = self.estimate_request_tokens(messages)
+        finish_reason: str | None = None
+        usages: dict[str, Any] = {}
+
+        # timed until the last chunk has been received
+        with self.metrics.timer("llm_call", call="chat_completion_stream"):
+            stream = await self.call_with_retry(
+                "chat_completion_stream",
+                reserved,
+                lambda: self.client.chat.completions.create(
+                    model=self.env.azure_openai_deployed_model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ),
+            )
+
+            try:
+                async for chunk in stream:
+                    self.content_safety_eval.content_safety_check_chunk(chunk)
+
+                    if chunk.usage:
+                        usages = {
+                            k: v
+                            for k, v in chunk.usage.model_dump().items()
+                            if isinstance(v, int)
+                        }
+                    for choice in chunk.choices:
+                        if choice.finish_reason:
+                            finish_reason = choice.finish_reason
+                        if choice.delta and choice.delta.content:
+                            yield LLMResponseDelta(content=choice.delta.content)
+            finally:
+                await stream.close()
+                self.metrics.record_usage(usages, call="chat_completion_stream")
+                self.rate_limiter.record(reserved, usages.get("total_tokens", reserved))
+
+        self.logger.debug("[COMPLETED] chat_completion_stream")
+        yield LLMResponseDelta(
+            content=None, finish_reason=finish_reason or "stop", usages=usages
+        )
@@ -0,0 +1,261 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import AsyncIterator, Iterable
+
+from azure.ai.formrecognizer import AnalyzeResult
+from lagom.environment import Env
+
+from pdf2text.models.document_analysis import DocumentAnalysis
+from pdf2text.protocols.i_azure_form_recognizer import IAzureFormRecognizer
+from pdf2text.services.azure_form_recognizer import AzureFormRecognizer
+
+
+class CachedAzureFormRecognizerEnv(Env):
+    # caching is off while the directory is not set
+    azure_form_recognizer_cache_dir: str = ""
+    azure_form_recognizer_cache_max_bytes: int = 1024 * 1024 * 1024
+    azure_form_recognizer_cache_ttl_seconds: float = 7 * 24 * 60 * 60
+
+
+@dataclass
+class CachedAzureFormRecognizer(IAzureFormRecognizer):
+    """
+    Caches AnalyzeResults of the wrapped AzureFormRecognizer on local disk,
+    keyed by the SHA-256 of the file bytes and the model id. Entries are
+    gzipped JSON, expire after the TTL and are evicted least recently used
+    first once the cache grows past its size limit.
+    """
+
+    inner: AzureFormRecognizer
+    env: CachedAzureFormRecognizerEnv
+    logger: Logger
+
+    def __post_init__(self) -> None:
+        # total size of the entries, scanned on the first store and then
+        # kept up to date until the next eviction rescans the directory
+        self._size: int | None = None
+        self._size_lock = threading.Lock()
+
+    @property
+    def cache_dir(self) -> Path:
+        return Path(self.env.azure_form_recognizer_cache_dir)
+
+    def cache_key(self, path: str | Path, pages: str | None = None) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+
+        model_id = self.inner.env.azure_form_recognizer_model_id
+        key = f"{model_id}:{digest.hexdigest()}"
+        if pages is not None:
+            key = f"{key}:{pages}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json.gz"
+
+    def load(self, key: str) -> AnalyzeResult | None:
+        entry = self.entry_path(key)
+        try:
+            with gzip.open(entry, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Error reading cache entry {entry.name}: {e}")
+            self.discard(entry)
+            return None
+
+        ttl = self.env.azure_form_recognizer_cache_ttl_seconds
+        if time.time() - data["created"] > ttl:
+            self.discard(entry)
+            return None
+
+        # mtime tracks the last use, for LRU eviction
+        os.utime(entry)
+        return AnalyzeResult.from_dict(data["result"])
+
+    def discard(self, entry: Path) -> None:
+        """
+        Remove a cache entry, keeping the tracked cache size up to date.
+
+        :param entry: The path of the entry.
+        """
+        with self._size_lock:
+            try:
+                size = entry.stat().st_size
+                entry.unlink()
+            except FileNotFoundError:
+                return
+            if self._size is not None:
+                self._size -= size
+
+    def lookup_path(self, path: str | Path) -> tuple[str | None, AnalyzeResult | None]:
+        """
+        :param path: The path of the document.
+        :return: The cache key of the document and its cached result, if any.
+            The key is None when the file cannot be read, leaving the error to
+            be reported by the analysis.
+        """
+        try:
+            key = self.cache_key(path)
+        except OSError as e:
+            self.logger.debug(f"cache skipped: {path}: {e}")
+            return None, None
+        return key, self.load(key)
+
+    def store(self, key: str, result: AnalyzeResult) -> None:
+        entry = self.entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        # a unique temporary file, so that concurrent stores do not collide
+        with tempfile.NamedTemporaryFile(
+            dir=entry.parent, suffix=".tmp", delete=False
+        ) as tmp:
+            try:
+                with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                    json.dump({"created": time.time(), "result": result.to_dict()}, f)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+
+        size = os.stat(tmp.name).st_size
+        with self._size_lock:
+            replaced = entry.stat().st_size if entry.exists() else 0
+            os.replace(tmp.name, entry)
+            if self._size is None:
+                self._size = self.scan_size()
+            else:
+                self._size += size - replaced
+            if self._size > self.env.azure_form_recognizer_cache_max_bytes:
+                self.evict()
+
+    def scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self.cache_dir.glob("*/*.json.gz"))
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache is below 90%
+        of its size limit, so that the directory is not rescanned on every
+        store once it is full.
+        """
+        entries = [(p, p.stat()) for p in self.cache_dir.glob("*/*.json.gz")]
+        total = sum(stat.st_size for _, stat in entries)
+        target = self.env.azure_form_recognizer_cache_max_bytes * 0.9
+        for entry, stat in sorted(entries, key=lambda e: e[1].st_mtime):
+            if total <= target:
+                break
+            entry.unlink(missing_ok=True)
+            total -= stat.st_size
+        self._size = total
+
+    async def analyze_document(
+        self, path: str | Path, pages: str | None = None
+    ) -> AnalyzeResult:
+        key = await asyncio.to_thread(self.cache_key, path, pages)
+        result = await asyncio.to_thread(self.load, key)
+        if result is not None:
+            self.logger.debug(f"cache hit: {path}")
+            return result
+
+        self.logger.debug(f"cache miss: {path}")
+        result = await self.inner.analyze_document(path, pages)
+        await asyncio.to_thread(self.store, key, result)
+        return result
+
+    async def lookup(
+        self, paths: Iterable[str | Path], max_concurrency: int = 4
+    ) -> AsyncIterator[tuple[str, str | None, AnalyzeResult | None]]:
+        """
+        Hash and look up the documents in worker threads, taking the paths
+        one at a time as lookups complete.
+
+        :param paths: The paths of the documents.
+        :param max_concurrency: The maximum number of lookups in flight.
+        :return: An async iterator of the path, the cache key (None when the
+            file cannot be read) and the cached result, if any, of each
+            document, in completion order.
+        """
+        pending: set[asyncio.Task] = set()
+
+        async def find(path: str) -> tuple[str, str | None, AnalyzeResult | None]:
+            return path, *await asyncio.to_thread(self.lookup_path, path)
+
+        try:
+            for path in paths:
+                pending.add(asyncio.create_task(find(str(path))))
+                if len(pending) < max_concurrency:
+                    continue
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def remember(self, item: DocumentAnalysis, key: str | None) -> None:
+        if item.result is not None and key is not None:
+            await asyncio.to_thread(self.store, key, item.result)
+
+    async def analyze_documents(
+        self, paths: Iterable[str | Path], max_concurrency: int = 4
+    ) -> list[DocumentAnalysis]:
+        paths = [str(p) for p in paths]
+        hits: dict[str, AnalyzeResult] = {}
+        keys: dict[str, str | None] = {}
+        async for path, key, result in self.lookup(paths, max_concurrency):
+            if result is None:
+                keys[path] = key
+            else:
+                hits[path] = result
+
+        # the misses in input order
+        misses = {p: keys[p] for p in paths if p in keys}
+        analyzed: dict[str, DocumentAnalysis] = {}
+        for item in await self.inner.analyze_documents(misses, max_concurrency):
+            await self.remember(item, misses[item.path])
+            analyzed[item.path] = item
+
+        return [
+            DocumentAnalysis(path=p, result=hits[p]) if p in hits else analyzed[p]
+            for p in paths
+        ]
+
+    async def iter_analyze_documents(
+        self, paths: Iterable[str | Path], max_concurrency: int = 4
+    ) -> AsyncIterator[DocumentAnalysis]:
+        # hits are yielded as soon as they are found, the misses are then
+        # analyzed together over the shared client of the inner service
+        misses: dict[str, str | None] = {}
+        async for path, key, result in self.lookup(paths, max_concurrency):
+            if result is None:
+                misses[path] = key
+            else:
+                yield DocumentAnalysis(path=path, result=result)
+
+        async for item in self.inner.iter_analyze_documents(misses, max_concurrency):
+            await self.remember(item, misses[item.path])
+            yield item
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
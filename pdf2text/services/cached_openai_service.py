@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import Logger
+from typing import Any, AsyncIterator
+
+from lagom.environment import Env
+from openai import AsyncAzureOpenAI
+from openai.types.chat import ChatCompletionMessageParam
+from pydantic import BaseModel
+
+from pdf2text.models.llm_response import LLMResponse, LLMResponseDelta
+from pdf2text.protocols.i_azure_openai_service import IAzureOpenAIService
+from pdf2text.services.azure_openai_service import AzureOpenAIService
+
+
+def copy_responses(responses: list[LLMResponse]) -> list[LLMResponse]:
+    return [r.model_copy(deep=True) for r in responses]
+
+
+class CachedAzureOpenAIServiceEnv(Env):
+    azure_openai_cache_enabled: bool = False
+    azure_openai_cache_size: int = 256
+    azure_openai_cache_db: str | None = None
+    azure_openai_cache_all_temperatures: bool = False
+
+
+@dataclass
+class CachedAzureOpenAIService(IAzureOpenAIService):
+    """
+    Caches chat completion responses of the wrapped AzureOpenAIService in an
+    in-memory LRU, optionally backed by a SQLite database. Only temperature 0
+    calls are cached unless caching of all temperatures is enabled. The
+    database is read and written in a worker thread, and callers get copies
+    of the cached responses.
+    """
+
+    inner: AzureOpenAIService
+    env: CachedAzureOpenAIServiceEnv
+    logger: Logger
+
+    def __post_init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._lru: OrderedDict[str, list[LLMResponse]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        if self.env.azure_openai_cache_db:
+            # used from the worker threads of asyncio.to_thread, one at a time
+            self._db = sqlite3.connect(
+                self.env.azure_openai_cache_db, check_same_thread=False
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def get_client(self) -> AsyncAzureOpenAI:
+        return self.inner.get_client()
+
+    def get_deployed_model_name(self) -> str:
+        return self.inner.get_deployed_model_name()
+
+    async def aclose(self) -> None:
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+        await self.inner.aclose()
+
+    def cacheable(self, temperature: float) -> bool:
+        return temperature == 0 or self.env.azure_openai_cache_all_temperatures
+
+    def cache_key(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float,
+        num_generations: int,
+        response_format: Any = None,
+    ) -> str:
+        if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+            response_format = response_format.model_json_schema()
+
+        payload = json.dumps(
+            [
+                self.get_deployed_model_name(),
+                messages,
+                temperature,
+                num_generations,
+                response_format,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> list[LLMResponse] | None:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return [LLMResponse.model_validate(r) for r in json.loads(row[0])]
+
+    def store(self, key: str, value: str) -> None:
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            self._db.commit()
+
+    async def get(self, key: str) -> list[LLMResponse] | None:
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return self._lru[key]
+
+        responses = await asyncio.to_thread(self.load, key)
+        if responses is not None:
+            self.remember(key, responses)
+        return responses
+
+    def remember(self, key: str, responses: list[LLMResponse]) -> None:
+        self._lru[key] = responses
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.env.azure_openai_cache_size:
+            self._lru.popitem(last=False)
+
+    async def put(self, key: str, responses: list[LLMResponse]) -> None:
+        self.remember(key, copy_responses(responses))
+        if self._db is not None:
+            value = json.dumps([r.model_dump() for r in responses])
+            await asyncio.to_thread(self.store, key, value)
+
+    async def lookup(self, key: str) -> list[LLMResponse] | None:
+        responses = await self.get(key)
+        if responses is None:
+            self.misses += 1
+            self.logger.debug("[CACHE MISS] chat completion")
+            return None
+
+        self.hits += 1
+        self.logger.debug("[CACHE HIT] chat completion")
+        return copy_responses(responses)
+
+    async def chat_completion(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float = 1.0,
+        num_generations: int = 1,
+    ) -> list[LLMResponse]:
+        if not self.cacheable(temperature):
+            return await self.inner.chat_completion(
+                messages, temperature, num_generations
+            )
+
+        key = self.cache_key(messages, temperature, num_generations)
+        responses = await self.lookup(key)
+        if responses is None:
+            responses = await self.inner.chat_completion(
+                messages, temperature, num_generations
+            )
+            await self.put(key, responses)
+        return responses
+
+    async def chat_completion_with_format(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        response_format: Any,
+        temperature: float = 1.0,
+        num_generations: int = 1,
+    ) -> list[LLMResponse]:
+        if not self.cacheable(temperature):
+            return await self.inner.chat_completion_with_format(
+                messages, response_format, temperature, num_generations
+            )
+
+        key = self.cache_key(messages, temperature, num_generations, response_format)
+        responses = await self.lookup(key)
+        if responses is None:
+            responses = await self.inner.chat_completion_with_format(
+                messages, response_format, temperature, num_generations
+            )
+            await self.put(key, responses)
+        return responses
+
+    def chat_completion_stream(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float = 1.0,
+    ) -> AsyncIterator[LLMResponseDelta]:
+        # streamed completions are interactive and are not cached
+        return self.inner.chat_completion_stream(messages, temperature)
@@ -0,0 +1,68 @@
+import asyncio
+from dataclasses import dataclass, field
+from logging import Logger
+from pathlib import Path
+
+from lagom.environment import Env
+
+from pdf2text.common.form_recognizer_parse import TableFormat, iter_page_blocks
+from pdf2text.common.pages import format_page_ranges
+from pdf2text.common.pdfplumber_extract import extract_page_blocks
+from pdf2text.protocols.i_azure_form_recognizer import IAzureFormRecognizer
+from pdf2text.protocols.i_metrics import IMetrics
+from pdf2text.services.metrics import Metrics
+
+
+class HybridExtractorEnv(Env):
+    hybrid_min_chars: int = 200
+    hybrid_max_image_ratio: float = 0.5
+
+
+@dataclass
+class HybridExtractor:
+    """
+    Extracts the pages with a clean text layer locally with pdfplumber and
+    sends only the others (scans, tables with merged cells) to Form
+    Recognizer, as a single page-range request per document.
+    """
+
+    form_recognizer: IAzureFormRecognizer
+    env: HybridExtractorEnv
+    logger: Logger
+    metrics: IMetrics = field(default_factory=Metrics)
+
+    async def extract(
+        self, path: str | Path, tbl_format: TableFormat = "csv"
+    ) -> list[str]:
+        """
+        Extract the text blocks of a PDF.
+
+        :param path: The file path to the PDF.
+        :param tbl_format: The format to render tables in.
+        :return: The blocks in page order, in the format of
+            form_recognizer_parse.parse.
+        """
+        with self.metrics.document(path):
+            with self.metrics.timer("local_extract"):
+                local = await asyncio.to_thread(
+                    extract_page_blocks,
+                    path,
+                    tbl_format,
+                    self.env.hybrid_min_chars,
+                    self.env.hybrid_max_image_ratio,
+                )
+
+            blocks = {n: page for n, page in local.items() if page is not None}
+            remote = [n for n, page in local.items() if page is None]
+            self.metrics.record("pages", len(blocks), backend="pdfplumber")
+            self.metrics.record("pages", len(remote), backend="form_recognizer")
+
+            if remote:
+                pages = format_page_ranges(remote)
+                self.logger.debug(f"analyzing pages {pages} of {path}")
+                result = await self.form_recognizer.analyze_document(path, pages)
+                with self.metrics.timer("parse"):
+                    for page_num, block in iter_page_blocks(result, tbl_format):
+                        blocks.setdefault(page_num, []).append(block)
+
+        return [block for page_num in sorted(blocks) for block in blocks[page_num]]
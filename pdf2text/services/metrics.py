@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from lagom.environment import Env
+
+from pdf2text.models.metric import Metric
+from pdf2text.protocols.i_metrics import IMetrics, IMetricsSink
+
+_document: ContextVar[str | None] = ContextVar("document", default=None)
+
+
+class MetricsEnv(Env):
+    metrics_sinks: str = ""
+    metrics_jsonl_path: str = "metrics.jsonl"
+    metrics_prometheus_path: str = "metrics.prom"
+
+
+@dataclass
+class InMemoryMetricsSink(IMetricsSink):
+    metrics: list[Metric] = field(default_factory=list)
+
+    def emit(self, metric: Metric) -> None:
+        self.metrics.append(metric)
+
+    def close(self) -> None:
+        pass
+
+    def totals(self, name: str, by: str) -> dict[str, float]:
+        """
+        Sum the values of a metric grouped by one of its labels.
+
+        :param name: The metric name.
+        :param by: The label to group by, e.g. `document` or `stage`.
+        :return: The total per label value.
+        """
+        totals: dict[str, float] = defaultdict(float)
+        for metric in self.metrics:
+            if metric.name == name and by in metric.labels:
+                totals[metric.labels[by]] += metric.value
+        return dict(totals)
+
+
+@dataclass
+class JsonLinesMetricsSink(IMetricsSink):
+    """
+    Appends every metric to a file as a line of JSON.
+    """
+
+    path: str | Path
+
+    def __post_init__(self) -> None:
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def emit(self, metric: Metric) -> None:
+        with self._lock:
+            self._file.write(metric.model_dump_json() + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class PrometheusMetricsSink(IMetricsSink):
+    """
+    Aggregates metrics for the Prometheus text exposition format: metrics
+    named `*_seconds` become summaries (sum and count), the others counters.
+    The document label is dropped to keep the number of series bounded.
+
+    :param path: The file the exposition is written to on close, e.g. for
+        the node exporter textfile collector.
+    """
+
+    path: str | Path | None = None
+    prefix: str = "pdf2text"
+    excluded_labels: frozenset[str] = frozenset({"document"})
+
+    def __post_init__(self) -> None:
+        self._sums: dict[str, dict[tuple[tuple[str, str], ...], float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self._counts: dict[str, dict[tuple[tuple[str, str], ...], int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self._lock = threading.Lock()
+
+    def emit(self, metric: Metric) -> None:
+        labels = tuple(
+            sorted(
+                (k, v)
+                for k, v in metric.labels.items()
+                if k not in self.excluded_labels
+            )
+        )
+        with self._lock:
+            self._sums[metric.name][labels] += metric.value
+            self._counts[metric.name][labels] += 1
+
+    def exposition(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._sums):
+                summary = name.endswith("_seconds")
+                series = f"{self.prefix}_{name}"
+                if summary:
+                    lines.append(f"# TYPE {series} summary")
+                else:
+                    series = f"{series}_total"
+                    lines.append(f"# TYPE {series} counter")
+
+                for labels, total in sorted(self._sums[name].items()):
+                    text = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels)
+                    text = f"{{{text}}}" if text else ""
+                    if summary:
+                        lines.append(f"{series}_sum{text} {total}")
+                        lines.append(
+                            f"{series}_count{text} {self._counts[name][labels]}"
+                        )
+                    else:
+                        lines.append(f"{series}{text} {total}")
+
+        return "".join(f"{line}\n" for line in lines)
+
+    def close(self) -> None:
+        if self.path is not None:
+            Path(self.path).write_text(self.exposition(), encoding="utf-8")
+
+
+@dataclass
+class Metrics(IMetrics):
+    """
+    Records pipeline metrics to pluggable sinks. No sink is configured by
+    default, which makes recording a no-op.
+    """
+
+    sinks: list[IMetricsSink] = field(default_factory=list)
+
+    def record(self, name: str, value: float, **labels: str) -> None:
+        if not self.sinks:
+            return
+
+        document = _document.get()
+        if document is not None:
+            labels.setdefault("document", document)
+
+        metric = Metric(name=name, value=value, labels=labels, timestamp=time.time())
+        for sink in self.sinks:
+            sink.emit(metric)
+
+    @contextmanager
+    def timer(self, stage: str, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            yield
+            status = "ok"
+        finally:
+            self.record(
+                "stage_duration_seconds",
+                time.perf_counter() - start,
+                stage=stage,
+                status=status,
+                **labels,
+            )
+
+    def record_usage(self, usages: dict[str, Any], **labels: str) -> None:
+        for kind, count in usages.items():
+            if isinstance(count, int):
+                self.record("llm_tokens", count, kind=kind, **labels)
+
+    @contextmanager
+    def document(self, path: str | Path) -> Iterator[None]:
+        token = _document.set(str(path))
+        try:
+            yield
+        finally:
+            _document.reset(token)
+
+    async def aclose(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+def create_sinks(env: MetricsEnv) -> list[IMetricsSink]:
+    """
+    Create the sinks named in METRICS_SINKS, a comma-separated list of
+    `memory`, `jsonl` and `prometheus`.
+
+    :param env: The metrics environment.
+    :return: The sinks, in the order named.
+    """
+    sinks: list[IMetricsSink] = []
+    for name in filter(None, (s.strip().lower() for s in env.metrics_sinks.split(","))):
+        if name == "memory":
+            sinks.append(InMemoryMetricsSink())
+        elif name == "jsonl":
+            sinks.append(JsonLinesMetricsSink(env.metrics_jsonl_path))
+        elif name == "prometheus":
+            sinks.append(PrometheusMetricsSink(env.metrics_prometheus_path))
+        else:
+            raise ValueError(f"Unknown metrics sink: {name}")
+    return sinks
@@ -4,6 +4,7 @@ from typing import Any, Literal
 
 from openai.types.chat import (
     ChatCompletion,
+    ChatCompletionChunk,
 )
 
 from pdf2text.protocols.i_openai_content_evaluator import (
@@ -44,6 +45,22 @@ class OpenAIContentEvaluator(IOpenAIContentEvaluator):
                     f"Content safety check failed. Category: {k}."
                 )
 
+    def check_prompt_filter_results(
+        self, response: Any, threshold: Literal["low", "medium", "high"]
+    ) -> None:
+        if getattr(response, "prompt_filter_results", None):
+            item: dict[str, Any] = response.prompt_filter_results[0]
+
+            if "content_filter_results" in item and item["content_filter_results"]:
+                self.validate(item["content_filter_results"], threshold)
+
+    def check_choices(
+        self, choices: list[Any], threshold: Literal["low", "medium", "high"]
+    ) -> None:
+        for choice in choices:
+            if "content_filter_results" in (choice.model_extra or {}):
+                self.validate(choice.model_extra["content_filter_results"], threshold)
+
     def content_safety_check(
         self,
         response: ChatCompletion,
@@ -51,16 +68,18 @@ class OpenAIContentEvaluator(IOpenAIContentEvaluator):
     ) -> None:
         self.logger.debug("[BEGIN] content_safety_check")
         if response.prompt_filter_results:  # type: ignore
-            item: dict[str, Any] = response.prompt_filter_results[0]  # type: ignore
-
-            if "content_filter_results" in item and item["content_filter_results"]:
-                self.validate(item["content_filter_results"], threshold)  # type: ignore
+            self.check_prompt_filter_results(response, threshold)
 
             if response.choices:
-                for choice in response.choices:
-                    if "content_filter_results" in choice.model_extra:  # type: ignore
-                        self.validate(
-                            choice.model_extra["content_filter_results"],  # type: ignore
-                            threshold,
-                        )  # type: ignore
+                self.check_choices(response.choices, threshold)
         self.logger.debug("[COMPLETED] content_safety_check")
+
+    def content_safety_check_chunk(
+        self,
+        chunk: ChatCompletionChunk,
+        threshold: Literal["low", "medium", "high"] = "high",
+    ) -> None:
+        # Azure sends the prompt annotations in a chunk of their own and the
+        # completion annotations alongside the content deltas they cover.
+        self.check_prompt_filter_results(chunk, threshold)
+        self.check_choices(chunk.choices, threshold)
@@ -0,0 +1,9 @@
+from benchmarks.memory import measure
+
+
+def test_table_cells_hold_less_than_table_data() -> None:
+    sizes = measure(rows=200, columns=10)
+
+    held, peak = sizes["TableCells"]
+    assert 0 < held <= peak
+    assert held < sizes["TableData"][0] / 2
@@ -0,0 +1,104 @@
+import logging
+
+import pytest
+
+from benchmarks.load_test import LoadReport, load_form_recognizer, load_openai
+from benchmarks.mock_servers import MockConfig, MockFormRecognizer, MockOpenAI, serve
+from benchmarks.run import sample_pdf
+from pdf2text.common.form_recognizer_parse import parse
+from pdf2text.protocols.i_openai_content_evaluator import ContentSafeException
+from pdf2text.services.azure_form_recognizer import (
+    AzureFormRecognizer,
+    AzureFormRecognizerEnv,
+)
+from pdf2text.services.azure_openai_service import (
+    AzureOpenAIService,
+    AzureOpenAIServiceEnv,
+)
+from pdf2text.services.openai_content_evaluator import OpenAIContentEvaluator
+
+
+def test_load_report_percentile() -> None:
+    report = LoadReport(elapsed=2.0, latencies=[i / 100 for i in range(1, 101)])
+
+    assert report.throughput == 50.0
+    assert report.percentile(50) == pytest.approx(0.505)
+    assert report.percentile(99) == pytest.approx(0.9901)
+    assert LoadReport().percentile(50) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_load_form_recognizer_retries_throttled() -> None:
+    server = MockFormRecognizer(MockConfig(throttle_rate=0.3, polls=2, seed=3))
+
+    report = await load_form_recognizer(server, requests=10, concurrency=4)
+
+    assert len(report.latencies) == 10
+    assert not report.errors
+    assert server.stats.throttled > 0
+    assert server.stats.requests == 10 + server.stats.throttled
+
+
+@pytest.mark.asyncio
+async def test_form_recognizer_sharded_matches_single_request() -> None:
+    server = MockFormRecognizer(MockConfig(pages=5, polls=0))
+    async with serve(server.app()) as url:
+        env = AzureFormRecognizerEnv(
+            azure_form_recognizer_endpoint=url,
+            azure_form_recognizer_api_key="mock",
+        )
+        service = AzureFormRecognizer(env=env, logger=logging.getLogger("test"))
+        single = await service.analyze_document(sample_pdf, "1-5")
+        env.azure_form_recognizer_shard_pages = 2
+        sharded = await service.analyze_document(sample_pdf, "1-5")
+
+    assert server.stats.requests == 1 + 3
+    assert sharded.to_dict() == single.to_dict()
+    assert parse(sharded) == parse(single)
+
+
+@pytest.mark.asyncio
+async def test_load_openai() -> None:
+    server = MockOpenAI(MockConfig(throttle_rate=0.2, content_filter_rate=0.2, seed=7))
+
+    report = await load_openai(server, requests=30, concurrency=5)
+
+    assert server.stats.throttled > 0
+    assert report.errors == {"ContentSafeException": server.stats.filtered}
+    assert len(report.latencies) == 30 - server.stats.filtered
+
+
+@pytest.mark.asyncio
+async def test_openai_stream() -> None:
+    server = MockOpenAI(MockConfig(reply="one two three"))
+    async with serve(server.app()) as url:
+        logger = logging.getLogger("test")
+        service = AzureOpenAIService(
+            env=AzureOpenAIServiceEnv(
+                azure_openai_endpoint=url,
+                azure_openai_api_key="mock",
+                azure_openai_api_version="2024-10-21",
+                azure_openai_deployed_model_name="mock",
+            ),
+            content_safety_eval=OpenAIContentEvaluator(logger=logger),
+            logger=logger,
+        )
+        deltas = [
+            d
+            async for d in service.chat_completion_stream(
+                [{"role": "user", "content": "hello"}]
+            )
+        ]
+
+        assert "".join(d.content or "" for d in deltas) == "one two three"
+        assert deltas[-1].finish_reason == "stop"
+        assert (deltas[-1].usages or {})["total_tokens"] > 0
+
+        server.config.content_filter_rate = 1.0
+        with pytest.raises(ContentSafeException):
+            async for _ in service.chat_completion_stream(
+                [{"role": "user", "content": "hello"}]
+            ):
+                pass
+
+        await service.aclose()
@@ -0,0 +1,20 @@
+from benchmarks.synthetic import make_analyze_result
+from pdf2text.common.form_recognizer_parse import format_table, parse
+
+
+def test_make_analyze_result() -> None:
+    result = make_analyze_result(
+        pages=3, paragraphs_per_page=4, tables_per_page=2, rows=5, columns=3
+    )
+
+    assert result.tables is not None
+    assert len(result.tables) == 6
+    tbl_data = format_table(result.tables[0])
+    assert tbl_data.headers == ["H0", "H1", "H2"]
+    assert tbl_data.rows[0] == ["R1C0-0", "R1C1-0", "R1C2-0"]
+    assert list(tbl_data.span_offsets) == [1]
+
+    # page numbers are dropped and each table is rendered once
+    blocks = parse(result)
+    assert len(blocks) == 3 * (4 + 2)
+    assert sum(block.startswith("\nH0,H1,H2\n") for block in blocks) == 6
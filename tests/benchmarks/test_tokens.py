@@ -0,0 +1,17 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.tokens import main
+
+data_doc = (
+    Path(__file__).parent.parent / "pdf2text/common/data/form_recognizer_doc.json"
+)
+
+
+def test_main(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main([str(data_doc)]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-1].split() == ["form_recognizer_doc.json", "grid", "50", "1.00x"]
+    assert len(lines) == 2 + 5
@@ -0,0 +1,173 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from pdf2text.common.batch import MANIFEST_NAME, Manifest, discover, run_batch
+
+
+@pytest.fixture
+def input_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "in"
+    (root / "sub").mkdir(parents=True)
+    for name in ["a.pdf", "sub/b.PDF", "sub/c.txt"]:
+        (root / name).write_text(name)
+    return root
+
+
+def test_discover(input_dir: Path) -> None:
+    files = list(
+        discover(
+            [
+                str(input_dir),
+                str(input_dir / "sub" / "*.txt"),
+                str(input_dir / "a.pdf"),
+            ]
+        )
+    )
+
+    assert [(p.relative_to(input_dir), r) for p, r in files] == [
+        (Path("a.pdf"), Path("a.pdf")),
+        (Path("sub/b.PDF"), Path("sub/b.PDF")),
+        (Path("sub/c.txt"), Path("c.txt")),
+    ]
+
+
+def test_discover_missing(input_dir: Path, tmp_path: Path) -> None:
+    files = discover([str(input_dir), str(tmp_path / "missing")])
+
+    # the inputs are expanded lazily, as the files are consumed
+    assert next(files)[1] == Path("a.pdf")
+    assert next(files)[1] == Path("sub/b.PDF")
+    with pytest.raises(FileNotFoundError):
+        next(files)
+
+
+def test_discover_collisions(tmp_path: Path) -> None:
+    for name in ["a/r.pdf", "b/r.pdf", "c/b/r.PDF", "c/b/r.txt"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(name)
+
+    files = discover(
+        [
+            str(tmp_path / "a"),
+            str(tmp_path / "b" / "r.pdf"),
+            str(tmp_path / "c"),
+            str(tmp_path / "c" / "b" / "*.txt"),
+        ]
+    )
+
+    assert [(p.relative_to(tmp_path), r) for p, r in files] == [
+        (Path("a/r.pdf"), Path("r.pdf")),
+        (Path("b/r.pdf"), Path("b/r.pdf")),
+        (Path("c/b/r.PDF"), Path("c/b/r.PDF")),
+        (Path("c/b/r.txt"), Path("b/r-2.txt")),
+    ]
+
+
+def test_manifest(tmp_path: Path) -> None:
+    path = tmp_path / "doc.pdf"
+    path.write_text("x")
+    manifest = Manifest(tmp_path / "out" / MANIFEST_NAME)
+    manifest.record(path, path.stat(), output=tmp_path / "doc.txt")
+    manifest.close()
+
+    # a line torn by a crash is ignored
+    with open(manifest.path, "a") as f:
+        f.write('{"path": "/torn')
+
+    resumed = Manifest(manifest.path)
+    assert resumed.is_done(path, path.stat())
+
+    # done with other options
+    other = Manifest(manifest.path, options={"output_format": "jsonl"})
+    assert not other.is_done(path, path.stat())
+    other.close()
+
+    path.write_text("changed")
+    assert not resumed.is_done(path, path.stat())
+    resumed.close()
+
+
+@pytest.mark.asyncio
+async def test_run_batch_resumes(input_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+    extracted: list[str] = []
+
+    async def extract(path: Path) -> str:
+        if path.name == "b.PDF" and not extracted.count("retry"):
+            extracted.append("retry")
+            raise ValueError("extract error")
+        extracted.append(path.name)
+        return f"text of {path.name}"
+
+    manifest = Manifest(output_dir / MANIFEST_NAME)
+    summary = await run_batch(
+        discover([str(input_dir)]), extract, output_dir, manifest, MagicMock()
+    )
+    manifest.close()
+
+    assert (summary.done, summary.skipped, summary.failed) == (1, 0, 1)
+    assert (output_dir / "a.txt").read_text() == "text of a.pdf"
+    assert not (output_dir / "sub" / "b.txt").exists()
+
+    # the done file is skipped, the failed one retried
+    manifest = Manifest(output_dir / MANIFEST_NAME)
+    summary = await run_batch(
+        discover([str(input_dir)]), extract, output_dir, manifest, MagicMock()
+    )
+    manifest.close()
+
+    assert (summary.done, summary.skipped, summary.failed) == (1, 1, 0)
+    assert (output_dir / "sub" / "b.txt").read_text() == "text of b.PDF"
+    assert extracted == ["a.pdf", "retry", "b.PDF"]
+
+
+@pytest.mark.asyncio
+async def test_run_batch_workers(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="workers must be at least 1"):
+        await run_batch([], MagicMock(), tmp_path, MagicMock(), MagicMock(), workers=0)
+
+
+@pytest.mark.asyncio
+async def test_run_batch_unreadable(input_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+
+    async def extract(path: Path) -> str:
+        return f"text of {path.name}"
+
+    files = [
+        (input_dir / "missing.pdf", Path("missing.pdf")),
+        (input_dir / "a.pdf", Path("a.pdf")),
+    ]
+    manifest = Manifest(output_dir / MANIFEST_NAME)
+    summary = await run_batch(files, extract, output_dir, manifest, MagicMock())
+    manifest.close()
+
+    assert (summary.done, summary.skipped, summary.failed) == (1, 0, 1)
+    assert (output_dir / "a.txt").read_text() == "text of a.pdf"
+    entry = manifest.entries[Manifest.key(input_dir / "missing.pdf")]
+    assert entry.status == "failed"
+    assert entry.error and entry.error.startswith("FileNotFoundError")
+
+
+@pytest.mark.asyncio
+async def test_run_batch_discovery_error(input_dir: Path, tmp_path: Path) -> None:
+    output_dir = tmp_path / "out"
+    logger = MagicMock()
+
+    async def extract(path: Path) -> str:
+        return f"text of {path.name}"
+
+    manifest = Manifest(output_dir / MANIFEST_NAME)
+    summary = await run_batch(
+        discover([str(input_dir), str(tmp_path / "missing")]),
+        extract,
+        output_dir,
+        manifest,
+        logger,
+    )
+    manifest.close()
+
+    assert (summary.done, summary.skipped, summary.failed) == (2, 0, 1)
+    logger.error.assert_called_once()
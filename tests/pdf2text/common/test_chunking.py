@@ -0,0 +1,43 @@
+import pytest
+
+from pdf2text.common.chunking import chunk_blocks, estimate_tokens
+
+
+def test_estimate_tokens() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_chunk_blocks() -> None:
+    blocks = ["a" * 8, "b" * 8, "c" * 8, "d" * 8]
+
+    # every block is 2 tokens + 1 for its newline
+    assert chunk_blocks(blocks, max_tokens=6) == [
+        f"{'a' * 8}\n{'b' * 8}",
+        f"{'c' * 8}\n{'d' * 8}",
+    ]
+    assert chunk_blocks(blocks, max_tokens=100) == ["\n".join(blocks)]
+
+
+def test_chunk_blocks_keeps_large_blocks_whole() -> None:
+    table = "\n+----+\n| H1 |\n+====+\n| R1 |\n+----+\n"
+    blocks = ["before", table, "after"]
+
+    assert chunk_blocks(blocks, max_tokens=3) == ["before", table, "after"]
+
+
+def test_chunk_blocks_custom_counter() -> None:
+    blocks = ["one two", "three", "four five six"]
+
+    chunks = chunk_blocks(
+        blocks, max_tokens=5, count_tokens=lambda text: len(text.split())
+    )
+    assert chunks == ["one two\nthree", "four five six"]
+
+
+def test_chunk_blocks_empty() -> None:
+    assert chunk_blocks([], max_tokens=10) == []
+
+    with pytest.raises(ValueError, match="max_tokens must be at least 1"):
+        chunk_blocks(["a"], max_tokens=0)
@@ -1,18 +1,25 @@
 import json
+from array import array
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
-from azure.ai.formrecognizer import (
-    AnalyzeResult,
-)
+from azure.ai.formrecognizer import AnalyzeResult, DocumentTable
 from tabulate import tabulate
 
 from pdf2text.common.form_recognizer_parse import (
+    TABLE_FORMATS,
+    TableCells,
     TableData,
+    TableIndex,
+    TableView,
     format_table,
+    group_continued_tables,
     in_table,
+    iter_blocks,
+    iter_parse,
     parse,
+    table_token_counts,
 )
 
 current_path = Path(__file__).parent
@@ -66,6 +73,29 @@ def test_table_data_to_grid() -> None:
     )
 
 
+def test_table_data_to_markdown() -> None:
+    tbl_data = TableData(
+        rows=[["A|1", "B\n1"], ["A2"], []],
+        headers=["HeaderA", "HeaderB"],
+        span_offsets={},
+    )
+
+    assert tbl_data.to_markdown() == (
+        "\n| HeaderA | HeaderB |\n| --- | --- |\n| A\\|1 | B 1 |\n| A2 |  |\n"
+    )
+    assert TableData(rows=[], span_offsets={}).to_markdown() == "\n\n"
+
+
+def test_table_data_to_tsv() -> None:
+    tbl_data = TableData(
+        rows=[["A\t1", "B1"], ["A2"], []],
+        headers=["HeaderA", "HeaderB"],
+        span_offsets={},
+    )
+
+    assert tbl_data.to_tsv() == "\nHeaderA\tHeaderB\nA 1\tB1\nA2\t\n\n"
+
+
 @patch.object(TableData, "to_json")
 @patch.object(TableData, "to_csv")
 @patch.object(TableData, "to_grid")
@@ -113,6 +143,147 @@ def test_format_table() -> None:
         assert data.headers == ["Column 1", "Column 2"]
         assert data.rows == [["row1 col1", "row1 col2"], ["row2 col1", "row2 col2"]]
         assert data.span_offsets == {1: [1000, 2000, 3000, 4000, 5000, 6000]}
+        assert data.span_ranges == {1: (1000, 6006)}
+
+
+def test_format_table_cells_out_of_order() -> None:
+    with open(data_doc, "r") as f:
+        result = AnalyzeResult.from_dict(json.load(f))
+    tbl = result.tables[0]  # type: ignore
+    tbl.cells.reverse()
+
+    data = format_table(tbl)
+    assert data.headers == ["Column 1", "Column 2"]
+    assert data.rows == [["row1 col1", "row1 col2"], ["row2 col1", "row2 col2"]]
+
+
+def make_table(
+    cells: list[tuple[str, int, int, str] | tuple[str, int, int, str, int, int]],
+    row_count: int,
+    column_count: int,
+) -> DocumentTable:
+    return DocumentTable.from_dict(
+        {
+            "row_count": row_count,
+            "column_count": column_count,
+            "bounding_regions": [{"page_number": 1, "polygon": []}],
+            "spans": [],
+            "cells": [
+                {
+                    "kind": kind,
+                    "row_index": row,
+                    "column_index": col,
+                    "row_span": span[0] if span else 1,
+                    "column_span": span[1] if span else 1,
+                    "content": content,
+                    "bounding_regions": [{"page_number": 1, "polygon": []}],
+                    "spans": [{"offset": i * 10, "length": len(content)}],
+                }
+                for i, (kind, row, col, content, *span) in enumerate(cells)
+            ],
+        }
+    )
+
+
+def test_format_table_merged_cells() -> None:
+    tbl = make_table(
+        [
+            ("stubHead", 0, 0, "Region", 2, 1),
+            ("columnHeader", 0, 1, "Revenue", 1, 2),
+            ("columnHeader", 1, 1, "2023"),
+            ("columnHeader", 1, 2, "2024"),
+            ("rowHeader", 2, 0, "Europe", 2, 1),
+            ("content", 2, 1, "1"),
+            ("content", 2, 2, "2"),
+            ("content", 3, 2, "4"),
+            ("content", 3, 1, "3"),
+            ("content", 4, 0, "Total", 1, 3),
+        ],
+        row_count=5,
+        column_count=3,
+    )
+
+    data = format_table(tbl)
+    assert data.headers == ["Region", "Revenue / 2023", "Revenue / 2024"]
+    assert data.rows == [
+        ["Europe", "1", "2"],
+        ["Europe", "3", "4"],
+        ["Total", "Total", "Total"],
+    ]
+    assert data.to_csv() == (
+        "\nRegion,Revenue / 2023,Revenue / 2024\n"
+        "Europe,1,2\nEurope,3,4\nTotal,Total,Total\n\n"
+    )
+
+
+def test_format_table_sparse_and_repeated_headers() -> None:
+    tbl = make_table(
+        [
+            ("columnHeader", 0, 0, "A"),
+            ("columnHeader", 0, 1, "B"),
+            ("content", 1, 1, "b1"),
+            ("columnHeader", 2, 0, "A"),
+            ("columnHeader", 2, 1, "B"),
+            ("content", 3, 0, "a3"),
+            ("content", 3, 5, "outside"),
+        ],
+        row_count=4,
+        column_count=2,
+    )
+
+    data = format_table(tbl)
+    assert data.headers == ["A", "B"]
+    assert data.rows == [["", "b1"], ["A", "B"], ["a3", ""]]
+
+
+def test_format_table_without_headers() -> None:
+    tbl = make_table(
+        [
+            ("content", 0, 0, "a"),
+            ("content", 0, 1, "b"),
+            ("content", 1, 0, "c"),
+            ("content", 1, 1, "d"),
+        ],
+        row_count=2,
+        column_count=2,
+    )
+
+    data = format_table(tbl)
+    assert data.headers == ["a", "b"]
+    assert data.rows == [["c", "d"]]
+
+
+def test_table_cells_to_model() -> None:
+    with open(data_doc, "r") as f:
+        result = AnalyzeResult.from_dict(json.load(f))
+
+    data = format_table(result.tables[0])  # type: ignore
+    model = data.to_model()
+    assert isinstance(model, TableData)
+    assert model.rows == data.rows
+    assert model.span_offsets == data.span_offsets
+    for fmt in TABLE_FORMATS:
+        assert data.format_output(fmt) == model.format_output(fmt)
+
+
+def test_table_cells_padded_rows() -> None:
+    data = TableCells(
+        headers=["HeaderA", "HeaderB"],
+        cells=["A1", "B1", "A2"],
+        row_ends=array("I", [2, 3, 3]),
+    )
+
+    # the trailing empty row is dropped on every call, not just the first
+    assert data.padded_rows("") == [["A1", "B1"], ["A2", ""]]
+    assert data.to_csv() == "\nHeaderA,HeaderB\nA1,B1\nA2,\n\n"
+
+    data.headers = ["HeaderA"]
+    with pytest.raises(ValueError, match="1 columns passed, passed data had 2"):
+        data.to_json()
+
+    data.clear()
+    assert data.rows == []
+    assert data.to_json() == "\n[]\n"
 
 
 def test_format_table_err() -> None:
@@ -156,6 +327,30 @@ def test_in_table() -> None:
     assert result_tbl is None
 
 
+def test_in_table_range() -> None:
+    tbl1 = TableData(
+        headers=["H1"],
+        rows=[["R1C1"]],
+        span_offsets={1: [100, 150]},
+        span_ranges={1: (100, 160)},
+    )
+    tbl2 = TableData(
+        headers=["H2"],
+        rows=[["R2C1"]],
+        span_offsets={1: [300, 320], 2: [10]},
+    )
+    index = TableIndex.build([tbl2, tbl1])
+
+    assert in_table(1, 100, index) == tbl1
+    assert in_table(1, 155, index) == tbl1
+    assert in_table(1, 160, index) is None
+    assert in_table(1, 99, index) is None
+    assert in_table(1, 310, index) == tbl2
+    assert in_table(1, 321, index) is None
+    assert in_table(2, 10, index) == tbl2
+    assert in_table(3, 10, index) is None
+
+
 def test_parse() -> None:
     with open(data_doc, "r") as f:
         tbl_json = json.load(f)
@@ -169,3 +364,234 @@ def test_parse() -> None:
             "\nColumn 1,Column 2\nrow1 col1,row1 col2\nrow2 col1,row2 col2\n\n",
             "after table content",
         ]
+
+
+def test_iter_parse() -> None:
+    with open(data_doc, "r") as f:
+        result = AnalyzeResult.from_dict(json.load(f))
+
+    blocks = iter_parse(result, tbl_format="json")
+    assert next(blocks) == "content 1"
+    assert next(blocks) == "content 2"
+    assert next(blocks) == (
+        '\n[{"Column 1": "row1 col1", "Column 2": "row1 col2"}, '
+        '{"Column 1": "row2 col1", "Column 2": "row2 col2"}]\n'
+    )
+    assert list(blocks) == ["after table content"]
+    assert list(iter_parse(result, tbl_format="grid")) == parse(result, "grid")
+
+
+def test_iter_parse_no_tables() -> None:
+    with open(data_doc, "r") as f:
+        result = AnalyzeResult.from_dict(json.load(f))
+    result.tables = None  # type: ignore
+
+    assert "row1 col1" in list(iter_parse(result))
+
+
+def test_table_data_pads_short_rows() -> None:
+    tbl_data = TableData(
+        rows=[["A1", "B1"], ["A2"], []],
+        headers=["HeaderA", "HeaderB"],
+        span_offsets={},
+    )
+
+    assert tbl_data.to_csv() == "\nHeaderA,HeaderB\nA1,B1\nA2,\n\n"
+    assert tbl_data.records() == [
+        {"HeaderA": "A1", "HeaderB": "B1"},
+        {"HeaderA": "A2", "HeaderB": None},
+    ]
+
+
+def test_table_data_csv_quoting() -> None:
+    tbl_data = TableData(
+        rows=[["a,b", 'say "hi"']],
+        headers=["H,1", "H2"],
+        span_offsets={},
+    )
+
+    assert tbl_data.to_csv() == '\n"H,1",H2\n"a,b","say ""hi"""\n\n'
+
+
+def test_table_data_too_wide() -> None:
+    tbl_data = TableData(
+        rows=[["A1", "B1", "C1"]],
+        headers=["HeaderA", "HeaderB"],
+        span_offsets={},
+    )
+
+    with pytest.raises(ValueError, match="2 columns passed, passed data had 3"):
+        tbl_data.to_json()
+
+
+def test_table_data_without_columns() -> None:
+    tbl_data = TableData(rows=[[], [], []], span_offsets={})
+
+    assert tbl_data.to_csv() == "\n\n\n\n\n"
+    assert tbl_data.to_json() == "\n[]\n"
+
+
+def test_table_data_to_dataframe() -> None:
+    pytest.importorskip("pandas")
+    tbl_data = TableData(
+        rows=[["A1", "B1"], ["A2", "B2"], []],
+        headers=["HeaderA", "HeaderB"],
+        span_offsets={},
+    )
+
+    df = tbl_data.to_dataframe()
+    assert list(df.columns) == ["HeaderA", "HeaderB"]
+    assert df.values.tolist() == [["A1", "B1"], ["A2", "B2"]]
+
+
+def make_split_result(
+    repeat_headers: bool = True, between: str | None = None, columns: int = 2
+) -> AnalyzeResult:
+    # a table with two rows on page 1 continued by a table with one row on
+    # page 2, separated by a page number and optionally a paragraph
+    paragraphs: list[dict] = []
+    tables: list[dict] = []
+    offset = 0
+
+    def add(page_num: int, content: str, role: str | None = None) -> dict:
+        nonlocal offset
+        paragraphs.append(
+            {
+                "role": role,
+                "content": content,
+                "bounding_regions": [{"page_number": page_num, "polygon": []}],
+                "spans": [{"offset": offset, "length": len(content)}],
+            }
+        )
+        offset += len(content) + 1
+        return paragraphs[-1]
+
+    def add_table(page_num: int, rows: list[list[str]], headers: bool) -> None:
+        start = offset
+        cells = [
+            {
+                "kind": "columnHeader" if headers and r == 0 else "content",
+                "row_index": r,
+                "column_index": c,
+                "content": content,
+                **{k: v for k, v in add(page_num, content).items() if k != "role"},
+            }
+            for r, row in enumerate(rows)
+            for c, content in enumerate(row)
+        ]
+        tables.append(
+            {
+                "row_count": len(rows),
+                "column_count": len(rows[0]),
+                "cells": cells,
+                "bounding_regions": [{"page_number": page_num, "polygon": []}],
+                "spans": [{"offset": start, "length": offset - start}],
+            }
+        )
+
+    add(1, "before")
+    add_table(1, [["A", "B"], ["a1", "b1"], ["a2", "b2"]], headers=True)
+    add(1, "1", role="pageNumber")
+    if between:
+        add(2, between)
+    rows = [["A", "B"]] if repeat_headers else []
+    rows.append(["a3", "b3", "c3"][:columns])
+    add_table(2, rows, headers=repeat_headers)
+    add(2, "after")
+
+    return AnalyzeResult.from_dict(
+        {
+            "content": "\n".join(p["content"] for p in paragraphs),
+            "pages": [],
+            "paragraphs": paragraphs,
+            "tables": tables,
+        }
+    )
+
+
+@pytest.mark.parametrize("repeat_headers", [True, False])
+def test_parse_stitches_continued_table(repeat_headers: bool) -> None:
+    result = make_split_result(repeat_headers=repeat_headers)
+
+    assert parse(result) == ["before", "\nA,B\na1,b1\na2,b2\na3,b3\n\n", "after"]
+    assert group_continued_tables(result.tables, result.paragraphs) == [  # type: ignore
+        result.tables
+    ]
+
+
+def test_parse_keeps_separate_tables() -> None:
+    result = make_split_result(between="Table 2")
+    assert parse(result) == [
+        "before",
+        "\nA,B\na1,b1\na2,b2\n\n",
+        "Table 2",
+        "\nA,B\na3,b3\n\n",
+        "after",
+    ]
+
+    result = make_split_result(repeat_headers=False, columns=3)
+    assert len(group_continued_tables(result.tables)) == 2  # type: ignore
+
+
+def test_format_table_with_continuation() -> None:
+    first, second = make_split_result().tables  # type: ignore
+
+    data = format_table(first, second)
+    assert data.rows == [["a1", "b1"], ["a2", "b2"], ["a3", "b3"]]
+    assert list(data.span_offsets) == [1, 2]
+
+
+def test_iter_blocks() -> None:
+    with open(data_doc, "r") as f:
+        result = AnalyzeResult.from_dict(json.load(f))
+    result.paragraphs[1].role = "title"  # type: ignore
+
+    blocks = list(iter_blocks(result))
+    assert [block.kind for block in blocks] == [
+        "heading",
+        "paragraph",
+        "table",
+        "paragraph",
+    ]
+    assert [block.content for block in blocks] == parse(result)
+    assert blocks[0].role == "title"
+
+    table = blocks[2]
+    assert (table.page, table.offset, table.length) == (1, 1000, 5006)
+    assert table.headers == ["Column 1", "Column 2"]
+    assert table.rows == [["row1 col1", "row1 col2"], ["row2 col1", "row2 col2"]]
+    assert table.bbox == (1.4526, 5.2596, 5.267, 6.5261)
+
+
+def test_iter_blocks_stitched_table() -> None:
+    blocks = list(iter_blocks(make_split_result(), tbl_format="json"))
+
+    assert [block.kind for block in blocks] == ["paragraph", "table", "paragraph"]
+    assert blocks[1].page == 1
+    assert blocks[1].rows == [["a1", "b1"], ["a2", "b2"], ["a3", "b3"]]
+    assert blocks[1].bbox is None
+
+
+def test_format_output_markdown_tsv() -> None:
+    tbl_data = TableData(rows=[["a"]], headers=["A"], span_offsets={})
+
+    assert tbl_data.format_output("markdown") == tbl_data.to_markdown()
+    assert tbl_data.format_output("tsv") == tbl_data.to_tsv()
+
+
+def test_table_token_counts() -> None:
+    counts = table_token_counts(make_split_result(), count_tokens=len)
+
+    assert list(counts) == list(TABLE_FORMATS)
+    # the split table is counted once
+    assert counts["tsv"] == len("\nA\tB\na1\tb1\na2\tb2\na3\tb3\n\n")
+    assert counts["tsv"] < counts["markdown"] < counts["grid"]
+
+
+def test_table_view_is_abstract() -> None:
+    class Incomplete(TableView):
+        def pages(self) -> list[int]:
+            return []
+
+    with pytest.raises(TypeError, match="padded_rows"):
+        Incomplete()  # type: ignore
@@ -0,0 +1,37 @@
+import io
+import json
+
+import pytest
+from pytest_mock import MockerFixture
+
+from pdf2text.common import jsonl
+from pdf2text.models.block import Block
+
+blocks = [
+    Block(kind="heading", page=1, offset=0, length=5, content="Title", role="title"),
+    Block(
+        kind="table",
+        page=2,
+        offset=10,
+        length=20,
+        content="\nA\n1\n\n",
+        bbox=(1.5, 2.0, 3.25, 4.0),
+        headers=["A"],
+        rows=[["1 — ü"]],
+    ),
+]
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_write_jsonl(mocker: MockerFixture, fast: bool) -> None:
+    if fast:
+        pytest.importorskip("orjson")
+    else:
+        mocker.patch.object(jsonl, "orjson", None)
+
+    buffer = io.BytesIO()
+    assert jsonl.write_jsonl(blocks, buffer) == 2
+
+    lines = buffer.getvalue().decode("utf-8").splitlines()
+    assert [Block.model_validate(json.loads(line)) for line in lines] == blocks
+    assert lines[1] == blocks[1].model_dump_json()
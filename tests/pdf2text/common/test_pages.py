@@ -0,0 +1,21 @@
+import pytest
+
+from pdf2text.common.pages import format_page_ranges, parse_page_ranges
+
+
+def test_format_page_ranges() -> None:
+    assert format_page_ranges([]) == ""
+    assert format_page_ranges([4]) == "4"
+    assert format_page_ranges([5, 1, 2, 3, 3, 9, 8]) == "1-3,5,8-9"
+
+
+def test_parse_page_ranges() -> None:
+    assert parse_page_ranges("4") == [4]
+    assert parse_page_ranges("5, 1-3,2,8-9") == [1, 2, 3, 5, 8, 9]
+    assert parse_page_ranges(format_page_ranges([7, 1, 2])) == [1, 2, 7]
+
+
+@pytest.mark.parametrize("pages", ["", "a", "0", "3-1", "1-2-3"])
+def test_parse_page_ranges_invalid(pages: str) -> None:
+    with pytest.raises(ValueError, match="Invalid page range"):
+        parse_page_ranges(pages)
@@ -0,0 +1,81 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pdfplumber
+import pytest
+
+from pdf2text.common.pdfplumber_extract import (
+    extract_page_blocks,
+    extract_page_range,
+    extract_text,
+    needs_analysis,
+    page_count,
+)
+
+current_path = Path(__file__).parent
+sample = (
+    current_path.parent.parent.parent / "test_data" / "ast_sci_data_tables_sample.pdf"
+)
+
+
+def serial_text() -> str:
+    text = ""
+    with pdfplumber.open(sample) as pdf:
+        for page in pdf.pages:
+            text += page.extract_text(layout=True) or ""
+    return text
+
+
+def test_page_count() -> None:
+    assert page_count(sample) == 2
+
+
+def test_extract_page_range() -> None:
+    pages = extract_page_range(sample, 1, 2)
+    assert len(pages) == 1
+    assert pages[0] in serial_text()
+
+
+def test_extract_text_serial() -> None:
+    assert extract_text(sample, max_workers=1) == serial_text()
+
+
+def test_extract_text_parallel() -> None:
+    assert extract_text(sample, max_workers=2, chunk_size=1) == serial_text()
+
+
+def test_extract_text_invalid_chunk_size() -> None:
+    with pytest.raises(ValueError, match="chunk_size must be at least 1"):
+        extract_text(sample, chunk_size=0)
+
+
+def test_needs_analysis() -> None:
+    char = {"text": "a"}
+    page = MagicMock(chars=[char] * 300, images=[], width=100, height=100)
+    assert not needs_analysis(page, min_chars=200, max_image_ratio=0.5)
+    assert needs_analysis(page, min_chars=400, max_image_ratio=0.5)
+
+    page.images = [{"x0": 0, "x1": 100, "top": 0, "bottom": 60}]
+    assert needs_analysis(page, min_chars=200, max_image_ratio=0.5)
+
+    page.images = []
+    page.chars = [char] * 280 + [{"text": "(cid:12)"}] * 20
+    assert needs_analysis(page, min_chars=200, max_image_ratio=0.5)
+
+
+def test_extract_page_blocks() -> None:
+    pages = extract_page_blocks(sample, tbl_format="csv")
+
+    # the table on page 2 has merged header cells
+    assert list(pages) == [1, 2]
+    assert pages[2] is None
+
+    blocks = pages[1]
+    assert blocks is not None
+    assert blocks[3] == "Sample Data for Data Tables"
+    table = blocks.index(
+        "\nNumber of Coils,Number of Paperclips\n"
+        '5,"3, 5, 4"\n10,"7, 8, 6"\n15,"11, 10, 12"\n20,"15, 13, 14"\n\n'
+    )
+    assert blocks[table - 1].startswith("Example 2: Electromagnets")
+    assert blocks[table + 1].startswith("Example 3: pH of Substances")
@@ -0,0 +1,70 @@
+import pytest
+
+from pdf2text.common.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket() -> None:
+    bucket = TokenBucket(per_minute=60)
+    bucket.refill(0)
+    assert bucket.wait_time(60) == 0
+
+    bucket.level = 0
+    assert bucket.wait_time(1) == 1
+    assert bucket.wait_time(600) == 60
+
+    bucket.refill(30)
+    assert bucket.level == 30
+    bucket.refill(300)
+    assert bucket.level == 60
+
+
+@pytest.mark.asyncio
+async def test_acquire_requests_per_minute() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=2, clock=clock, sleep=clock.sleep)
+
+    await limiter.acquire(0)
+    await limiter.acquire(0)
+    assert clock.sleeps == []
+
+    await limiter.acquire(0)
+    assert clock.sleeps == [30]
+
+
+@pytest.mark.asyncio
+async def test_acquire_tokens_per_minute() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+
+    await limiter.acquire(600)
+    # the request used more than it reserved
+    limiter.record(reserved=600, used=900)
+    await limiter.acquire(400)
+
+    assert clock.sleeps == [18]
+
+
+@pytest.mark.asyncio
+async def test_pause() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+
+    await limiter.acquire(100)
+    limiter.pause(5)
+    limiter.pause(2)
+    await limiter.acquire(100)
+
+    assert clock.sleeps == [5]
@@ -0,0 +1,73 @@
+from azure.ai.formrecognizer import AnalyzeResult
+
+from pdf2text.common.stitch import rebase, stitch_results
+
+
+def make_result(page_numbers: list[int], texts: list[str]) -> AnalyzeResult:
+    paragraphs = []
+    offset = 0
+    for page_num, text in zip(page_numbers, texts):
+        paragraphs.append(
+            {
+                "content": text,
+                "spans": [{"offset": offset, "length": len(text)}],
+                "bounding_regions": [{"page_number": page_num, "polygon": []}],
+            }
+        )
+        offset += len(text) + 1
+
+    return AnalyzeResult.from_dict(
+        {
+            "api_version": "2023-07-31",
+            "model_id": "prebuilt-document",
+            "content": "\n".join(texts),
+            "pages": [
+                {"page_number": n, "spans": [], "words": [], "lines": []}
+                for n in page_numbers
+            ],
+            "paragraphs": paragraphs,
+            "tables": [],
+        }
+    )
+
+
+def test_rebase() -> None:
+    value = {
+        "spans": [{"offset": 2, "length": 3}],
+        "bounding_regions": [{"page_number": 1}, {"page_number": 4}],
+    }
+
+    assert rebase(value, 10, {1: 7}) == {
+        "spans": [{"offset": 12, "length": 3}],
+        "bounding_regions": [{"page_number": 7}, {"page_number": 4}],
+    }
+
+
+def test_stitch_results() -> None:
+    shards = [
+        ([3], make_result([1], ["third"])),
+        ([1, 2], make_result([1, 2], ["first", "second"])),
+    ]
+
+    result = stitch_results(shards)
+
+    assert result.content == "first\nsecond\nthird"
+    assert result.model_id == "prebuilt-document"
+    assert [p.page_number for p in result.pages] == [1, 2, 3]
+    page_numbers = []
+    for p in result.paragraphs or []:
+        offset = p.spans[0].offset
+        assert result.content[offset : offset + p.spans[0].length] == p.content
+        assert p.bounding_regions
+        page_numbers.append(p.bounding_regions[0].page_number)
+    assert page_numbers == [1, 2, 3]
+    assert result.tables == []
+
+
+def test_stitch_results_keeps_page_numbers() -> None:
+    result = stitch_results(
+        [([1], make_result([1], ["a"])), ([5], make_result([5], ["b"]))]
+    )
+
+    assert [p.page_number for p in result.pages] == [1, 5]
+    assert result.content == "a\nb"
@@ -28,3 +28,34 @@ def test_get_drivers() -> None:
     assert len(drivers.drivers[1].cars) == 1
     assert drivers.drivers[1].cars[0].model == "Ford Mustang"
     assert drivers.drivers[1].cars[0].engine == "V8"
+
+
+def test_merge_drivers() -> None:
+    first = Drivers.model_validate(
+        {
+            "drivers": [
+                {"name": "Alice", "cars": [{"model": "BMW i3", "engine": "Electric"}]},
+                {"name": "Bob", "cars": []},
+            ]
+        }
+    )
+    second = Drivers.model_validate(
+        {
+            "drivers": [
+                {
+                    "name": " alice ",
+                    "cars": [
+                        {"model": "bmw i3", "engine": "electric"},
+                        {"model": "Tesla Model S", "engine": "Electric"},
+                    ],
+                },
+                {"name": "Carol", "cars": [{"model": "Ford Mustang", "engine": "V8"}]},
+            ]
+        }
+    )
+
+    merged = Drivers.merge([first, second])
+    assert [d.name for d in merged.drivers] == ["Alice", "Bob", "Carol"]
+    assert [c.model for c in merged.drivers[0].cars] == ["BMW i3", "Tesla Model S"]
+    assert merged.drivers[1].cars == []
+    assert Drivers.merge([]).drivers == []
@@ -7,15 +7,18 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from azure.ai.formrecognizer import AnalyzeResult
 from azure.ai.formrecognizer.aio import DocumentAnalysisClient
+from azure.core.credentials import AzureKeyCredential
 from pytest_mock import MockerFixture
 
 from pdf2text.services.azure_form_recognizer import (
     AzureFormRecognizer,
     AzureFormRecognizerEnv,
 )
+from pdf2text.services.metrics import InMemoryMetricsSink, Metrics
 
 current_path = Path(__file__).parent.parent
 data_doc = current_path / "common" / "data" / "form_recognizer_doc.json"
+sample_pdf = current_path.parent.parent / "test_data" / "ast_sci_data_tables_sample.pdf"
 
 
 @pytest.fixture
@@ -36,6 +39,89 @@ async def test_get_client(mocker: MockerFixture, mock_env: AzureFormRecognizerEn
         assert client is not None
 
 
+@pytest.mark.asyncio
+async def test_get_client_pooled(mocker: MockerFixture):
+    env = AzureFormRecognizerEnv(
+        azure_form_recognizer_endpoint="https://mock-docs.cognitiveservices.azure.com/",
+        azure_form_recognizer_pooled=True,
+    )
+    patched_client = mocker.patch(
+        "pdf2text.services.azure_form_recognizer.DocumentAnalysisClient",
+        return_value=AsyncMock(),
+    )
+    patched_cred = mocker.patch(
+        "pdf2text.services.azure_form_recognizer.DefaultAzureCredential",
+        return_value=AsyncMock(),
+    )
+    patched_session = mocker.patch(
+        "pdf2text.services.azure_form_recognizer.aiohttp.ClientSession",
+        return_value=AsyncMock(),
+    )
+    service = AzureFormRecognizer(env=env, logger=MagicMock())
+
+    async with service.get_client() as client1:  # type: ignore
+        pass
+    async with service.get_client() as client2:  # type: ignore
+        pass
+
+    client_close = patched_client.return_value.close
+    assert client1 is client2 is patched_client.return_value
+    patched_client.assert_called_once()
+    patched_cred.assert_called_once()
+    patched_session.assert_called_once()
+    client_close.assert_not_called()
+
+    await service.aclose()
+    client_close.assert_awaited_once()
+    patched_cred.return_value.close.assert_awaited_once()
+    patched_session.return_value.close.assert_awaited_once()
+
+    # closing twice is a no-op
+    await service.aclose()
+    client_close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_credential_api_key(mocker: MockerFixture):
+    env = AzureFormRecognizerEnv(
+        azure_form_recognizer_endpoint="https://mock-docs.cognitiveservices.azure.com/",
+        azure_form_recognizer_api_key="secret",
+    )
+    patched_cred = mocker.patch(
+        "pdf2text.services.azure_form_recognizer.DefaultAzureCredential"
+    )
+    service = AzureFormRecognizer(env=env, logger=MagicMock())
+
+    credential = service.get_credential()
+    assert isinstance(credential, AzureKeyCredential)
+    assert credential.key == "secret"
+    patched_cred.assert_not_called()
+
+    # closing a key credential is a no-op
+    await service.close_credential(credential)
+
+
+@pytest.mark.asyncio
+async def test_aclose_err(mocker: MockerFixture):
+    mock_logger = MagicMock(spec=Logger)
+    mock_logger.warning = MagicMock()
+    service = AzureFormRecognizer(env=MagicMock(), logger=mock_logger)
+    service._pooled_client = MagicMock(
+        close=AsyncMock(side_effect=Exception("Close error"))
+    )
+    service._pooled_credential = MagicMock(
+        close=AsyncMock(side_effect=Exception("Close error"))
+    )
+    service._pooled_session = MagicMock(
+        close=AsyncMock(side_effect=Exception("Close error"))
+    )
+
+    await service.aclose()
+    mock_logger.warning.assert_any_call("Error closing client: Close error")
+    mock_logger.warning.assert_any_call("Error closing credential: Close error")
+    mock_logger.warning.assert_any_call("Error closing session: Close error")
+
+
 @pytest.fixture
 @asynccontextmanager
 async def mock_client(mocker: MockerFixture) -> AsyncIterator[MockerFixture]:
@@ -63,7 +149,12 @@ async def test_client_close_err(mocker: MockerFixture):
         "pdf2text.services.azure_form_recognizer.DocumentAnalysisClient",
         return_value=mock_client,
     )
-    service = AzureFormRecognizer(env=MagicMock(), logger=mock_logger)
+    service = AzureFormRecognizer(
+        env=MagicMock(
+            azure_form_recognizer_pooled=False, azure_form_recognizer_api_key=None
+        ),
+        logger=mock_logger,
+    )
     async with service.get_client() as client:  # type: ignore
         assert client is not None
     mock_logger.warning.assert_called_once_with("Error closing client: Close error")
@@ -83,7 +174,12 @@ async def test_cred_close_err(mocker: MockerFixture):
         "pdf2text.services.azure_form_recognizer.DefaultAzureCredential",
         return_value=MagicMock(close=AsyncMock(side_effect=Exception("Close error"))),
     )
-    service = AzureFormRecognizer(env=MagicMock(), logger=mock_logger)
+    service = AzureFormRecognizer(
+        env=MagicMock(
+            azure_form_recognizer_pooled=False, azure_form_recognizer_api_key=None
+        ),
+        logger=mock_logger,
+    )
     async with service.get_client() as client:  # type: ignore
         assert client is not None
     mock_logger.warning.assert_called_once_with("Error closing credential: Close error")
@@ -100,3 +196,109 @@ async def test_analyze_document(
     results = await service.analyze_document("test_secret")
 
     assert results is not None
+
+
+@pytest.mark.asyncio
+async def test_analyze_document_metrics(
+    mock_env: AzureFormRecognizerEnv,
+    mocker: MockerFixture,
+    mock_client: MagicMock,
+) -> None:
+    sink = InMemoryMetricsSink()
+    service = AzureFormRecognizer(
+        env=mock_env, logger=MagicMock(), metrics=Metrics(sinks=[sink])
+    )
+    mocker.patch.object(AzureFormRecognizer, "get_client", return_value=mock_client)
+    await service.analyze_document("test_secret")
+
+    assert list(sink.totals("stage_duration_seconds", by="stage")) == [
+        "file_read",
+        "analyze_submit",
+        "poll_wait",
+    ]
+    assert set(sink.totals("stage_duration_seconds", by="document")) == {"test_secret"}
+
+
+def test_shards(mock_env: AzureFormRecognizerEnv) -> None:
+    service = AzureFormRecognizer(env=mock_env, logger=MagicMock())
+    assert service.shards("doc.pdf", "1-9") is None
+
+    mock_env.azure_form_recognizer_shard_pages = 2
+    assert service.shards("doc.pdf", "1-5") == [[1, 2], [3, 4], [5]]
+    assert service.shards("doc.pdf", "1,3") is None
+    assert service.shards("doc.png", None) is None
+    assert service.shards(sample_pdf, None) is None
+
+    mock_env.azure_form_recognizer_shard_pages = 1
+    assert service.shards(sample_pdf, None) == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_analyze_document_sharded(
+    mock_env: AzureFormRecognizerEnv,
+    mocker: MockerFixture,
+    mock_client: MagicMock,
+) -> None:
+    mock_env.azure_form_recognizer_shard_pages = 2
+    sink = InMemoryMetricsSink()
+    service = AzureFormRecognizer(
+        env=mock_env, logger=MagicMock(), metrics=Metrics(sinks=[sink])
+    )
+    mocker.patch.object(AzureFormRecognizer, "get_client", return_value=mock_client)
+    analyze_pages = mocker.patch.object(
+        service, "analyze_pages", return_value=MagicMock(spec=AnalyzeResult)
+    )
+    stitch = mocker.patch(
+        "pdf2text.services.azure_form_recognizer.stitch_results",
+        return_value="stitched",
+    )
+
+    assert await service.analyze_document("doc.pdf", "1-3,7") == "stitched"
+
+    assert [c.args[2] for c in analyze_pages.call_args_list] == ["1-2", "3,7"]
+    assert [pages for pages, _ in stitch.call_args.args[0]] == [[1, 2], [3, 7]]
+    assert "stitch" in sink.totals("stage_duration_seconds", by="stage")
+
+
+@pytest.fixture
+def batch_service(
+    mocker: MockerFixture, mock_env: AzureFormRecognizerEnv, mock_client: MagicMock
+) -> AzureFormRecognizer:
+    service = AzureFormRecognizer(env=mock_env, logger=MagicMock())
+    mocker.patch.object(AzureFormRecognizer, "get_client", return_value=mock_client)
+
+    async def analyze(client: DocumentAnalysisClient, path: str) -> AnalyzeResult:
+        if path == "bad.pdf":
+            raise ValueError("analyze error")
+        return MagicMock(spec=AnalyzeResult, path=path)
+
+    mocker.patch.object(service, "analyze_with_client", side_effect=analyze)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_analyze_documents(batch_service: AzureFormRecognizer) -> None:
+    results = await batch_service.analyze_documents(
+        ["a.pdf", "bad.pdf", "c.pdf"], max_concurrency=2
+    )
+
+    assert [r.path for r in results] == ["a.pdf", "bad.pdf", "c.pdf"]
+    assert [r.succeeded for r in results] == [True, False, True]
+    assert results[0].result.path == "a.pdf"  # type: ignore
+    assert str(results[1].error) == "analyze error"
+    batch_service.logger.warning.assert_called_once_with(  # type: ignore
+        "Error analyzing document bad.pdf: analyze error"
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_analyze_documents(batch_service: AzureFormRecognizer) -> None:
+    results = [
+        r
+        async for r in batch_service.iter_analyze_documents(
+            ["a.pdf", "bad.pdf", "c.pdf"], max_concurrency=1
+        )
+    ]
+
+    assert sorted(r.path for r in results) == ["a.pdf", "bad.pdf", "c.pdf"]
+    assert sum(not r.succeeded for r in results) == 1
@@ -1,10 +1,18 @@
 from typing import Callable
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
+from openai import APIConnectionError, RateLimitError
+from openai.types.chat import ChatCompletionChunk
 from pytest_mock import MockerFixture
 
-from pdf2text.services.azure_openai_service import AzureOpenAIService
+from pdf2text.common.rate_limiter import RateLimiter
+from pdf2text.services.azure_openai_service import (
+    AzureOpenAIService,
+    AzureOpenAIServiceEnv,
+)
+from pdf2text.services.metrics import InMemoryMetricsSink, Metrics
 
 
 @pytest.fixture
@@ -14,6 +22,9 @@ def fn_mock_service(mocker: MockerFixture) -> Callable[[bool], AzureOpenAIServic
             "pdf2text.services.azure_openai_service.AsyncAzureOpenAI",
             autospec=True,
         )
+        mocker.patch(
+            "pdf2text.services.azure_openai_service.DefaultAsyncHttpxClient",
+        )
 
         mock_cred = MagicMock()
         mock_cred.get_token.return_value = MagicMock(
@@ -26,6 +37,11 @@ def fn_mock_service(mocker: MockerFixture) -> Callable[[bool], AzureOpenAIServic
         )
 
         env = MagicMock()
+        env.azure_openai_requests_per_minute = None
+        env.azure_openai_tokens_per_minute = None
+        env.azure_openai_max_retries = 2
+        env.azure_openai_backoff_base = 0.001
+        env.azure_openai_backoff_max = 0.01
         if not with_api_key:
             env.azure_openai_api_key = None
         svc = AzureOpenAIService(
@@ -51,6 +67,47 @@ def test_get_client_without_api_key(
     assert mock_service.client is not None
 
 
+def test_get_client_reuses_token_provider(
+    fn_mock_service: Callable[[bool], AzureOpenAIService], mocker: MockerFixture
+):
+    mock_service = fn_mock_service(with_api_key=False)  # type: ignore
+    provider = mock_service.get_openai_auth_key()["azure_ad_token_provider"]
+    assert mock_service.get_openai_auth_key()["azure_ad_token_provider"] is provider
+
+
+def test_get_http_client(mocker: MockerFixture):
+    mocker.patch("pdf2text.services.azure_openai_service.AsyncAzureOpenAI")
+    env = AzureOpenAIServiceEnv(
+        azure_openai_endpoint="https://mock.openai.azure.com/",
+        azure_openai_api_key="key",
+        azure_openai_api_version="2024-10-21",
+        azure_openai_deployed_model_name="gpt-4o",
+        azure_openai_max_connections=8,
+        azure_openai_max_keepalive_connections=4,
+        azure_openai_keepalive_expiry=12.5,
+    )
+    patched_http_client = mocker.patch(
+        "pdf2text.services.azure_openai_service.DefaultAsyncHttpxClient"
+    )
+    AzureOpenAIService(env=env, content_safety_eval=MagicMock(), logger=MagicMock())
+
+    limits = patched_http_client.call_args.kwargs["limits"]
+    assert limits.max_connections == 8
+    assert limits.max_keepalive_connections == 4
+    assert limits.keepalive_expiry == 12.5
+
+
+@pytest.mark.asyncio
+async def test_aclose(fn_mock_service: Callable[[bool], AzureOpenAIService]):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+    mock_service.client.close = AsyncMock(side_effect=Exception("Close error"))
+
+    await mock_service.aclose()
+    mock_service.logger.warning.assert_called_once_with(  # type: ignore
+        "Error closing client: Close error"
+    )
+
+
 def test_get_deployed_model_name(
     fn_mock_service: Callable[[bool], AzureOpenAIService],
 ):
@@ -78,9 +135,11 @@ async def test_chat_completion(
         )
     )
     messages = [{"role": "user", "content": "Test message"}]
+    client = mock_service.client
     responses = await mock_service.chat_completion(messages)
     assert responses[0].content == "Test response"
     mock_service.content_safety_eval.content_safety_check.assert_called_once()
+    assert mock_service.client is client
 
 
 @pytest.mark.asyncio
@@ -122,3 +181,240 @@ async def test_chat_completion_with_format_err(
 
     with pytest.raises(Exception):
         await mock_service.chat_completion_with_format(messages, response_format)
+
+
+def rate_limit_error(headers: dict[str, str]) -> RateLimitError:
+    request = httpx.Request("POST", "https://mock.openai.azure.com/")
+    response = httpx.Response(429, headers=headers, request=request)
+    return RateLimitError("Too many requests", response=response, body=None)
+
+
+def test_retry_delay(fn_mock_service: Callable[[bool], AzureOpenAIService]):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+
+    assert mock_service.retry_delay(rate_limit_error({"retry-after": "3"}), 0) == 3
+    assert (
+        mock_service.retry_delay(rate_limit_error({"retry-after-ms": "250"}), 0) == 0.25
+    )
+    delay = mock_service.retry_delay(rate_limit_error({"retry-after": "soon"}), 3)
+    assert 0 <= delay <= 0.008
+    assert 0 <= mock_service.retry_delay(Exception("error"), 10) <= 0.01
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_retries(
+    fn_mock_service: Callable[[bool], AzureOpenAIService],
+):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+    mock_service.client.chat.completions = MagicMock()
+    mock_service.client.chat.completions.create = AsyncMock(
+        side_effect=[
+            rate_limit_error({"retry-after-ms": "1"}),
+            APIConnectionError(request=httpx.Request("POST", "https://mock/")),
+            MagicMock(
+                choices=[
+                    MagicMock(message=MagicMock(content="ok"), finish_reason="stop")
+                ],
+                usage=None,
+            ),
+        ]
+    )
+    messages = [{"role": "user", "content": "Test message"}]
+
+    responses = await mock_service.chat_completion(messages)  # type: ignore
+    assert responses[0].content == "ok"
+    assert mock_service.client.chat.completions.create.await_count == 3
+    assert mock_service.logger.warning.call_count == 2  # type: ignore
+    assert mock_service.rate_limiter.paused_until > 0
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_retries_exhausted(
+    fn_mock_service: Callable[[bool], AzureOpenAIService],
+):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+    mock_service.client.chat.completions = MagicMock()
+    mock_service.client.chat.completions.create = AsyncMock(
+        side_effect=rate_limit_error({"retry-after-ms": "1"})
+    )
+    messages = [{"role": "user", "content": "Test message"}]
+
+    with pytest.raises(RateLimitError):
+        await mock_service.chat_completion(messages)  # type: ignore
+    assert mock_service.client.chat.completions.create.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_records_usage_on_failure(
+    fn_mock_service: Callable[[bool], AzureOpenAIService],
+):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+    mock_service.rate_limiter = RateLimiter(tokens_per_minute=1000)
+    mock_service.client.chat.completions = MagicMock()
+    mock_service.client.chat.completions.create = AsyncMock(
+        return_value=MagicMock(
+            choices=[MagicMock(message=MagicMock(content="unsafe"))],
+            usage=MagicMock(model_dump=lambda: {"total_tokens": 7}),
+        )
+    )
+    mock_service.content_safety_eval.content_safety_check.side_effect = Exception(  # type: ignore
+        "unsafe"
+    )
+    messages = [{"role": "user", "content": "Test message"}]
+
+    with pytest.raises(Exception, match="unsafe"):
+        await mock_service.chat_completion(messages)  # type: ignore
+    assert mock_service.rate_limiter.tokens
+    assert mock_service.rate_limiter.tokens.level == 1000 - 7
+
+    # a request that fails without a response gives its reservation back
+    mock_service.client.chat.completions.create.side_effect = ValueError("bad")
+    with pytest.raises(ValueError):
+        await mock_service.chat_completion(messages)  # type: ignore
+    assert mock_service.rate_limiter.tokens.level == pytest.approx(1000 - 7, abs=1)
+
+
+def make_chunk(
+    content: str | None = None,
+    finish_reason: str | None = None,
+    usage: dict[str, int] | None = None,
+) -> ChatCompletionChunk:
+    choices = []
+    if content is not None or finish_reason is not None:
+        choices.append(
+            {
+                "index": 0,
+                "delta": {"content": content},
+                "finish_reason": finish_reason,
+                "content_filter_results": {},
+            }
+        )
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "test-model",
+            "choices": choices,
+            "usage": usage,
+        }
+    )
+
+
+class MockStream:
+    def __init__(self, chunks: list[ChatCompletionChunk]) -> None:
+        self.chunks = chunks
+        self.close = AsyncMock()
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_stream(
+    fn_mock_service: Callable[[bool], AzureOpenAIService],
+):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+    stream = MockStream(
+        [
+            make_chunk(),
+            make_chunk("Hello"),
+            make_chunk(" world"),
+            make_chunk(finish_reason="stop"),
+            make_chunk(
+                usage={"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+            ),
+        ]
+    )
+    mock_service.client.chat.completions = MagicMock()
+    mock_service.client.chat.completions.create = AsyncMock(return_value=stream)
+    messages = [{"role": "user", "content": "Test message"}]
+
+    deltas = [d async for d in mock_service.chat_completion_stream(messages)]  # type: ignore
+
+    assert [d.content for d in deltas] == ["Hello", " world", None]
+    assert deltas[-1].finish_reason == "stop"
+    assert deltas[-1].usages == {
+        "prompt_tokens": 3,
+        "completion_tokens": 2,
+        "total_tokens": 5,
+    }
+    check = mock_service.content_safety_eval.content_safety_check_chunk
+    assert check.call_count == 5  # type: ignore
+    stream.close.assert_awaited_once()
+    assert (
+        mock_service.client.chat.completions.create.call_args.kwargs["stream"] is True
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_stream_unsafe(
+    fn_mock_service: Callable[[bool], AzureOpenAIService],
+):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+    usage = {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+    stream = MockStream([make_chunk("Hello", usage=usage), make_chunk("unsafe")])
+    mock_service.rate_limiter = RateLimiter(tokens_per_minute=1000)
+    mock_service.client.chat.completions = MagicMock()
+    mock_service.client.chat.completions.create = AsyncMock(return_value=stream)
+    mock_service.content_safety_eval.content_safety_check_chunk.side_effect = [  # type: ignore
+        None,
+        Exception("unsafe"),
+    ]
+    messages = [{"role": "user", "content": "Test message"}]
+
+    deltas = []
+    with pytest.raises(Exception, match="unsafe"):
+        async for delta in mock_service.chat_completion_stream(messages):  # type: ignore
+            deltas.append(delta.content)
+
+    assert deltas == ["Hello"]
+    stream.close.assert_awaited_once()
+    assert mock_service.rate_limiter.tokens
+    assert mock_service.rate_limiter.tokens.level == 1000 - 5
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_metrics(
+    fn_mock_service: Callable[[bool], AzureOpenAIService],
+):
+    mock_service = fn_mock_service(with_api_key=True)  # type: ignore
+    sink = InMemoryMetricsSink()
+    mock_service.metrics = Metrics(sinks=[sink])
+    mock_service.client.chat.completions = MagicMock()
+    mock_service.client.chat.completions.create = AsyncMock(
+        side_effect=[
+            rate_limit_error({"retry-after-ms": "1"}),
+            MagicMock(
+                choices=[
+                    MagicMock(message=MagicMock(content="ok"), finish_reason="stop")
+                ],
+                usage=MagicMock(
+                    model_dump=lambda: {
+                        "prompt_tokens": 10,
+                        "completion_tokens": 5,
+                        "total_tokens": 15,
+                        "prompt_tokens_details": None,
+                    }
+                ),
+            ),
+        ]
+    )
+
+    with mock_service.metrics.document("a.pdf"):
+        await mock_service.chat_completion([{"role": "user", "content": "Hi"}])
+
+    assert sink.totals("llm_tokens", by="kind") == {
+        "prompt_tokens": 10,
+        "completion_tokens": 5,
+        "total_tokens": 15,
+    }
+    assert sink.totals("llm_retries", by="error") == {"RateLimitError": 1}
+    [duration] = [m for m in sink.metrics if m.name == "stage_duration_seconds"]
+    assert duration.labels == {
+        "stage": "llm_call",
+        "call": "chat_completion",
+        "status": "ok",
+        "document": "a.pdf",
+    }
@@ -0,0 +1,280 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from azure.ai.formrecognizer import AnalyzeResult
+from pytest_mock import MockerFixture
+
+from pdf2text.models.document_analysis import DocumentAnalysis
+from pdf2text.services.cached_form_recognizer import (
+    CachedAzureFormRecognizer,
+    CachedAzureFormRecognizerEnv,
+)
+
+current_path = Path(__file__).parent.parent
+data_doc = current_path / "common" / "data" / "form_recognizer_doc.json"
+
+
+@pytest.fixture
+def analyze_result() -> AnalyzeResult:
+    with open(data_doc, "r") as f:
+        return AnalyzeResult.from_dict(json.load(f))
+
+
+@pytest.fixture
+def documents(tmp_path: Path) -> list[Path]:
+    paths = []
+    for name in ["a", "b", "c"]:
+        path = tmp_path / f"{name}.pdf"
+        path.write_bytes(f"%PDF {name}".encode())
+        paths.append(path)
+    return paths
+
+
+def make_service(
+    tmp_path: Path,
+    analyze_result: AnalyzeResult,
+    max_bytes: int = 1024 * 1024,
+    ttl_seconds: float = 60,
+) -> CachedAzureFormRecognizer:
+    inner = MagicMock()
+    inner.env.azure_form_recognizer_model_id = "prebuilt-document"
+    inner.analyze_document = AsyncMock(return_value=analyze_result)
+    return CachedAzureFormRecognizer(
+        inner=inner,
+        env=CachedAzureFormRecognizerEnv(
+            azure_form_recognizer_cache_dir=str(tmp_path / "cache"),
+            azure_form_recognizer_cache_max_bytes=max_bytes,
+            azure_form_recognizer_cache_ttl_seconds=ttl_seconds,
+        ),
+        logger=MagicMock(),
+    )
+
+
+def test_cache_key(
+    tmp_path: Path, analyze_result: AnalyzeResult, documents: list[Path]
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    key = svc.cache_key(documents[0])
+    assert key == svc.cache_key(documents[0])
+    assert key != svc.cache_key(documents[1])
+    assert key != svc.cache_key(documents[0], pages="1-2")
+
+    svc.inner.env.azure_form_recognizer_model_id = "prebuilt-layout"
+    assert key != svc.cache_key(documents[0])
+
+
+@pytest.mark.asyncio
+async def test_analyze_document_cached(
+    tmp_path: Path, analyze_result: AnalyzeResult, documents: list[Path]
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+
+    first = await svc.analyze_document(documents[0])
+    second = await svc.analyze_document(documents[0])
+
+    svc.inner.analyze_document.assert_awaited_once()  # type: ignore
+    assert first.to_dict() == second.to_dict()
+
+
+@pytest.mark.asyncio
+async def test_analyze_document_expired(
+    tmp_path: Path, analyze_result: AnalyzeResult, documents: list[Path]
+) -> None:
+    svc = make_service(tmp_path, analyze_result, ttl_seconds=-1)
+
+    await svc.analyze_document(documents[0])
+    await svc.analyze_document(documents[0])
+
+    assert svc.inner.analyze_document.await_count == 2  # type: ignore
+
+
+def test_load_corrupt_entry(tmp_path: Path, analyze_result: AnalyzeResult) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    entry = svc.entry_path("abcd")
+    entry.parent.mkdir(parents=True)
+    entry.write_bytes(b"not gzip")
+
+    assert svc.load("abcd") is None
+    assert not entry.exists()
+    svc.logger.warning.assert_called_once()  # type: ignore
+
+
+def test_load_expired_entry(tmp_path: Path, analyze_result: AnalyzeResult) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    svc.store("aa01", analyze_result)
+    svc.env.azure_form_recognizer_cache_ttl_seconds = -1
+
+    assert svc.load("aa01") is None
+    assert not svc.entry_path("aa01").exists()
+    assert svc._size == 0
+
+
+def test_evict_least_recently_used(
+    tmp_path: Path, analyze_result: AnalyzeResult
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    svc.store("aa01", analyze_result)
+    svc.store("bb02", analyze_result)
+    entry_size = svc.entry_path("aa01").stat().st_size
+
+    past = time.time() - 100
+    os.utime(svc.entry_path("aa01"), (past, past))
+    os.utime(svc.entry_path("bb02"), (past, past))
+    assert svc.load("aa01") is not None  # touches aa01
+
+    svc.env.azure_form_recognizer_cache_max_bytes = entry_size * 5 // 2
+    svc.store("cc03", analyze_result)
+
+    assert svc.entry_path("aa01").exists()
+    assert not svc.entry_path("bb02").exists()
+    assert svc.entry_path("cc03").exists()
+
+
+def test_store_concurrently(tmp_path: Path, analyze_result: AnalyzeResult) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: svc.store("aa01", analyze_result), range(8)))
+
+    assert svc.load("aa01") is not None
+    assert [p.name for p in svc.entry_path("aa01").parent.iterdir()] == ["aa01.json.gz"]
+    assert svc._size == svc.entry_path("aa01").stat().st_size
+
+
+def test_store_tracks_size(
+    tmp_path: Path, analyze_result: AnalyzeResult, mocker: MockerFixture
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    svc.store("aa01", analyze_result)
+    scan_size = mocker.patch.object(svc, "scan_size")
+    evict = mocker.patch.object(svc, "evict")
+
+    svc.store("bb02", analyze_result)
+    svc.store("bb02", analyze_result)
+
+    scan_size.assert_not_called()
+    evict.assert_not_called()
+    assert svc._size == sum(svc.entry_path(k).stat().st_size for k in ["aa01", "bb02"])
+
+
+@pytest.mark.asyncio
+async def test_lookup(
+    tmp_path: Path, analyze_result: AnalyzeResult, mocker: MockerFixture
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    lookup_path = mocker.patch.object(
+        svc, "lookup_path", return_value=("aa01", analyze_result)
+    )
+    taken: list[str] = []
+
+    def paths() -> Iterator[str]:
+        for i in range(10):
+            taken.append(f"{i}.pdf")
+            yield f"{i}.pdf"
+
+    found = svc.lookup(paths(), max_concurrency=2)
+    path, key, result = await anext(found)
+
+    # the first hit is yielded before the other paths are taken
+    assert len(taken) == 2
+    assert path in taken and key == "aa01" and result is analyze_result
+    assert len([item async for item in found]) == 9
+    assert lookup_path.call_count == 10
+
+
+@pytest.mark.asyncio
+async def test_analyze_documents_unreadable(
+    tmp_path: Path,
+    analyze_result: AnalyzeResult,
+    documents: list[Path],
+    mocker: MockerFixture,
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    missing = tmp_path / "missing.pdf"
+
+    async def analyze_documents(
+        paths: dict[str, str | None], max_concurrency: int
+    ) -> list[DocumentAnalysis]:
+        return [
+            DocumentAnalysis(path=path, error=FileNotFoundError(path))
+            if path == str(missing)
+            else DocumentAnalysis(path=path, result=analyze_result)
+            for path in paths
+        ]
+
+    mocker.patch.object(svc.inner, "analyze_documents", side_effect=analyze_documents)
+    results = await svc.analyze_documents([documents[0], missing])
+
+    assert [r.succeeded for r in results] == [True, False]
+    assert isinstance(results[1].error, FileNotFoundError)
+    assert svc.load(svc.cache_key(documents[0])) is not None
+
+
+@pytest.mark.asyncio
+async def test_analyze_documents(
+    tmp_path: Path, analyze_result: AnalyzeResult, documents: list[Path]
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    await svc.analyze_document(documents[1])
+
+    async def analyze_documents(
+        paths: dict[str, str], max_concurrency: int
+    ) -> list[DocumentAnalysis]:
+        return [
+            DocumentAnalysis(path=path, error=ValueError("failed"))
+            if path.endswith("c.pdf")
+            else DocumentAnalysis(path=path, result=analyze_result)
+            for path in paths
+        ]
+
+    svc.inner.analyze_documents = AsyncMock(side_effect=analyze_documents)
+    results = await svc.analyze_documents(documents)
+
+    assert [r.path for r in results] == [str(p) for p in documents]
+    assert [r.succeeded for r in results] == [True, True, False]
+    assert list(svc.inner.analyze_documents.await_args.args[0]) == [  # type: ignore
+        str(documents[0]),
+        str(documents[2]),
+    ]
+    assert svc.load(svc.cache_key(documents[0])) is not None
+    assert svc.load(svc.cache_key(documents[2])) is None
+
+
+@pytest.mark.asyncio
+async def test_iter_analyze_documents(
+    tmp_path: Path,
+    analyze_result: AnalyzeResult,
+    documents: list[Path],
+    mocker: MockerFixture,
+) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    await svc.analyze_document(documents[0])
+
+    async def iter_analyze_documents(paths: dict[str, str], max_concurrency: int):
+        for path in paths:
+            yield DocumentAnalysis(path=path, result=analyze_result)
+
+    patched = mocker.patch.object(
+        svc.inner, "iter_analyze_documents", side_effect=iter_analyze_documents
+    )
+    results = [r async for r in svc.iter_analyze_documents(documents)]
+
+    # the hit comes first, the misses in completion order after it
+    assert results[0].path == str(documents[0])
+    assert sorted(r.path for r in results[1:]) == [str(p) for p in documents[1:]]
+    # the cached document is not analyzed again
+    assert sorted(patched.call_args.args[0]) == [str(p) for p in documents[1:]]
+    assert all(svc.load(svc.cache_key(p)) is not None for p in documents)
+
+
+@pytest.mark.asyncio
+async def test_aclose(tmp_path: Path, analyze_result: AnalyzeResult) -> None:
+    svc = make_service(tmp_path, analyze_result)
+    svc.inner.aclose = AsyncMock()
+    await svc.aclose()
+    svc.inner.aclose.assert_awaited_once()
@@ -0,0 +1,144 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from pdf2text.models.driver import Drivers
+from pdf2text.models.llm_response import LLMResponse
+from pdf2text.services.cached_openai_service import (
+    CachedAzureOpenAIService,
+    CachedAzureOpenAIServiceEnv,
+)
+
+messages = [{"role": "user", "content": "Test message"}]
+
+
+def make_service(
+    cache_db: Path | None = None, cache_size: int = 8, all_temperatures: bool = False
+) -> CachedAzureOpenAIService:
+    inner = MagicMock()
+    inner.get_deployed_model_name.return_value = "test-model"
+    inner.chat_completion = AsyncMock(
+        side_effect=lambda *args: [
+            LLMResponse(
+                content=str(args[0][0]["content"]), finish_reason="stop", usages={}
+            )
+        ]
+    )
+    inner.chat_completion_with_format = AsyncMock(
+        return_value=[LLMResponse(content="{}", finish_reason="stop", usages={})]
+    )
+    inner.aclose = AsyncMock()
+    return CachedAzureOpenAIService(
+        inner=inner,
+        env=CachedAzureOpenAIServiceEnv(
+            azure_openai_cache_size=cache_size,
+            azure_openai_cache_db=str(cache_db) if cache_db else None,
+            azure_openai_cache_all_temperatures=all_temperatures,
+        ),
+        logger=MagicMock(),
+    )
+
+
+def test_delegates(mocker: MockerFixture) -> None:
+    svc = make_service()
+    get_client = mocker.patch.object(svc.inner, "get_client")
+    chat_completion_stream = mocker.patch.object(svc.inner, "chat_completion_stream")
+
+    assert svc.get_deployed_model_name() == "test-model"
+    assert svc.get_client() is get_client.return_value
+    stream = svc.chat_completion_stream(messages, temperature=0)  # type: ignore
+    assert stream is chat_completion_stream.return_value
+
+
+def test_cache_key() -> None:
+    svc = make_service()
+    key = svc.cache_key(messages, 0, 1)  # type: ignore
+    assert key == svc.cache_key(messages, 0, 1)  # type: ignore
+    assert key != svc.cache_key(messages, 0, 2)  # type: ignore
+    assert key != svc.cache_key(messages, 0.5, 1)  # type: ignore
+    assert key != svc.cache_key(messages, 0, 1, Drivers)  # type: ignore
+
+    svc.inner.get_deployed_model_name.return_value = "other-model"  # type: ignore
+    assert key != svc.cache_key(messages, 0, 1)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_cached() -> None:
+    svc = make_service()
+    first = await svc.chat_completion(messages, temperature=0)  # type: ignore
+    second = await svc.chat_completion(messages, temperature=0)  # type: ignore
+
+    assert first == second
+    svc.inner.chat_completion.assert_awaited_once()  # type: ignore
+    assert (svc.hits, svc.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_returns_copies() -> None:
+    svc = make_service()
+    first = await svc.chat_completion(messages, temperature=0)  # type: ignore
+    first[0].content = "changed"
+    first.clear()
+
+    second = await svc.chat_completion(messages, temperature=0)  # type: ignore
+    assert [r.content for r in second] == ["Test message"]
+    second[0].content = "changed"
+
+    third = await svc.chat_completion(messages, temperature=0)  # type: ignore
+    assert [r.content for r in third] == ["Test message"]
+    svc.inner.chat_completion.assert_awaited_once()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_not_deterministic() -> None:
+    svc = make_service()
+    await svc.chat_completion(messages)  # type: ignore
+    await svc.chat_completion(messages)  # type: ignore
+
+    assert svc.inner.chat_completion.await_count == 2  # type: ignore
+    assert (svc.hits, svc.misses) == (0, 0)
+
+    svc = make_service(all_temperatures=True)
+    await svc.chat_completion(messages)  # type: ignore
+    await svc.chat_completion(messages)  # type: ignore
+    svc.inner.chat_completion.assert_awaited_once()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_with_format_cached() -> None:
+    svc = make_service()
+    await svc.chat_completion_with_format(messages, Drivers, temperature=0)  # type: ignore
+    await svc.chat_completion_with_format(messages, Drivers, temperature=0)  # type: ignore
+    svc.inner.chat_completion_with_format.assert_awaited_once()  # type: ignore
+
+    await svc.chat_completion_with_format(messages, Drivers)  # type: ignore
+    assert svc.inner.chat_completion_with_format.await_count == 2  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction() -> None:
+    svc = make_service(cache_size=1)
+    other = [{"role": "user", "content": "Other message"}]
+    await svc.chat_completion(messages, temperature=0)  # type: ignore
+    await svc.chat_completion(other, temperature=0)  # type: ignore
+    await svc.chat_completion(messages, temperature=0)  # type: ignore
+
+    assert svc.inner.chat_completion.await_count == 3  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store(tmp_path: Path) -> None:
+    cache_db = tmp_path / "cache.db"
+    svc = make_service(cache_db=cache_db)
+    first = await svc.chat_completion(messages, temperature=0)  # type: ignore
+    await svc.aclose()
+    svc.inner.aclose.assert_awaited_once()  # type: ignore
+
+    svc = make_service(cache_db=cache_db)
+    second = await svc.chat_completion(messages, temperature=0)  # type: ignore
+
+    assert first == second
+    svc.inner.chat_completion.assert_not_awaited()  # type: ignore
+    assert svc.hits == 1
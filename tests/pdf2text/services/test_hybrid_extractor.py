@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from azure.ai.formrecognizer import AnalyzeResult
+from pytest_mock import MockerFixture
+
+from pdf2text.services.hybrid_extractor import HybridExtractor, HybridExtractorEnv
+from pdf2text.services.metrics import InMemoryMetricsSink, Metrics
+
+current_path = Path(__file__).parent.parent
+data_doc = current_path / "common" / "data" / "form_recognizer_doc.json"
+
+
+@pytest.fixture
+def analyze_result() -> AnalyzeResult:
+    with open(data_doc) as f:
+        data = json.load(f)
+
+    # the document analyzed as page 2 of a larger file
+    for paragraph in data["paragraphs"]:
+        for region in paragraph["bounding_regions"]:
+            region["page_number"] = 2
+    for table in data["tables"]:
+        for cell in table["cells"]:
+            for region in cell["bounding_regions"]:
+                region["page_number"] = 2
+        for region in table["bounding_regions"]:
+            region["page_number"] = 2
+    return AnalyzeResult.from_dict(data)
+
+
+@pytest.mark.asyncio
+async def test_extract(mocker: MockerFixture, analyze_result: AnalyzeResult) -> None:
+    mocker.patch(
+        "pdf2text.services.hybrid_extractor.extract_page_blocks",
+        return_value={1: ["page 1"], 2: None, 3: ["page 3"], 4: None},
+    )
+    form_recognizer = MagicMock()
+    form_recognizer.analyze_document = AsyncMock(return_value=analyze_result)
+    sink = InMemoryMetricsSink()
+    extractor = HybridExtractor(
+        form_recognizer=form_recognizer,
+        env=HybridExtractorEnv(),
+        logger=MagicMock(),
+        metrics=Metrics(sinks=[sink]),
+    )
+
+    blocks = await extractor.extract("doc.pdf", "csv")
+
+    form_recognizer.analyze_document.assert_awaited_once_with("doc.pdf", "2,4")
+    assert blocks == [
+        "page 1",
+        "content 1",
+        "content 2",
+        "\nColumn 1,Column 2\nrow1 col1,row1 col2\nrow2 col1,row2 col2\n\n",
+        "after table content",
+        "page 3",
+    ]
+    assert sink.totals("pages", by="backend") == {
+        "pdfplumber": 2,
+        "form_recognizer": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_extract_local_only(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "pdf2text.services.hybrid_extractor.extract_page_blocks",
+        return_value={1: ["page 1"], 2: []},
+    )
+    form_recognizer = MagicMock()
+    form_recognizer.analyze_document = AsyncMock()
+    extractor = HybridExtractor(
+        form_recognizer=form_recognizer, env=HybridExtractorEnv(), logger=MagicMock()
+    )
+
+    assert await extractor.extract("doc.pdf") == ["page 1"]
+    form_recognizer.analyze_document.assert_not_awaited()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from pdf2text.services.metrics import (
+    InMemoryMetricsSink,
+    JsonLinesMetricsSink,
+    Metrics,
+    MetricsEnv,
+    PrometheusMetricsSink,
+    create_sinks,
+)
+
+
+def test_record_without_sinks() -> None:
+    metrics = Metrics()
+    metrics.record("llm_tokens", 1)
+
+    with metrics.timer("parse"):
+        pass
+
+
+def test_timer() -> None:
+    sink = InMemoryMetricsSink()
+    metrics = Metrics(sinks=[sink])
+
+    with metrics.timer("parse", format="grid"):
+        pass
+    with pytest.raises(ValueError), metrics.timer("parse"):
+        raise ValueError("parse error")
+
+    assert [m.labels for m in sink.metrics] == [
+        {"stage": "parse", "status": "ok", "format": "grid"},
+        {"stage": "parse", "status": "error"},
+    ]
+    assert all(m.value >= 0 for m in sink.metrics)
+
+
+def test_record_usage() -> None:
+    sink = InMemoryMetricsSink()
+    metrics = Metrics(sinks=[sink])
+
+    metrics.record_usage(
+        {"prompt_tokens": 3, "total_tokens": 5, "prompt_tokens_details": None},
+        call="chat_completion",
+    )
+    metrics.record_usage({"total_tokens": 2}, call="chat_completion")
+
+    assert sink.totals("llm_tokens", by="kind") == {
+        "prompt_tokens": 3,
+        "total_tokens": 7,
+    }
+
+
+@pytest.mark.asyncio
+async def test_document() -> None:
+    sink = InMemoryMetricsSink()
+    metrics = Metrics(sinks=[sink])
+
+    async def call(tokens: int) -> None:
+        await asyncio.sleep(0)
+        metrics.record("llm_tokens", tokens)
+
+    with metrics.document("a.pdf"):
+        await asyncio.gather(call(1), call(2))
+    with metrics.document(Path("b.pdf")):
+        await call(4)
+    await call(8)
+
+    assert sink.totals("llm_tokens", by="document") == {"a.pdf": 3, "b.pdf": 4}
+
+
+@pytest.mark.asyncio
+async def test_json_lines_sink(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics(sinks=[JsonLinesMetricsSink(path)])
+
+    metrics.record("llm_tokens", 5, kind="total_tokens")
+    metrics.record("llm_tokens", 7, kind="total_tokens")
+    await metrics.aclose()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["value"] for line in lines] == [5, 7]
+    assert lines[0]["labels"] == {"kind": "total_tokens"}
+
+
+@pytest.mark.asyncio
+async def test_prometheus_sink(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.prom"
+    sink = PrometheusMetricsSink(path)
+    metrics = Metrics(sinks=[sink])
+
+    with metrics.document("a.pdf"):
+        metrics.record("stage_duration_seconds", 0.5, stage="parse")
+        metrics.record("stage_duration_seconds", 1.5, stage="parse")
+        metrics.record("llm_tokens", 10, kind="total_tokens")
+    metrics.record("llm_tokens", 5, kind='say "hi"')
+    await metrics.aclose()
+
+    assert path.read_text() == (
+        "# TYPE pdf2text_llm_tokens_total counter\n"
+        'pdf2text_llm_tokens_total{kind="say \\"hi\\""} 5.0\n'
+        'pdf2text_llm_tokens_total{kind="total_tokens"} 10.0\n'
+        "# TYPE pdf2text_stage_duration_seconds summary\n"
+        'pdf2text_stage_duration_seconds_sum{stage="parse"} 2.0\n'
+        'pdf2text_stage_duration_seconds_count{stage="parse"} 2\n'
+    )
+
+
+def test_create_sinks(tmp_path: Path) -> None:
+    env = MetricsEnv(
+        metrics_sinks="memory, JSONL,prometheus",
+        metrics_jsonl_path=str(tmp_path / "metrics.jsonl"),
+        metrics_prometheus_path=str(tmp_path / "metrics.prom"),
+    )
+    sinks = create_sinks(env)
+    assert [type(s) for s in sinks] == [
+        InMemoryMetricsSink,
+        JsonLinesMetricsSink,
+        PrometheusMetricsSink,
+    ]
+    for sink in sinks:
+        sink.close()
+
+    assert create_sinks(MetricsEnv(metrics_sinks="")) == []
+    with pytest.raises(ValueError, match="Unknown metrics sink: statsd"):
+        create_sinks(MetricsEnv(metrics_sinks="statsd"))
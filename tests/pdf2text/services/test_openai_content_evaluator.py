@@ -91,3 +91,43 @@ async def test_content_safety_check_input_empty():
     )
 
     OpenAIContentEvaluator(logger=MagicMock()).content_safety_check(response=test_data)
+
+
+def test_content_safety_check_chunk_prompt():
+    chunk = MagicMock(
+        choices=[],
+        prompt_filter_results=[
+            {
+                "content_filter_results": {
+                    "violence": {"filtered": False, "severity": "medium"},
+                }
+            }
+        ],
+    )
+
+    OpenAIContentEvaluator(logger=MagicMock()).content_safety_check_chunk(chunk)
+    with pytest.raises(ContentSafeException):
+        OpenAIContentEvaluator(logger=MagicMock()).content_safety_check_chunk(
+            chunk, threshold="medium"
+        )
+
+
+def test_content_safety_check_chunk_choice():
+    chunk = MagicMock(
+        choices=[
+            MagicMock(
+                model_extra={
+                    "content_filter_results": {
+                        "jailbreak": {"filtered": False, "detected": True},
+                    }
+                },
+            )
+        ],
+        prompt_filter_results=None,
+    )
+
+    with pytest.raises(ContentSafeException):
+        OpenAIContentEvaluator(logger=MagicMock()).content_safety_check_chunk(chunk)
+
+    chunk.choices[0].model_extra = {}
+    OpenAIContentEvaluator(logger=MagicMock()).content_safety_check_chunk(chunk)
@@ -0,0 +1,96 @@
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import pytest
+from azure.ai.formrecognizer import AnalyzeResult
+from pytest_mock import MockerFixture
+
+from pdf2text import cli
+from pdf2text.protocols.i_azure_form_recognizer import IAzureFormRecognizer
+from pdf2text.protocols.i_metrics import IMetrics
+from pdf2text.services.metrics import Metrics
+
+project_path = Path(__file__).parent.parent.parent
+sample = project_path / "test_data" / "ast_sci_data_tables_sample.pdf"
+data_doc = (
+    project_path / "tests" / "pdf2text" / "common" / "data" / "form_recognizer_doc.json"
+)
+
+
+def test_parse_args_missing_input(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit):
+        cli.parse_args([str(tmp_path / "missing")])
+
+
+def test_main_pdfplumber(
+    tmp_path: Path, mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mocker.patch("pdf2text.cli.aclose")
+    shutil.copy(sample, tmp_path / "sample.pdf")
+    output_dir = tmp_path / "out"
+    argv = [str(tmp_path / "*.pdf"), "-o", str(output_dir), "--backend", "pdfplumber"]
+
+    assert cli.main(argv) == 0
+    assert "AFTERSCHOOL" in (output_dir / "sample.txt").read_text()
+    assert "done: 1, skipped: 0, failed: 0" in capsys.readouterr().out
+
+    assert cli.main(argv) == 0
+    assert "done: 0, skipped: 1, failed: 0" in capsys.readouterr().out
+
+
+def test_parse_args_jsonl_requires_form_recognizer(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit):
+        cli.parse_args(
+            [str(tmp_path), "--backend", "pdfplumber", "--output-format", "jsonl"]
+        )
+
+
+def test_main_form_recognizer_jsonl(tmp_path: Path, mocker: MockerFixture) -> None:
+    with open(data_doc, "r") as f:
+        result = AnalyzeResult.from_dict(json.load(f))
+    service = mocker.AsyncMock()
+    service.analyze_document.return_value = result
+    mocker.patch(
+        "pdf2text.cli.container",
+        {
+            IAzureFormRecognizer: service,
+            IMetrics: Metrics(sinks=[]),
+            logging.Logger: logging.getLogger("test"),
+        },
+    )
+    mocker.patch("pdf2text.cli.aclose")
+    shutil.copy(sample, tmp_path / "sample.pdf")
+    output_dir = tmp_path / "out"
+
+    argv = [str(tmp_path / "sample.pdf"), "-o", str(output_dir)]
+    assert cli.main(argv) == 0
+    assert (output_dir / "sample.txt").exists()
+
+    # done as text, the file is processed again for the other output format
+    assert cli.main([*argv, "--output-format", "jsonl"]) == 0
+    assert service.analyze_document.await_count == 2
+
+    lines = (output_dir / "sample.jsonl").read_text().splitlines()
+    assert [json.loads(line)["kind"] for line in lines] == [
+        "paragraph",
+        "paragraph",
+        "table",
+        "paragraph",
+    ]
+
+
+def test_manifest_options() -> None:
+    args = cli.parse_args(["."])
+    assert cli.manifest_options(args) == {
+        "backend": "form-recognizer",
+        "output_format": "text",
+        "table_format": "markdown",
+    }
+
+    args = cli.parse_args([".", "--backend", "pdfplumber", "--table-format", "csv"])
+    assert cli.manifest_options(args) == {
+        "backend": "pdfplumber",
+        "output_format": "text",
+    }
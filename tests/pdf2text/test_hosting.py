@@ -0,0 +1,108 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from pdf2text import hosting
+
+project_path = Path(__file__).parent.parent.parent
+
+IMPORT_BUDGET_SECONDS = 0.5
+"""Wall-clock budget for `import pdf2text.hosting` in a fresh interpreter."""
+
+HEAVY_MODULES = ["azure", "dotenv", "httpx", "openai", "pandas", "pdfplumber"]
+"""Modules that must only be imported when a dependency is first resolved."""
+
+
+def test_import_budget() -> None:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import pdf2text.hosting\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': list(sys.modules)}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=project_path,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    result = json.loads(output)
+
+    loaded = {m.split(".")[0] for m in result["modules"]}
+    assert loaded.isdisjoint(HEAVY_MODULES)
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_aclose() -> None:
+    first, second = AsyncMock(), AsyncMock()
+    hosting._async_resources.extend([first, second])
+
+    await hosting.aclose()
+
+    first.assert_awaited_once()
+    second.assert_awaited_once()
+    assert hosting._async_resources == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_enabled", ["true", "false"])
+async def test_azure_openai_service_built_once(
+    cache_enabled: str, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    from pdf2text.services.azure_openai_service import AzureOpenAIService
+    from pdf2text.services.cached_openai_service import CachedAzureOpenAIService
+
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://mock.openai.azure.com/")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "mock")
+    monkeypatch.setenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+    monkeypatch.setenv("AZURE_OPENAI_DEPLOYED_MODEL_NAME", "mock")
+    monkeypatch.setenv("AZURE_OPENAI_CACHE_ENABLED", cache_enabled)
+    built = mocker.spy(AzureOpenAIService, "__post_init__")
+
+    svc = hosting.azure_openai_service()
+    assert hosting._async_resources[-1] == svc.aclose
+    await hosting.aclose()
+
+    assert built.call_count == 1
+    if cache_enabled == "true":
+        assert isinstance(svc, CachedAzureOpenAIService)
+        assert svc.inner is built.call_args.args[0]
+    else:
+        assert isinstance(svc, AzureOpenAIService)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cached", [True, False])
+async def test_azure_form_recognizer_built_once(
+    cached: bool,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+) -> None:
+    from pdf2text.services.azure_form_recognizer import AzureFormRecognizer
+    from pdf2text.services.cached_form_recognizer import CachedAzureFormRecognizer
+
+    monkeypatch.setenv("AZURE_FORM_RECOGNIZER_ENDPOINT", "https://mock.azure.com/")
+    monkeypatch.setenv(
+        "AZURE_FORM_RECOGNIZER_CACHE_DIR", str(tmp_path / "cache") if cached else ""
+    )
+    built = mocker.spy(AzureFormRecognizer, "__post_init__")
+
+    svc = hosting.azure_form_recognizer()
+    assert hosting._async_resources[-1] == svc.aclose
+    await hosting.aclose()
+
+    assert built.call_count == 1
+    if cached:
+        assert isinstance(svc, CachedAzureFormRecognizer)
+        assert svc.inner is built.call_args.args[0]
+    else:
+        assert isinstance(svc, AzureFormRecognizer)
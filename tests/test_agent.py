@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from agent import DRIVERS_CHUNK_TOKENS, TaskResults, get_drivers, run_tasks
+from pdf2text.models.driver import Drivers
+from pdf2text.models.llm_response import LLMResponse
+from pdf2text.protocols.i_azure_openai_service import IAzureOpenAIService
+
+
+class FakeOpenAIService:
+    """
+    Answers the extraction prompts, recording the most calls in flight at once.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.texts: list[str] = []
+
+    async def call(self, content: str) -> list[LLMResponse]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        return [LLMResponse(content=content, finish_reason="stop", usages={})]
+
+    async def chat_completion_with_format(
+        self, messages: list[Any], response_format: Any, temperature: float
+    ) -> list[LLMResponse]:
+        text = messages[-1]["content"]
+        self.texts.append(text)
+        drivers = Drivers.model_validate(
+            {
+                "drivers": [
+                    {"name": name, "cars": [{"model": "Kart", "engine": "V8"}]}
+                    for name in dict.fromkeys(text.split())
+                ]
+            }
+        )
+        return await self.call(drivers.model_dump_json())
+
+    async def chat_completion(
+        self, messages: list[Any], temperature: float
+    ) -> list[LLMResponse]:
+        return await self.call("Alice")
+
+
+@pytest.fixture
+def openai_svc(mocker: MockerFixture) -> FakeOpenAIService:
+    svc = FakeOpenAIService()
+    mocker.patch("agent.container", {IAzureOpenAIService: svc})
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_run_tasks(openai_svc: FakeOpenAIService) -> None:
+    results = await run_tasks(["Alice", "Bob"])
+
+    assert results == TaskResults(
+        drivers=Drivers.model_validate(
+            {
+                "drivers": [
+                    {"name": "Alice", "cars": [{"model": "Kart", "engine": "V8"}]},
+                    {"name": "Bob", "cars": [{"model": "Kart", "engine": "V8"}]},
+                ]
+            }
+        ),
+        fastest="Alice",
+    )
+    assert openai_svc.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_run_tasks_max_concurrency(openai_svc: FakeOpenAIService) -> None:
+    # blocks over the chunk budget, each sent to the LLM on its own
+    blocks = [f"{name} " * DRIVERS_CHUNK_TOKENS for name in ["Alice", "Bob", "Carol"]]
+
+    results = await run_tasks(blocks, max_concurrency=2)
+
+    assert [d.name for d in results.drivers.drivers] == ["Alice", "Bob", "Carol"]
+    assert len(openai_svc.texts) == 3
+    # one limit across the prompts and the chunks of get_drivers
+    assert openai_svc.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_get_drivers_chunks(openai_svc: FakeOpenAIService) -> None:
+    drivers = await get_drivers(["Alice Bob", "alice Carol", "BOB"], max_tokens=2)
+
+    assert openai_svc.texts == ["Alice Bob", "alice Carol", "BOB"]
+    assert drivers.model_dump() == {
+        "drivers": [
+            {"name": name, "cars": [{"model": "Kart", "engine": "V8"}]}
+            for name in ["Alice", "Bob", "Carol"]
+        ]
+    }
+    assert openai_svc.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_get_drivers_semaphore(openai_svc: FakeOpenAIService) -> None:
+    await get_drivers(
+        ["Alice", "Bob", "Carol"], max_tokens=1, semaphore=asyncio.Semaphore(1)
+    )
+
+    assert len(openai_svc.texts) == 3
+    assert openai_svc.max_in_flight == 1